@@ -1,20 +1,118 @@
+import importlib
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Optional
+
 import click
+from click.shell_completion import CompletionItem
+
+if TYPE_CHECKING:
+    from acat.stats import Stats
+
+# Subcommand name -> (import path, short help). The short help is listed in
+# `--help` and shell completion without importing the command.
+LAZY_SUBCOMMANDS = {
+    "ssm": ("acat.ssm.core.ssm", "Manage SSM parameters."),
+}
+
+
+class LazyGroup(click.Group):
+    """Group that imports its subcommands only when they are invoked.
+
+    Importing a subcommand pulls in its dependencies (boto3, loguru...), so
+    `--help` and tab completion of the subcommand names avoid it.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        lazy_subcommands: Optional[dict[str, tuple[str, str]]] = None,
+        **kwargs: Any,
+    ):
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = lazy_subcommands or {}
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return sorted({*super().list_commands(ctx), *self.lazy_subcommands})
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        if cmd_name in self.lazy_subcommands and cmd_name not in self.commands:
+            module_name, _, name = self.lazy_subcommands[cmd_name][0].rpartition(".")
+            command = getattr(importlib.import_module(module_name), name)
+            self.add_command(command, cmd_name)
+
+        return super().get_command(ctx, cmd_name)
 
-from acat.logger import logger  # noqa F401
-from acat.ssm.core import ssm
+    def _short_help(self, ctx: click.Context, cmd_name: str, limit: int = 45) -> str:
+        if cmd_name in self.commands or cmd_name not in self.lazy_subcommands:
+            command = self.get_command(ctx, cmd_name)
+            return command.get_short_help_str(limit) if command else ""
 
+        return self.lazy_subcommands[cmd_name][1]
 
-@click.group()
-def cli():
+    def format_commands(
+        self, ctx: click.Context, formatter: click.HelpFormatter
+    ) -> None:
+        names = self.list_commands(ctx)
+
+        if not names:
+            return
+
+        limit = formatter.width - 6 - max(len(name) for name in names)
+
+        with formatter.section("Commands"):
+            formatter.write_dl(
+                [(name, self._short_help(ctx, name, limit)) for name in names]
+            )
+
+    def shell_complete(
+        self, ctx: click.Context, incomplete: str
+    ) -> list[CompletionItem]:
+        results = [
+            CompletionItem(name, help=self._short_help(ctx, name))
+            for name in self.list_commands(ctx)
+            if name.startswith(incomplete)
+        ]
+        # Complete the options of the group itself, skipping the subcommands
+        results.extend(click.Command.shell_complete(self, ctx, incomplete))
+        return results
+
+
+def _report_stats(stats: "Stats", echo: bool, json_path: Optional[Path]) -> None:
+    if echo:
+        click.echo(stats.format_table(), err=True)
+
+    if json_path:
+        json_path.write_text(stats.to_json())
+
+
+@click.group(cls=LazyGroup, lazy_subcommands=LAZY_SUBCOMMANDS)
+@click.option(
+    "--stats",
+    is_flag=True,
+    default=False,
+    help="Print API call, retry, throttle and latency statistics at exit.",
+)
+@click.option(
+    "--stats-json",
+    type=click.Path(dir_okay=False, writable=True, path_type=Path),
+    default=None,
+    help="Write the API call statistics to this file as JSON at exit.",
+)
+@click.pass_context
+def cli(ctx: click.Context, stats: bool, stats_json: Optional[Path]):
     """Adrian Carreno's AWS Toolkit.
 
     This is a collection of tools that I use to manage my AWS resources.
 
-    To enable tab autocompletion, add the following line to your .bashrc or .zshrc:
+    To enable tab autocompletion, add the following line to your .bashrc
+    (use `zsh_source` in your .zshrc):
 
-        eval "$(_ACAT_COMPLETE=source acat)"
+        eval "$(_ACAT_COMPLETE=bash_source acat)"
     """
-    pass
-
+    if stats or stats_json:
+        from acat.stats import enable_stats
 
-cli.add_command(ssm)
+        collector = enable_stats()
+        ctx.call_on_close(lambda: _report_stats(collector, stats, stats_json))
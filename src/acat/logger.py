@@ -1,19 +1,56 @@
 import logging
 import os
 import sys
+from typing import Union
 
 from loguru import logger
 
+LOG_FORMATS = ("text", "json")
+
+# Lowest level that reaches a handler, see `is_enabled`
+_min_level = logging.INFO
+
 
 class PropagateHandler(logging.Handler):
     def emit(self, record: logging.LogRecord) -> None:
         logging.getLogger(record.name).handle(record)
 
 
-# Re-add the stderr handler with the appropriate level
-log_level = os.getenv("LOG_LEVEL", logging.INFO)
-logger.remove()
-logger.add(sys.stderr, level=log_level)
+def configure(
+    level: Union[str, int] = logging.INFO,
+    enqueue: bool = False,
+    log_format: str = "text",
+) -> None:
+    """Replace the handlers of the logger.
+
+    Both the stderr handler and the one propagating to the standard library
+    only accept records of `level` and above, so loguru drops lower records
+    before formatting them. `enqueue` writes the records from a background
+    thread, and the `json` format writes one JSON object per record.
+    """
+    global _min_level
+
+    if log_format not in LOG_FORMATS:
+        raise ValueError(f"Log format must be one of: {', '.join(LOG_FORMATS)}")
+
+    logger.remove()
+    logger.add(sys.stderr, level=level, enqueue=enqueue, serialize=log_format == "json")
+    # Add a handler to propagate the logs to the root logger
+    logger.add(PropagateHandler(), level=level, enqueue=enqueue, format="{message}")
+    _min_level = level if isinstance(level, int) else logger.level(level).no
+
+
+def is_enabled(level: str) -> bool:
+    """Check if records of a level are logged.
+
+    Loops that log every item check it once before the loop, so they skip
+    building the messages when the level is disabled.
+    """
+    return logger.level(level).no >= _min_level
+
 
-# Add a handler to propagate the logs to the root logger
-logger.add(PropagateHandler(), format="{message}")
+configure(
+    os.getenv("LOG_LEVEL", logging.INFO),
+    enqueue=os.getenv("LOG_ENQUEUE", "").lower() in ("1", "true", "yes"),
+    log_format=os.getenv("LOG_FORMAT", "text").lower(),
+)
@@ -0,0 +1,4 @@
+from acat.ssm.runtime import ParameterCache
+from acat.ssm.store import SSMStore
+
+__all__ = ["ParameterCache", "SSMStore"]
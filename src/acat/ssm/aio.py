@@ -0,0 +1,315 @@
+"""Asyncio backend for the SSM functions, built on aiobotocore.
+
+aiobotocore is an optional dependency, install it with `pip install acat[async]`.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any
+from typing import AsyncIterator
+from typing import Coroutine
+from typing import Iterable
+from typing import Optional
+from typing import Sequence
+from typing import TypeVar
+
+from acat.logger import logger
+from acat.ssm.client import MAX_RETRY_ATTEMPTS
+from acat.ssm.client import WRITE_MAX_ATTEMPTS
+from acat.ssm.throttling import DEFAULT_MAX_ATTEMPTS
+from acat.ssm.throttling import DEFAULT_MAX_CONCURRENCY
+from acat.ssm.throttling import DEFAULT_WRITE_RATE
+from acat.ssm.throttling import AdaptiveConcurrency
+from acat.ssm.throttling import Failure
+from acat.ssm.throttling import TokenBucket
+from acat.ssm.throttling import backoff
+from acat.ssm.throttling import is_retryable_error
+from acat.ssm.throttling import is_throttling_error
+from acat.ssm.types import Parameter
+from acat.ssm.utils import DESCRIBE_PARAMETERS_MAX_NAMES
+from acat.ssm.utils import GET_PARAMETERS_BY_PATH_MAX_RESULTS
+from acat.ssm.utils import GET_PARAMETERS_MAX_NAMES
+from acat.ssm.utils import chunked
+from acat.ssm.utils import outside_path_filters
+from acat.ssm.utils import set_key_ids
+from acat.ssm.utils import to_parameter
+from acat.stats import instrument
+from acat.stats import record_retry
+
+try:
+    from aiobotocore.config import AioConfig
+    from aiobotocore.session import AioSession
+except ImportError:  # pragma: no cover
+    AioSession = None  # type: ignore
+
+T = TypeVar("T")
+
+# aiobotocore clients are untyped, the calls mirror `mypy_boto3_ssm.SSMClient`
+AioSSMClient = Any
+
+
+def run(coroutine: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine of this module from synchronous code."""
+    return asyncio.run(coroutine)
+
+
+@asynccontextmanager
+async def ssm_client(
+    region_name: Optional[str] = None,
+    profile_name: Optional[str] = None,
+    endpoint_url: Optional[str] = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    max_attempts: int = MAX_RETRY_ATTEMPTS,
+) -> AsyncIterator[AioSSMClient]:
+    """Create an aiobotocore SSM client with a pool sized to `max_concurrency`.
+
+    Like `acat.ssm.client.get_ssm_client`, writers pass `WRITE_MAX_ATTEMPTS`
+    so botocore leaves the retries to them.
+    """
+    if AioSession is None:  # pragma: no cover
+        raise ImportError(
+            "The async backend requires aiobotocore, "
+            "install it with `pip install acat[async]`"
+        )
+
+    config = AioConfig(
+        max_pool_connections=max_concurrency,
+        retries={"mode": "standard", "total_max_attempts": max_attempts},
+    )
+    session = AioSession(profile=profile_name)
+
+    async with session.create_client(
+        "ssm", region_name=region_name, endpoint_url=endpoint_url, config=config
+    ) as client:
+        instrument(client)
+        yield client
+
+
+@asynccontextmanager
+async def _client_or_new(
+    client: Optional[AioSSMClient],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    max_attempts: int = MAX_RETRY_ATTEMPTS,
+) -> AsyncIterator[AioSSMClient]:
+    if client is not None:
+        yield client
+        return
+
+    async with ssm_client(
+        max_concurrency=max_concurrency, max_attempts=max_attempts
+    ) as new_client:
+        yield new_client
+
+
+async def _describe_parameters(
+    client: AioSSMClient, option: str, values: list[str]
+) -> dict[str, Optional[str]]:
+    """Map the names of the matching parameters to their KMS key, if any."""
+    paginator = client.get_paginator("describe_parameters")
+    pages = paginator.paginate(
+        ParameterFilters=[{"Key": "Name", "Option": option, "Values": values}],
+        PaginationConfig={"PageSize": 50},  # AWS maximum allowed value
+    )
+
+    return {
+        param["Name"]: param.get("KeyId")
+        async for page in pages
+        for param in page["Parameters"]
+        if "Name" in param
+    }
+
+
+async def get_ssm_parameter_names(
+    path_preffix: str, client: Optional[AioSSMClient] = None
+) -> set[str]:
+    logger.info("Getting SSM parameter names with path preffix: {}", path_preffix)
+
+    async with _client_or_new(client) as client:
+        key_ids = await _describe_parameters(client, "BeginsWith", [path_preffix])
+        return set(key_ids)
+
+
+async def _get_parameters(
+    client: AioSSMClient,
+    names: list[str],
+    semaphore: asyncio.Semaphore,
+    key_ids: Optional[dict[str, Optional[str]]] = None,
+) -> list[Parameter]:
+    async with semaphore:
+        response = await client.get_parameters(Names=names, WithDecryption=True)
+        parameters = [to_parameter(param) for param in response["Parameters"]]
+        parameters = [param for param in parameters if param]
+        secure = [p["Name"] for p in parameters if p["Type"] == "SecureString"]
+
+        if secure and key_ids is None:
+            key_ids = await _describe_parameters(client, "Equals", secure)
+
+    return set_key_ids(parameters, key_ids or {})
+
+
+async def _get_parameters_by_path(
+    client: AioSSMClient, path: str, with_key_ids: bool
+) -> list[Parameter]:
+    paginator = client.get_paginator("get_parameters_by_path")
+    pages = paginator.paginate(
+        Path=path.rstrip("/") or "/",
+        Recursive=True,
+        WithDecryption=True,
+        PaginationConfig={"PageSize": GET_PARAMETERS_BY_PATH_MAX_RESULTS},
+    )
+    parameters = [
+        to_parameter(param) async for page in pages for param in page["Parameters"]
+    ]
+    parameters = [param for param in parameters if param]
+
+    if not with_key_ids:
+        return parameters
+
+    secure = [p["Name"] for p in parameters if p["Type"] == "SecureString"]
+    key_ids: dict[str, Optional[str]] = {}
+
+    for batch in chunked(secure, DESCRIBE_PARAMETERS_MAX_NAMES):
+        key_ids.update(await _describe_parameters(client, "Equals", batch))
+
+    return set_key_ids(parameters, key_ids)
+
+
+async def get_ssm_parameters(
+    path_preffix: str,
+    client: Optional[AioSSMClient] = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    with_key_ids: bool = False,
+) -> list[Parameter]:
+    """Get all SSM parameters whose name begins with a path preffix.
+
+    Like the threaded version, path preffixes are fetched with
+    `get_parameters_by_path`, plus the names outside the path. Other
+    preffixes are listed and then fetched in batches of 10, with at most
+    `max_concurrency` batches in flight. SecureStrings are decrypted and get
+    the KMS key from their metadata, which is only looked up for the path
+    if `with_key_ids` is set.
+    """
+    logger.info("Getting SSM parameters with path preffix: {}", path_preffix)
+
+    async with _client_or_new(client, max_concurrency) as client:
+        parameters: list[Parameter] = []
+        key_ids: dict[str, Optional[str]] = {}
+
+        if path_preffix.startswith("/"):
+            parameters = await _get_parameters_by_path(
+                client, path_preffix, with_key_ids
+            )
+
+            for option, values in outside_path_filters(path_preffix):
+                key_ids.update(await _describe_parameters(client, option, values))
+        else:
+            key_ids = await _describe_parameters(client, "BeginsWith", [path_preffix])
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+        batches = await asyncio.gather(
+            *(
+                _get_parameters(client, batch, semaphore, key_ids)
+                for batch in chunked(sorted(key_ids), GET_PARAMETERS_MAX_NAMES)
+            )
+        )
+        return parameters + [param for batch in batches for param in batch]
+
+
+async def get_many_ssm_parameters(
+    path_preffixes: Sequence[str],
+    client: Optional[AioSSMClient] = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+) -> dict[str, list[Parameter]]:
+    """Fetch several path preffixes concurrently over a single client."""
+    async with _client_or_new(client, max_concurrency) as client:
+        results = await asyncio.gather(
+            *(
+                get_ssm_parameters(path_preffix, client, max_concurrency)
+                for path_preffix in path_preffixes
+            )
+        )
+
+    return dict(zip(path_preffixes, results))
+
+
+async def _create_parameter(
+    client: AioSSMClient,
+    parameter: Parameter,
+    overwrite: bool,
+    bucket: TokenBucket,
+    concurrency: AdaptiveConcurrency,
+    max_attempts: int,
+) -> Failure | None:
+    """Write a parameter, retrying like `WriteScheduler._execute`."""
+    for attempt in range(max_attempts):
+        await bucket.acquire_async()
+
+        try:
+            await client.put_parameter(Overwrite=overwrite, **parameter)
+        except Exception as e:
+            if not is_retryable_error(e):
+                return Failure(Name=parameter["Name"], Error=str(e))
+
+            if is_throttling_error(e):
+                concurrency.on_throttle()
+
+            if attempt + 1 == max_attempts:
+                return Failure(Name=parameter["Name"], Error=str(e))
+
+            record_retry("PutParameter")
+            await asyncio.sleep(backoff(attempt))
+        else:
+            concurrency.on_success()
+            return None
+
+    return None  # pragma: no cover
+
+
+async def _collect(
+    tasks: set[asyncio.Task[Failure | None]], failures: list[Failure], when: str
+) -> set[asyncio.Task[Failure | None]]:
+    """Wait for the tasks, add their failures and return the pending ones."""
+    done, pending = await asyncio.wait(tasks, return_when=when)
+    failures.extend(f for task in done if (f := task.result()) is not None)
+    return pending
+
+
+async def create_ssm_parameters(
+    parameters: Iterable[Parameter],
+    overwrite: bool,
+    client: Optional[AioSSMClient] = None,
+    rate: float = DEFAULT_WRITE_RATE,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+) -> list[Failure]:
+    """Create SSM parameters with an adaptive, bounded fan-out.
+
+    Like `acat.ssm.throttling.WriteScheduler`, parameters are taken lazily
+    from `parameters`, only once fewer writes than the AIMD concurrency limit
+    are in flight, and writes are kept under `rate` requests per second.
+    Throttled writes, server errors and failed connections are retried with
+    jittered backoff, and throttles also halve the concurrency. The
+    parameters that could not be written are returned.
+    """
+    bucket = TokenBucket(rate)
+    concurrency = AdaptiveConcurrency(max_concurrency)
+    failures: list[Failure] = []
+    tasks: set[asyncio.Task[Failure | None]] = set()
+
+    async with _client_or_new(client, max_concurrency, WRITE_MAX_ATTEMPTS) as client:
+        for parameter in parameters:
+            while len(tasks) >= int(concurrency.limit):
+                tasks = await _collect(tasks, failures, asyncio.FIRST_COMPLETED)
+
+            tasks.add(
+                asyncio.create_task(
+                    _create_parameter(
+                        client, parameter, overwrite, bucket, concurrency, max_attempts
+                    )
+                )
+            )
+
+        if tasks:
+            await _collect(tasks, failures, asyncio.ALL_COMPLETED)
+
+    return failures
@@ -0,0 +1,144 @@
+import contextlib
+import gzip
+import io
+import json
+from typing import IO
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+
+import click
+
+from acat.logger import logger
+from acat.ssm.throttling import DEFAULT_MAX_CONCURRENCY
+from acat.ssm.throttling import DEFAULT_WRITE_RATE
+from acat.ssm.throttling import Failure
+from acat.ssm.types import Parameter
+from acat.ssm.utils import iter_ssm_parameters
+from acat.ssm.utils import private_opener
+from acat.ssm.utils import write_ssm_parameters
+
+GZIP_MAGIC = b"\x1f\x8b"
+RECORD_KEYS = ("Name", "Value", "Type")
+
+Progress = Callable[[int], None]
+
+
+@contextlib.contextmanager
+def open_records(
+    path: str, mode: str, compress: Optional[bool] = None
+) -> Iterator[IO[str]]:
+    """Open a JSON lines file for reading (`r`) or writing (`w`).
+
+    `-` is stdin or stdout. When writing, the file is gzip-compressed if
+    `compress` is set, or by default if the path ends with `.gz`. When
+    reading, gzip is detected from the content. New files are only
+    readable by their owner, since SecureStrings are exported decrypted.
+    """
+    if mode not in ("r", "w"):
+        raise ValueError("Mode must be 'r' or 'w'")
+
+    with contextlib.ExitStack() as stack:
+        binary: IO[bytes]
+
+        if path == "-":
+            binary = click.get_binary_stream("stdin" if mode == "r" else "stdout")
+        else:
+            binary = stack.enter_context(open(path, f"{mode}b", opener=private_opener))
+
+        if mode == "r":
+            reader = io.BufferedReader(binary) if path == "-" else binary  # type: ignore
+            compress = reader.peek(len(GZIP_MAGIC)).startswith(GZIP_MAGIC)
+            binary = reader
+        elif compress is None:
+            compress = path.endswith(".gz")
+
+        if compress:
+            binary = stack.enter_context(gzip.GzipFile(fileobj=binary, mode=mode))
+
+        text = io.TextIOWrapper(binary, encoding="utf-8")  # type: ignore
+        # Closing the wrapper would also close stdin or stdout
+        stack.callback(text.detach if path == "-" and not compress else text.close)
+        yield text
+        text.flush()
+
+
+def export_ssm_parameters(
+    path_preffix: str, file: IO[str], progress: Optional[Progress] = None
+) -> int:
+    """Write every parameter under a path preffix to `file` as JSON lines.
+
+    Parameters are written page by page as they are fetched, so memory use
+    does not depend on the size of the tree. SecureStrings keep their KMS
+    key, so an import restores it. Returns how many parameters were written.
+    """
+    logger.info("Exporting SSM parameters with path preffix: {}", path_preffix)
+    count = 0
+
+    for page in iter_ssm_parameters(path_preffix, with_key_ids=True):
+        file.writelines(f"{json.dumps(parameter)}\n" for parameter in page)
+        count += len(page)
+
+        if progress:
+            progress(count)
+
+    return count
+
+
+def iter_records(file: IO[str]) -> Iterator[Parameter]:
+    """Read the parameters of a JSON lines export one line at a time."""
+    for number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            raise ValueError(f"Line {number} is not valid JSON: {e}") from e
+
+        if not isinstance(record, dict) or any(k not in record for k in RECORD_KEYS):
+            raise ValueError(
+                f"Line {number} must have the keys {', '.join(RECORD_KEYS)}"
+            )
+
+        parameter: Parameter = {
+            "Name": record["Name"],
+            "Value": record["Value"],
+            "Type": record["Type"],
+        }
+
+        if isinstance(record.get("KeyId"), str):
+            parameter["KeyId"] = record["KeyId"]
+
+        yield parameter
+
+
+def import_ssm_parameters(
+    parameters: Iterable[Parameter],
+    overwrite: bool,
+    rate: float = DEFAULT_WRITE_RATE,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    progress: Optional[Progress] = None,
+) -> tuple[int, list[Failure]]:
+    """Write a stream of parameters with the rate-limited parallel writer.
+
+    Records are only read from `parameters` as fast as they are written.
+    Returns how many parameters were read and the ones that failed.
+    """
+    count = 0
+
+    def counted(parameters: Iterable[Parameter]) -> Iterator[Parameter]:
+        nonlocal count
+
+        for parameter in parameters:
+            yield parameter
+            count += 1
+
+            if progress:
+                progress(count)
+
+    failures = write_ssm_parameters(
+        counted(parameters), overwrite, rate=rate, max_concurrency=max_concurrency
+    )
+    return count, failures
@@ -0,0 +1,269 @@
+import os
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+from types import TracebackType
+from typing import Optional
+
+from acat.logger import logger
+from acat.ssm.client import get_scope
+from acat.ssm.client import get_ssm_client
+from acat.ssm.types import Parameter
+from acat.ssm.utils import GET_PARAMETERS_MAX_NAMES
+from acat.ssm.utils import chunked
+from acat.ssm.utils import iter_ssm_parameter_metadata
+from acat.ssm.utils import iter_ssm_parameters_by_name
+
+CACHE_DIR_ENV = "ACAT_CACHE_DIR"
+CACHE_FILE = "ssm.sqlite3"
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS parameters (
+    scope TEXT NOT NULL,
+    name TEXT NOT NULL,
+    type TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    last_modified REAL,
+    value TEXT,
+    key_id TEXT,
+    PRIMARY KEY (scope, name)
+);
+CREATE TABLE IF NOT EXISTS snapshots (
+    scope TEXT NOT NULL,
+    prefix TEXT NOT NULL,
+    refreshed_at REAL NOT NULL,
+    with_values INTEGER NOT NULL,
+    PRIMARY KEY (scope, prefix, with_values)
+);
+"""
+# Older caches are dropped and rebuilt when the schema changes
+SCHEMA_VERSION = 2
+# Upper bound for range queries over every name that starts with a preffix
+MAX_CHAR = "\U0010ffff"
+
+
+def get_cache_dir() -> Path:
+    """Get the directory where acat keeps its local caches.
+
+    It can be set with the `ACAT_CACHE_DIR` environment variable and defaults
+    to `$XDG_CACHE_HOME/acat` or `~/.cache/acat`.
+    """
+    if cache_dir := os.getenv(CACHE_DIR_ENV):
+        return Path(cache_dir)
+
+    return Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / "acat"
+
+
+def _timestamp(date: Optional[datetime]) -> Optional[float]:
+    return date.timestamp() if date else None
+
+
+class SnapshotCache:
+    """On-disk SQLite snapshot of SSM parameters per account and region.
+
+    The cache stores the names, types, versions, last modified dates and
+    values of the parameters under the preffixes that have been requested.
+    Refreshing a preffix only lists its metadata with `describe_parameters`
+    and re-fetches the values of the parameters whose version or last modified
+    date changed.
+    """
+
+    def __init__(self, path: Optional[Path] = None, scope: Optional[str] = None):
+        self.path = path or get_cache_dir() / CACHE_FILE
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.scope = scope or get_scope()
+        self._connection = sqlite3.connect(self.path)
+        self._create_schema()
+
+    def __enter__(self) -> "SnapshotCache":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def _create_schema(self) -> None:
+        (version,) = self._connection.execute("PRAGMA user_version").fetchone()
+
+        if version != SCHEMA_VERSION:
+            self._connection.executescript(
+                "DROP TABLE IF EXISTS parameters; DROP TABLE IF EXISTS snapshots;"
+                f"PRAGMA user_version = {SCHEMA_VERSION};"
+            )
+
+        self._connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def is_fresh(self, path_preffix: str, ttl: float, with_values: bool) -> bool:
+        """Check if a preffix, or any preffix covering it, is younger than `ttl`."""
+        row = self._connection.execute(
+            "SELECT MAX(refreshed_at) FROM snapshots"
+            " WHERE scope = ? AND substr(?, 1, length(prefix)) = prefix"
+            " AND with_values >= ?",
+            (self.scope, path_preffix, int(with_values)),
+        ).fetchone()
+
+        return row[0] is not None and time.time() - row[0] < ttl
+
+    def refresh(self, path_preffix: str, with_values: bool) -> None:
+        """Bring the snapshot of a preffix up to date with SSM."""
+        logger.info("Refreshing cached parameters with path preffix: {}", path_preffix)
+        metadata = {
+            param["Name"]: param
+            for page in iter_ssm_parameter_metadata(path_preffix)
+            for param in page
+            if "Name" in param
+        }
+        cached = {
+            name: (version, last_modified)
+            for name, version, last_modified in self._connection.execute(
+                "SELECT name, version, last_modified FROM parameters"
+                " WHERE scope = ? AND name >= ? AND name < ?",
+                (self.scope, path_preffix, path_preffix + MAX_CHAR),
+            )
+        }
+        removed = cached.keys() - metadata.keys()
+        # A parameter deleted and created again goes back to version 1, so its
+        # last modified date is compared too
+        changed = [
+            param
+            for name, param in metadata.items()
+            if cached.get(name)
+            != (param.get("Version", 0), _timestamp(param.get("LastModifiedDate")))
+        ]
+        logger.debug(
+            "{} parameters changed and {} were removed", len(changed), len(removed)
+        )
+
+        with self._connection:
+            self._connection.executemany(
+                "DELETE FROM parameters WHERE scope = ? AND name = ?",
+                [(self.scope, name) for name in removed],
+            )
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO parameters"
+                " (scope, name, type, version, last_modified, value, key_id)"
+                " VALUES (?, ?, ?, ?, ?, NULL, ?)",
+                [
+                    (
+                        self.scope,
+                        param["Name"],
+                        param.get("Type", "String"),
+                        param.get("Version", 0),
+                        _timestamp(param.get("LastModifiedDate")),
+                        param.get("KeyId"),
+                    )
+                    for param in changed
+                ],
+            )
+
+        if with_values:
+            self._fetch_missing_values(path_preffix)
+
+        with self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?)",
+                (self.scope, path_preffix, time.time(), int(with_values)),
+            )
+
+    def _fetch_missing_values(self, path_preffix: str) -> None:
+        missing = [
+            name
+            for (name,) in self._connection.execute(
+                "SELECT name FROM parameters"
+                " WHERE scope = ? AND name >= ? AND name < ? AND value IS NULL"
+                " AND type != 'SecureString'",
+                (self.scope, path_preffix, path_preffix + MAX_CHAR),
+            )
+        ]
+        if not missing:
+            return
+
+        logger.debug("Fetching {} parameter values", len(missing))
+        client = get_ssm_client()
+
+        for batch in chunked(missing, GET_PARAMETERS_MAX_NAMES):
+            response = client.get_parameters(Names=batch)
+
+            with self._connection:
+                self._connection.executemany(
+                    "UPDATE parameters SET type = ?, version = ?, value = ?"
+                    " WHERE scope = ? AND name = ?",
+                    [
+                        (
+                            param["Type"],
+                            param["Version"],
+                            param["Value"],
+                            self.scope,
+                            param["Name"],
+                        )
+                        for param in response["Parameters"]
+                        if "Name" in param and "Value" in param and "Type" in param
+                    ],
+                )
+                self._connection.executemany(
+                    "DELETE FROM parameters WHERE scope = ? AND name = ?",
+                    [(self.scope, name) for name in response["InvalidParameters"]],
+                )
+
+    def invalidate(self, path_preffix: str) -> None:
+        """Mark every snapshot overlapping a preffix as stale, e.g. after writes."""
+        with self._connection:
+            self._connection.execute(
+                "DELETE FROM snapshots WHERE scope = ?"
+                " AND (substr(?, 1, length(prefix)) = prefix"
+                " OR substr(prefix, 1, length(?)) = ?)",
+                (self.scope, path_preffix, path_preffix, path_preffix),
+            )
+
+    def names(self, path_preffix: str, ttl: float) -> set[str]:
+        """Get the names that begin with a preffix, refreshing them if stale."""
+        if not self.is_fresh(path_preffix, ttl, with_values=False):
+            self.refresh(path_preffix, with_values=False)
+
+        return {
+            name
+            for (name,) in self._connection.execute(
+                "SELECT name FROM parameters"
+                " WHERE scope = ? AND name >= ? AND name < ?",
+                (self.scope, path_preffix, path_preffix + MAX_CHAR),
+            )
+        }
+
+    def parameters(self, path_preffix: str, ttl: float) -> list[Parameter]:
+        """Get the parameters under a preffix, refreshing them if stale.
+
+        SecureString values are never written to disk, so they are fetched
+        and decrypted again on every call, in batches of 10.
+        """
+        if not self.is_fresh(path_preffix, ttl, with_values=True):
+            self.refresh(path_preffix, with_values=True)
+        else:
+            # A names-only refresh since then may have left changed rows
+            # without a value, and they must not be left out
+            self._fetch_missing_values(path_preffix)
+
+        parameters: list[Parameter] = []
+        secure_key_ids: dict[str, Optional[str]] = {}
+
+        for name, value, type_, key_id in self._connection.execute(
+            "SELECT name, value, type, key_id FROM parameters"
+            " WHERE scope = ? AND name >= ? AND name < ?"
+            " AND (value IS NOT NULL OR type = 'SecureString')",
+            (self.scope, path_preffix, path_preffix + MAX_CHAR),
+        ):
+            if type_ == "SecureString":
+                secure_key_ids[name] = key_id
+            else:
+                parameters.append({"Name": name, "Value": value, "Type": type_})
+
+        for page in iter_ssm_parameters_by_name(secure_key_ids, key_ids=secure_key_ids):
+            parameters.extend(page)
+
+        return sorted(parameters, key=lambda x: x["Name"])
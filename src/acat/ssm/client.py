@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING
+from typing import Optional
+from typing import TypedDict
+
+from acat.logger import logger
+from acat.ssm.throttling import DEFAULT_MAX_CONCURRENCY
+from acat.stats import instrument
+
+if TYPE_CHECKING:
+    import boto3
+    from mypy_boto3_ssm import SSMClient
+
+MAX_RETRY_ATTEMPTS = 5
+# Writes go through a `WriteScheduler`, which retries throttles and transient
+# errors itself and backs off from the first throttle, so botocore must not
+# retry them first
+WRITE_MAX_ATTEMPTS = 1
+
+ClientKey = tuple[Optional[str], Optional[str], Optional[str], int]
+
+_clients: dict[ClientKey, SSMClient] = {}
+# Clients of the same profile share a session, which loads the service model once
+_sessions: dict[Optional[str], boto3.session.Session] = {}
+_account_ids: dict[Optional[str], str] = {}
+_lock = threading.Lock()
+
+
+class Target(TypedDict):
+    Region: Optional[str]
+    Profile: Optional[str]
+
+
+def parse_target(value: str) -> Target:
+    """Parse a `[PROFILE@][REGION]` target, e.g. `prod@eu-west-1`.
+
+    A missing profile or region falls back to the default one of the session.
+    """
+    profile, _, region = value.rpartition("@")
+
+    if not (profile or region) or value.startswith("@"):
+        raise ValueError("Target must be in the format [PROFILE@][REGION]")
+
+    return {"Region": region or None, "Profile": profile or None}
+
+
+def format_target(target: Target) -> str:
+    """Format a target the way it is given on the command line."""
+    profile = f"{target['Profile']}@" if target["Profile"] else ""
+    return f"{profile}{target['Region'] or ''}" or "default"
+
+
+def get_ssm_client(
+    region_name: Optional[str] = None,
+    profile_name: Optional[str] = None,
+    endpoint_url: Optional[str] = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    max_attempts: int = MAX_RETRY_ATTEMPTS,
+) -> SSMClient:
+    """Get the process-wide SSM client for a region, profile and endpoint.
+
+    Clients are thread-safe, so a single one is shared by every function and
+    thread pool in the package. Its connection pool is sized to
+    `max_concurrency`, and the client is rebuilt with a larger pool if a
+    caller needs more concurrency than the cached client allows.
+
+    botocore retries each request up to `max_attempts` times. Writers pass
+    `WRITE_MAX_ATTEMPTS` to get a separate client that leaves the retries
+    to their `WriteScheduler`.
+    """
+    import boto3
+    from botocore.config import Config
+
+    key: ClientKey = (region_name, profile_name, endpoint_url, max_attempts)
+
+    with _lock:
+        client = _clients.get(key)
+
+        if client is None or client.meta.config.max_pool_connections < max_concurrency:
+            logger.debug(
+                "Creating SSM client for {} with {} connections", key, max_concurrency
+            )
+            if profile_name not in _sessions:
+                _sessions[profile_name] = boto3.session.Session(
+                    profile_name=profile_name
+                )
+
+            config = Config(
+                max_pool_connections=max_concurrency,
+                retries={"mode": "standard", "total_max_attempts": max_attempts},
+            )
+            client = _sessions[profile_name].client(
+                "ssm", region_name=region_name, endpoint_url=endpoint_url, config=config
+            )
+            instrument(client)
+            _clients[key] = client
+
+        return client
+
+
+def get_account_id(profile_name: Optional[str] = None) -> str:
+    """Get the AWS account ID of a profile's credentials, calling STS once."""
+    import boto3
+
+    with _lock:
+        if profile_name not in _account_ids:
+            session = boto3.session.Session(profile_name=profile_name)
+            sts = session.client("sts")
+            instrument(sts)
+            identity = sts.get_caller_identity()
+            _account_ids[profile_name] = identity["Account"]
+
+        return _account_ids[profile_name]
+
+
+def get_scope() -> str:
+    """Get the account and region of the default client.
+
+    Scopes look like `123456789012/eu-west-1`. Snapshot caches and plan files
+    are tied to the scope they were made in.
+    """
+    region = get_ssm_client().meta.region_name
+    return f"{get_account_id()}/{region}"
+
+
+def clear_ssm_clients() -> None:
+    """Forget every cached client, e.g. after credentials have changed."""
+    with _lock:
+        _clients.clear()
+        _sessions.clear()
+        _account_ids.clear()
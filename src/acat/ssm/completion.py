@@ -0,0 +1,179 @@
+"""Shell completion of SSM parameter paths from a local prefix trie.
+
+Completing against the API on every keystroke is too slow, so completion
+reads a trie of parameter names cached on disk per AWS profile and region.
+When the trie is missing or stale, a detached process rebuilds it from
+`describe_parameters` in the background, and the next completion uses it.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any
+from typing import Iterable
+from typing import Optional
+
+import click
+from click.shell_completion import CompletionItem
+
+from acat.ssm.cache import get_cache_dir
+
+COMPLETION_TTL = 3600.0  # Seconds before the index is refreshed
+REFRESH_INTERVAL = 60.0  # Minimum seconds between background refreshes
+MAX_COMPLETIONS = 200
+
+# Marks a node that is a parameter name. `$` is not allowed in SSM names.
+_LEAF = "$"
+
+Node = dict[str, Any]
+
+
+def get_index_path() -> Path:
+    """Get the trie file of the profile and region set in the environment.
+
+    The environment is used instead of a session because creating one, or
+    asking STS for the account, is too slow for completion.
+    """
+    profile = os.getenv("AWS_PROFILE") or "default"
+    region = os.getenv("AWS_REGION") or os.getenv("AWS_DEFAULT_REGION") or "default"
+    return get_cache_dir() / "completion" / profile / f"{region}.json"
+
+
+class PrefixTrie:
+    """Trie of parameter names with one node per `/`-separated segment.
+
+    Shared path segments are stored once, so the trie stays compact even for
+    deep trees with many parameters.
+    """
+
+    def __init__(self, root: Optional[Node] = None):
+        self.root: Node = root or {}
+
+    @classmethod
+    def from_names(cls, names: Iterable[str]) -> "PrefixTrie":
+        trie = cls()
+
+        for name in names:
+            trie.add(name)
+
+        return trie
+
+    @classmethod
+    def load(cls, path: Path) -> "PrefixTrie":
+        return cls(json.loads(path.read_text()))
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self.root, separators=(",", ":")))
+        tmp_path.replace(path)
+
+    def add(self, name: str) -> None:
+        node = self.root
+
+        for segment in name.split("/"):
+            node = node.setdefault(segment, {})
+
+        node[_LEAF] = 1
+
+    def complete(self, incomplete: str, limit: int = MAX_COMPLETIONS) -> list[str]:
+        """Complete the last segment of a name.
+
+        Segments with parameters below them are completed with a trailing
+        `/`, and parameters are completed with their full name.
+        """
+        head, separator, tail = incomplete.rpartition("/")
+        node = self.root
+
+        for segment in head.split("/") if separator else []:
+            if (node := node.get(segment)) is None:
+                return []
+
+        prefix = f"{head}{separator}"
+        results: list[str] = []
+
+        for segment in sorted(node):
+            if segment == _LEAF or not segment.startswith(tail):
+                continue
+
+            child = node[segment]
+
+            if _LEAF in child:
+                results.append(f"{prefix}{segment}")
+
+            if any(key != _LEAF for key in child):
+                results.append(f"{prefix}{segment}/")
+
+        return results[:limit]
+
+
+def refresh_index(path: Optional[Path] = None) -> PrefixTrie:
+    """Rebuild the trie with every parameter name of the current account."""
+    from acat.ssm.client import get_ssm_client
+
+    path = path or get_index_path()
+    paginator = get_ssm_client().get_paginator("describe_parameters")
+    pages = paginator.paginate(PaginationConfig={"PageSize": 50})
+    trie = PrefixTrie.from_names(
+        param["Name"] for page in pages for param in page["Parameters"]
+    )
+    trie.save(path)
+    return trie
+
+
+def schedule_refresh(path: Path) -> bool:
+    """Refresh a missing or stale trie in a detached process.
+
+    Returns whether a refresh was started. A marker file keeps consecutive
+    keystrokes from starting a refresh each.
+    """
+    now = time.time()
+    marker = path.with_suffix(".refreshing")
+
+    for file, max_age in ((path, COMPLETION_TTL), (marker, REFRESH_INTERVAL)):
+        if file.exists() and now - file.stat().st_mtime < max_age:
+            return False
+
+    marker.parent.mkdir(parents=True, exist_ok=True)
+    marker.touch()
+    subprocess.Popen(
+        [sys.executable, "-m", "acat.ssm.completion"],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    return True
+
+
+def complete_parameter_path(
+    _ctx: click.Context, _param: click.Parameter, incomplete: str
+) -> list[CompletionItem]:
+    """Click `shell_complete` callback for parameter path arguments."""
+    path = get_index_path()
+    schedule_refresh(path)
+
+    try:
+        trie = PrefixTrie.load(path)
+    except (OSError, ValueError):
+        return []
+
+    return [CompletionItem(name) for name in trie.complete(incomplete)]
+
+
+def run_refresh(path: Path) -> None:
+    """Refresh the trie in the process started by `schedule_refresh`.
+
+    The marker is only removed once the trie is saved. If the refresh fails,
+    e.g. without credentials, the marker is left to expire after
+    `REFRESH_INTERVAL`, so keystrokes do not start a failing refresh each.
+    """
+    refresh_index(path)
+    path.with_suffix(".refreshing").unlink(missing_ok=True)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    run_refresh(get_index_path())
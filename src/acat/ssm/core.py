@@ -1,37 +1,250 @@
-import re
+import json
+from pathlib import Path
+from typing import Callable
 from typing import Optional
 
-import boto3
 import click
 
 from acat.logger import logger
-from acat.ssm.types import Parameter
-from acat.ssm.utils import create_ssm_parameters
+from acat.ssm.backup import export_ssm_parameters
+from acat.ssm.backup import import_ssm_parameters
+from acat.ssm.backup import iter_records
+from acat.ssm.backup import open_records
+from acat.ssm.cache import CACHE_FILE
+from acat.ssm.cache import SnapshotCache
+from acat.ssm.cache import get_cache_dir
+from acat.ssm.client import Target
+from acat.ssm.client import format_target
+from acat.ssm.client import get_scope
+from acat.ssm.client import parse_target
+from acat.ssm.completion import complete_parameter_path
+from acat.ssm.diff import HIDE_VALUES
+from acat.ssm.diff import DiffEntry
+from acat.ssm.diff import diff_ssm_parameters
+from acat.ssm.fanout import TargetResult
+from acat.ssm.fanout import copy_to_targets
+from acat.ssm.fanout import plan_targets
+from acat.ssm.pipeline import stream_copy_ssm_parameters
+from acat.ssm.plan import Operation
+from acat.ssm.plan import apply_plan
+from acat.ssm.plan import check_drift
+from acat.ssm.plan import copy_operations
+from acat.ssm.plan import delete_operations
+from acat.ssm.plan import read_plan
+from acat.ssm.plan import write_plan
+from acat.ssm.records import ParameterStore
+from acat.ssm.store import SSMStore
+from acat.ssm.throttling import DEFAULT_WRITE_RATE
+from acat.ssm.throttling import Failure
+from acat.ssm.transform import REPLACE_FORMAT
+from acat.ssm.transform import Transform
+from acat.ssm.transform import build_transform
+from acat.ssm.utils import BACKENDS
+from acat.ssm.utils import CopyPlan
+from acat.ssm.utils import CopySummary
+from acat.ssm.utils import DeleteResult
 from acat.ssm.utils import get_current_params
 from acat.ssm.utils import get_ssm_parameter_names
-from acat.ssm.utils import get_ssm_parameters
+from acat.ssm.utils import get_ssm_parameter_store
+from acat.ssm.utils import set_backend
+from acat.ssm.utils import summarize_copy
+from acat.ssm.watch import DEFAULT_MAX_INTERVAL
+from acat.ssm.watch import DEFAULT_MIN_INTERVAL
+from acat.ssm.watch import AdaptiveInterval
+from acat.ssm.watch import watch_ssm_parameters
+
+
+def _invalidate_cache(path_preffix: str, cache_ttl: Optional[float]) -> None:
+    """Mark the cached snapshot of a preffix as stale after modifying it."""
+    if cache_ttl is None:
+        return
+
+    with SnapshotCache() as cache:
+        cache.invalidate(path_preffix)
+
+
+def _echo_copy_summary(summary: CopySummary) -> None:
+    message = (
+        f"{summary['Created']} created, {summary['Updated']} updated, "
+        f"{summary['Unchanged']} unchanged, {summary['Skipped']} skipped"
+    )
+
+    if summary["Failed"]:
+        message += f", {summary['Failed']} failed"
+
+    click.echo(message)
+
+
+def _echo_copy_result(plan: CopyPlan, failures: list[Failure]) -> None:
+    failed = {failure["Name"] for failure in failures}
+
+    for kind in ("Created", "Updated"):
+        for param in plan[kind]:  # type: ignore[literal-required]
+            if param["Name"] not in failed:
+                click.echo(f"{kind} parameter: {param['Name']}")
+
+    for failure in failures:
+        click.echo(f"Error creating parameter {failure['Name']}: {failure['Error']}")
+
+
+def _echo_delete_result(result: DeleteResult) -> None:
+    for param in result["Deleted"]:
+        click.echo(f"Deleted parameter: {param}")
+
+    if result["Invalid"]:
+        click.echo(f"{len(result['Invalid'])} parameters were not found:")
+
+        for param in result["Invalid"]:
+            click.echo(f"\t{param}")
+
+    if result["Failed"]:
+        click.echo(f"Failed to delete {len(result['Failed'])} parameters:")
+
+        for failure in result["Failed"]:
+            click.echo(f"\t{failure['Name']}: {failure['Error']}")
+
+
+def _save_plan(path: Path, path_preffix: str, operations: list[Operation]) -> None:
+    """Write a plan file for `ssm apply` instead of applying the changes."""
+    write_plan(path, path_preffix, operations)
+
+    for operation in operations:
+        click.echo(f"\t{operation['Action']} {operation['Name']}")
+
+    click.echo(f"Plan with {len(operations)} operations written to {path}")
+
+
+def _echo_progress(action: str, every: int = 1000) -> Callable[[int], None]:
+    """Build a progress callback that echoes to stderr every `every` items."""
+    reported = 0
+
+    def progress(count: int) -> None:
+        nonlocal reported
+
+        if count // every > reported // every:
+            click.echo(f"{action} {count} parameters...", err=True)
+            reported = count
+
+    return progress
+
+
+def _parse_targets(
+    _ctx: click.Context,
+    param: click.Parameter,
+    value: tuple[str, ...],
+) -> list[Target]:
+    try:
+        return [parse_target(target) for target in value]
+    except ValueError as e:
+        raise click.BadParameter(str(e), param=param) from e
+
+
+def _parse_target(
+    _ctx: click.Context,
+    param: click.Parameter,
+    value: Optional[str],
+) -> Optional[Target]:
+    try:
+        return parse_target(value) if value else None
+    except ValueError as e:
+        raise click.BadParameter(str(e), param=param) from e
+
+
+def _format_diff_entry(entry: DiffEntry) -> str:
+    def side(type_: Optional[str], value: Optional[str]) -> str:
+        return f"({type_}) {'<hidden>' if value is None else value}"
+
+    old = side(entry["OldType"], entry["OldValue"])
+    new = side(entry["NewType"], entry["NewValue"])
+
+    if entry["Change"] == "added":
+        return f"+ {entry['Key']} {new}"
+
+    if entry["Change"] == "removed":
+        return f"- {entry['Key']} {old}"
+
+    return f"~ {entry['Key']} {old} -> {new}"
+
+
+def _echo_target_table(results: list[TargetResult]) -> None:
+    columns = ("Created", "Updated", "Unchanged", "Skipped", "Failed")
+    labels = [format_target(result["Target"]) for result in results]
+    width = max(len("Target"), *(len(label) for label in labels))
+
+    click.echo(f"{'Target':<{width}}  " + "  ".join(f"{c:>9}" for c in columns))
+
+    for label, result in zip(labels, results):
+        summary = result["Summary"]
+        counts = "  ".join(f"{summary[c]:>9}" for c in columns)  # type: ignore
+        click.echo(f"{label:<{width}}  {counts}")
 
 
 @click.group()
-def ssm():  # pragma: nocover
+@click.option(
+    "--backend",
+    type=click.Choice(BACKENDS),
+    default="thread",
+    show_default=True,
+    envvar="ACAT_SSM_BACKEND",
+    help=(
+        "Concurrency backend for SSM API calls. The async backend requires "
+        "aiobotocore (`pip install acat[async]`)."
+    ),
+)
+def ssm(backend: str):  # pragma: nocover
     """Manage SSM parameters."""
-    pass
+    set_backend(backend)
 
 
 @ssm.command()
-@click.argument("path_preffix")
+@click.argument("path_preffix", shell_complete=complete_parameter_path)
 @click.option(
     "--template-path",
     "-t",
-    default="template.yaml",
+    default=["template.yaml"],
+    multiple=True,
     show_default=True,
-    help="Path to the CloudFormation or SAM template file",
+    help=(
+        "Path to a CloudFormation or SAM template file (YAML or JSON), a "
+        "directory to search recursively or a glob pattern. Can be repeated."
+    ),
 )
-def delete_unused(path_preffix: str, template_path: str):
+@click.option(
+    "--template-cache/--no-template-cache",
+    default=True,
+    show_default=True,
+    help="Skip templates that did not change since they were last scanned",
+)
+@click.option(
+    "--cache-ttl",
+    type=click.FloatRange(min=0),
+    default=None,
+    help=(
+        "Serve parameters from the local snapshot cache if it was refreshed "
+        "less than this many seconds ago. Stale entries are refreshed "
+        "incrementally."
+    ),
+)
+@click.option(
+    "--plan-out",
+    type=click.Path(dir_okay=False, writable=True, path_type=Path),
+    default=None,
+    help=(
+        "Write the changes with the expected parameter versions to a plan "
+        "file for `acat ssm apply` instead of applying them."
+    ),
+)
+def delete_unused(
+    path_preffix: str,
+    template_path: tuple[str, ...],
+    template_cache: bool,
+    cache_ttl: Optional[float],
+    plan_out: Optional[Path],
+):
     """Delete unused SSM parameters.
 
-    This script will read a CloudFormation or SAM template file and find all
-    SSM parameters that are being used. It will then compare them with the
+    This script will read one or more CloudFormation or SAM template files
+    and find all SSM parameters that are being used. It will then compare them with the
     parameters that are present in the SSM parameter store for the current stack
     and delete the ones that are not being used.
 
@@ -40,18 +253,23 @@ def delete_unused(path_preffix: str, template_path: str):
     same parameter store and you want to delete only the parameters that are
     being used by a specific stack.
     """
-    logger.info(f"Deleting unused parameters with path preffix: {path_preffix}")
-    current_params = get_current_params(template_path, path_preffix)
+    logger.info("Deleting unused parameters with path preffix: {}", path_preffix)
+    current_params = get_current_params(template_path, path_preffix, template_cache)
 
     if len(current_params) == 0:
         click.echo("No parameters found in the template")
         exit(0)
 
-    logger.debug(f"Found {len(current_params)} current parameters")
-    ssm_params = get_ssm_parameter_names(path_preffix)
-    logger.debug(f"Found {len(ssm_params)} parameters in SSM")
+    logger.debug("Found {} current parameters", len(current_params))
+    store = SSMStore(cache_ttl=cache_ttl)
+    ssm_params = store.list(path_preffix)
+    logger.debug("Found {} parameters in SSM", len(ssm_params))
     to_delete = ssm_params - current_params
 
+    if plan_out:
+        _save_plan(plan_out, path_preffix, delete_operations(to_delete))
+        return
+
     if len(to_delete) == 0:
         click.echo("No parameters to delete")
         exit(0)
@@ -67,18 +285,20 @@ def delete_unused(path_preffix: str, template_path: str):
         click.echo("Aborted")
         exit(1)
 
-    client = boto3.client("ssm")
+    with store:
+        result = store.delete(to_delete)
 
-    for param in sorted(to_delete):
-        click.echo(f"Deleting parameter: {param}")
-        client.delete_parameter(Name=param)
+    _echo_delete_result(result)
+
+    if result["Failed"]:
+        exit(1)
 
     click.echo("Deleted all unused parameters")
 
 
 @ssm.command()
-@click.argument("source")
-@click.argument("destination")
+@click.argument("source", shell_complete=complete_parameter_path)
+@click.argument("destination", shell_complete=complete_parameter_path)
 @click.option(
     "--overwrite/--no-overwrite",
     default=False,
@@ -88,65 +308,176 @@ def delete_unused(path_preffix: str, template_path: str):
 @click.option(
     "--replace",
     "-r",
-    default=None,
+    multiple=True,
     help=(
         "Replace a parameter value using regular expressions. "
-        "The format is 's/old/new/'."
+        f"The format is '{REPLACE_FORMAT}', with the flags i, m and s. "
+        "Every match is replaced. Can be repeated to apply several rules in order."
+    ),
+)
+@click.option(
+    "--replace-name",
+    multiple=True,
+    help=(
+        "Replace a parameter name using regular expressions, after moving it "
+        "to the destination path. Same format as --replace. Can be repeated."
+    ),
+)
+@click.option(
+    "--rules-file",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    default=None,
+    help=(
+        "Read replace rules from a file, one per line. Prefix a rule with "
+        "'name ' to apply it to names, values are replaced by default. Blank "
+        "lines and lines starting with '#' are ignored."
+    ),
+)
+@click.option(
+    "--kms-key-map",
+    multiple=True,
+    metavar="SOURCE=DESTINATION",
+    help=(
+        "Write SecureStrings encrypted with the SOURCE KMS key with the "
+        "DESTINATION key instead, e.g. to copy to another region or account. "
+        "Keys are matched as shown by describe-parameters. Can be repeated. "
+        "Unmapped keys are kept."
+    ),
+)
+@click.option(
+    "--write-rate",
+    type=click.FloatRange(min=0, min_open=True),
+    default=DEFAULT_WRITE_RATE,
+    show_default=True,
+    help="Maximum number of parameters written per second",
+)
+@click.option(
+    "--cache-ttl",
+    type=click.FloatRange(min=0),
+    default=None,
+    help=(
+        "Serve parameters from the local snapshot cache if it was refreshed "
+        "less than this many seconds ago. Stale entries are refreshed "
+        "incrementally."
+    ),
+)
+@click.option(
+    "--stream/--no-stream",
+    default=False,
+    show_default=True,
+    help=(
+        "Stream parameters through overlapping list, fetch, transform and put "
+        "stages instead of loading the whole tree in memory. Only a name-based "
+        "summary is shown before confirming."
+    ),
+)
+@click.option(
+    "--target",
+    "-T",
+    "targets",
+    multiple=True,
+    callback=_parse_targets,
+    metavar="[PROFILE@][REGION]",
+    help=(
+        "Copy to the destination path in another region and/or AWS profile. "
+        "Can be repeated to write to several targets concurrently while "
+        "reading the source only once."
+    ),
+)
+@click.option(
+    "--plan-out",
+    type=click.Path(dir_okay=False, writable=True, path_type=Path),
+    default=None,
+    help=(
+        "Write the changes with the expected parameter versions to a plan "
+        "file for `acat ssm apply` instead of applying them."
     ),
 )
-def copy(source: str, destination: str, overwrite: bool, replace: Optional[str]):
+def copy(
+    source: str,
+    destination: str,
+    overwrite: bool,
+    replace: tuple[str, ...],
+    replace_name: tuple[str, ...],
+    rules_file: Optional[Path],
+    kms_key_map: tuple[str, ...],
+    write_rate: float,
+    cache_ttl: Optional[float],
+    stream: bool,
+    targets: list[Target],
+    plan_out: Optional[Path],
+):
     """Recursively copy all SSM parameters from a path to another path.
 
     This script will copy all SSM parameters from the source path to the
     destination path. If the destination path already exists, it will be
     overwritten depending on the value of the `overwrite` flag.
-    """
-    logger.info(f"Copying parameters from {source} to {destination}")
 
-    source_params = get_ssm_parameters(source)
-    logger.debug(f"Found {len(source_params)} parameters in {source}")
-    dest_param_names = get_ssm_parameter_names(destination)
-    logger.debug(f"Found {len(dest_param_names)} parameters in {destination}")
-    new_params: list[Parameter] = []
+    Every parameter whose name begins with the source is copied, so `/app/prod`
+    also copies `/app/prod-eu/...`. End the source with `/` to only copy the
+    parameters under that path.
 
-    if replace:
-        match_group = re.match(r"^s/(?P<old>.*)/(?P<new>.*)/$", replace)
+    The source is always read from the default region and profile. With
+    `--target`, the destination path is written in each of the given targets.
 
-        if not match_group:
-            click.echo("Invalid replace format")
-            exit(1)
+    With `--plan-out`, the changes are written to a plan file to review and
+    run later with `acat ssm apply`.
+    """
+    logger.info("Copying parameters from {} to {}", source, destination)
 
-        logger.debug(
-            f"Replacing {match_group.group('old')} with {match_group.group('new')}"
+    try:
+        transform = build_transform(
+            source, destination, replace, replace_name, rules_file, kms_key_map
         )
-    else:
-        match_group = None
-
-    for parameter in source_params:
-        new_name = parameter["Name"].replace(source, destination)
-
-        if new_name in dest_param_names and not overwrite:
-            logger.debug(f"Parameter {new_name} already exists, skipping")
-            continue
-
-        value = parameter["Value"]
-        if match_group:
-            old_value = parameter["Value"]
-            value = re.sub(match_group.group("old"), match_group.group("new"), value)
-            logger.info(
-                f"Parameter '{parameter['Name']}' with value '{old_value}'"
-                f" will become '{new_name}' with value '{value}'"
-            )
+    except ValueError as e:
+        click.echo(str(e))
+        exit(1)
+
+    if plan_out and (stream or targets):
+        raise click.UsageError("--plan-out cannot be used with --stream or --target")
+
+    if targets:
+        if stream:
+            raise click.UsageError("--stream cannot be used with --target")
+
+        _fanout_copy(source, destination, overwrite, transform, write_rate, targets)
+        return
 
-        new_params.append({"Name": new_name, "Value": value, "Type": parameter["Type"]})
+    if stream:
+        _stream_copy(source, destination, overwrite, transform, write_rate, cache_ttl)
+        return
 
-    if len(new_params) == 0:
+    _batch_copy(
+        source, destination, overwrite, transform, write_rate, cache_ttl, plan_out
+    )
+
+
+def _batch_copy(
+    source: str,
+    destination: str,
+    overwrite: bool,
+    transform: Transform,
+    write_rate: float,
+    cache_ttl: Optional[float],
+    plan_out: Optional[Path],
+):
+    """Copy parameters after reading both trees and listing every change."""
+    store = SSMStore(cache_ttl=cache_ttl, write_rate=write_rate)
+    plan = store.plan_copy(source, destination, overwrite, transform)
+    to_write = plan["Created"] + plan["Updated"]
+
+    if plan_out:
+        _save_plan(plan_out, destination, copy_operations(plan))
+        return
+
+    if len(to_write) == 0:
         click.echo("No parameters to copy")
+        _echo_copy_summary(summarize_copy(plan, []))
         exit(0)
 
-    click.echo(f"{len(new_params)} parameters will be created/overwritten:")
+    click.echo(f"{len(to_write)} parameters will be created/overwritten:")
 
-    for param in sorted(new_params, key=lambda x: x["Name"]):
+    for param in sorted(to_write, key=lambda x: x["Name"]):
         click.echo(f"\t{param['Name']}")
 
     proceed: str = click.prompt("Proceed? (y/[n])", default="n")
@@ -155,4 +486,378 @@ def copy(source: str, destination: str, overwrite: bool, replace: Optional[str])
         click.echo("Aborted")
         exit(1)
 
-    create_ssm_parameters(new_params, overwrite)
+    with store:
+        result = store.apply_copy(plan, overwrite)
+
+    _echo_copy_result(plan, result["Failures"])
+    _echo_copy_summary(result["Summary"])
+
+    if result["Failures"]:
+        exit(1)
+
+
+def _stream_copy(
+    source: str,
+    destination: str,
+    overwrite: bool,
+    transform: Transform,
+    write_rate: float,
+    cache_ttl: Optional[float],
+):
+    """Copy parameters with the streaming pipeline after a name-only plan."""
+    source_names = get_ssm_parameter_names(source, cache_ttl)
+    dest_names = get_ssm_parameter_names(destination, cache_ttl)
+    existing = sum(transform.rename(name) in dest_names for name in source_names)
+
+    if len(source_names) == 0:
+        click.echo("No parameters to copy")
+        exit(0)
+
+    click.echo(f"{len(source_names)} parameters will be streamed:")
+    click.echo(f"\t{len(source_names) - existing} new")
+    click.echo(
+        f"\t{existing} existing, "
+        + ("overwritten if changed" if overwrite else "skipped if changed")
+    )
+    del source_names, dest_names  # Keep memory flat while streaming
+
+    proceed: str = click.prompt("Proceed? (y/[n])", default="n")
+
+    if proceed.lower() != "y":
+        click.echo("Aborted")
+        exit(1)
+
+    summary, failures = stream_copy_ssm_parameters(
+        source, transform, overwrite, rate=write_rate
+    )
+
+    for failure in failures:
+        click.echo(f"Error creating parameter {failure['Name']}: {failure['Error']}")
+
+    _echo_copy_summary(summary)
+    _invalidate_cache(destination, cache_ttl)
+
+    if failures:
+        exit(1)
+
+
+def _fanout_copy(
+    source: str,
+    destination: str,
+    overwrite: bool,
+    transform: Transform,
+    write_rate: float,
+    targets: list[Target],
+):
+    """Copy the source once to the destination path of several targets."""
+    source_params = get_ssm_parameter_store(source, with_key_ids=True)
+    logger.debug("Found {} parameters in {}", len(source_params), source)
+    new_params = ParameterStore(map(transform, source_params.parameters()))
+    del source_params
+    plans = plan_targets(new_params, destination, targets, overwrite)
+    pending = [len(p["Plan"]["Created"]) + len(p["Plan"]["Updated"]) for p in plans]
+
+    if sum(pending) == 0:
+        click.echo("No parameters to copy")
+        exit(0)
+
+    click.echo(f"{sum(pending)} parameters will be created/overwritten:")
+
+    for target_plan, count in zip(plans, pending):
+        click.echo(f"\t{format_target(target_plan['Target'])}: {count}")
+
+    proceed: str = click.prompt("Proceed? (y/[n])", default="n")
+
+    if proceed.lower() != "y":
+        click.echo("Aborted")
+        exit(1)
+
+    results = copy_to_targets(plans, overwrite, rate=write_rate)
+
+    for result in results:
+        for failure in result["Failures"]:
+            click.echo(
+                f"Error creating parameter {failure['Name']} in "
+                f"{format_target(result['Target'])}: {failure['Error']}"
+            )
+
+    _echo_target_table(results)
+
+    if any(result["Failures"] for result in results):
+        exit(1)
+
+
+@ssm.command(name="export")
+@click.argument("path_preffix", shell_complete=complete_parameter_path)
+@click.option(
+    "--output",
+    "-o",
+    default="-",
+    show_default=True,
+    help="File to write the parameters to as JSON lines, `-` for stdout",
+)
+@click.option(
+    "--gzip/--no-gzip",
+    "compress",
+    default=None,
+    help="Compress the output with gzip. By default, only `.gz` files are.",
+)
+def export_parameters(path_preffix: str, output: str, compress: Optional[bool]):
+    """Back up all SSM parameters under a path preffix as JSON lines.
+
+    Every line of the output is a parameter with its name, value and type.
+    Parameters are written page by page as they are fetched, so memory use is
+    constant regardless of the size of the tree.
+    """
+    with open_records(output, "w", compress) as file:
+        count = export_ssm_parameters(
+            path_preffix, file, progress=_echo_progress("Exported")
+        )
+
+    click.echo(f"Exported {count} parameters", err=True)
+
+
+@ssm.command(name="import")
+@click.argument("file")
+@click.option(
+    "--overwrite/--no-overwrite",
+    default=False,
+    show_default=True,
+    help="Overwrite existing parameters",
+)
+@click.option(
+    "--write-rate",
+    type=click.FloatRange(min=0, min_open=True),
+    default=DEFAULT_WRITE_RATE,
+    show_default=True,
+    help="Maximum number of parameters written per second",
+)
+def import_parameters(file: str, overwrite: bool, write_rate: float):
+    """Restore SSM parameters from a JSON lines file created by `export`.
+
+    FILE can be gzip-compressed, or `-` to read from stdin. Records are read
+    only as fast as they are written, so memory use is constant regardless
+    of the size of the file.
+    """
+    with open_records(file, "r") as records:
+        try:
+            count, failures = import_ssm_parameters(
+                iter_records(records),
+                overwrite,
+                rate=write_rate,
+                progress=_echo_progress("Imported"),
+            )
+        except ValueError as e:
+            click.echo(f"Invalid file {file}: {e}", err=True)
+            exit(1)
+
+    for failure in failures:
+        click.echo(f"Error creating parameter {failure['Name']}: {failure['Error']}")
+
+    click.echo(f"Imported {count - len(failures)} parameters")
+
+    if failures:
+        click.echo(f"Failed to import {len(failures)} parameters")
+        exit(1)
+
+
+@ssm.command(name="apply")
+@click.argument(
+    "plan_file", type=click.Path(exists=True, dir_okay=False, path_type=Path)
+)
+@click.option(
+    "--write-rate",
+    type=click.FloatRange(min=0, min_open=True),
+    default=DEFAULT_WRITE_RATE,
+    show_default=True,
+    help="Maximum number of parameters written per second",
+)
+def apply(plan_file: Path, write_rate: float):
+    """Apply a plan written by `copy` or `delete-unused` with `--plan-out`.
+
+    The plan is applied as it is, without listing the source or destination
+    again. Only the versions of the parameters in the plan are checked, and
+    nothing is written if any of them changed since the plan was made, or if
+    the current account or region is not the one the plan was made in.
+    """
+    try:
+        plan = read_plan(plan_file)
+    except ValueError as e:
+        click.echo(f"Invalid plan {plan_file}: {e}", err=True)
+        exit(1)
+
+    if plan["Scope"] != (scope := get_scope()):
+        click.echo(
+            f"Plan was made for {plan['Scope']}, but the current account and "
+            f"region are {scope}",
+            err=True,
+        )
+        exit(1)
+
+    operations = plan["Operations"]
+
+    if len(operations) == 0:
+        click.echo("No operations to apply")
+        exit(0)
+
+    drift = check_drift(operations)
+
+    if drift:
+        click.echo(f"{len(drift)} parameters changed since the plan was made:")
+
+        for param in drift:
+            click.echo(
+                f"\t{param['Name']}: expected version {param['ExpectedVersion']}, "
+                f"found {param['CurrentVersion']}"
+            )
+
+        exit(1)
+
+    result = apply_plan(operations, rate=write_rate)
+
+    # Commands run with --cache-ttl would otherwise see the old parameters
+    if (get_cache_dir() / CACHE_FILE).exists():
+        _invalidate_cache(plan["Path"], 0)
+
+    for failure in result["Failed"]:
+        click.echo(f"Error applying {failure['Name']}: {failure['Error']}")
+
+    click.echo(
+        f"{result['Created']} created, {result['Updated']} updated, "
+        f"{result['Deleted']} deleted"
+        + (f", {len(result['Failed'])} failed" if result["Failed"] else "")
+    )
+
+    if result["Failed"]:
+        exit(1)
+
+
+@ssm.command()
+@click.argument("path_preffix", shell_complete=complete_parameter_path)
+@click.option(
+    "--interval",
+    type=click.FloatRange(min=0, min_open=True),
+    default=DEFAULT_MIN_INTERVAL,
+    show_default=True,
+    help="Seconds between polls after a change",
+)
+@click.option(
+    "--max-interval",
+    type=click.FloatRange(min=0, min_open=True),
+    default=DEFAULT_MAX_INTERVAL,
+    show_default=True,
+    help="Seconds between polls once nothing has changed for a while",
+)
+@click.option(
+    "--initial/--no-initial",
+    default=False,
+    show_default=True,
+    help="Emit the parameters found by the first poll as added",
+)
+@click.option(
+    "--polls",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Stop after this many polls. By default, watch until interrupted.",
+)
+@click.option(
+    "--show-secure-values/--hide-secure-values",
+    default=False,
+    show_default=True,
+    help="Print the decrypted values of SecureString parameters",
+)
+def watch(
+    path_preffix: str,
+    interval: float,
+    max_interval: float,
+    initial: bool,
+    polls: Optional[int],
+    show_secure_values: bool,
+):
+    """Print changes to the SSM parameters under a path preffix.
+
+    Only parameter metadata is polled, and values are fetched only for the
+    parameters whose version changed. Every change is printed as a JSON line
+    with the event (added, changed or deleted), name, version, last modified
+    date, type and value. The poll interval doubles while nothing changes,
+    up to `--max-interval`. SecureString values are printed as null unless
+    `--show-secure-values` is given.
+    """
+    if interval > max_interval:
+        raise click.UsageError("--interval cannot be greater than --max-interval")
+
+    try:
+        watch_ssm_parameters(
+            path_preffix,
+            lambda event: click.echo(json.dumps(event)),
+            AdaptiveInterval(interval, max_interval),
+            initial=initial,
+            polls=polls,
+            show_secure=show_secure_values,
+        )
+    except KeyboardInterrupt:  # pragma: no cover
+        pass
+
+
+@ssm.command(name="diff")
+@click.argument("old_path", shell_complete=complete_parameter_path)
+@click.argument("new_path", shell_complete=complete_parameter_path)
+@click.option(
+    "--old-target",
+    callback=_parse_target,
+    metavar="[PROFILE@][REGION]",
+    help="Read OLD_PATH from another region and/or AWS profile",
+)
+@click.option(
+    "--new-target",
+    callback=_parse_target,
+    metavar="[PROFILE@][REGION]",
+    help="Read NEW_PATH from another region and/or AWS profile",
+)
+@click.option(
+    "--hide-values",
+    type=click.Choice(HIDE_VALUES),
+    default="secure",
+    show_default=True,
+    help="Values not to print. Hidden values are still compared by hash.",
+)
+@click.option(
+    "--json",
+    "as_json",
+    is_flag=True,
+    default=False,
+    help="Print every difference as a JSON line",
+)
+def diff_parameters(
+    old_path: str,
+    new_path: str,
+    old_target: Optional[Target],
+    new_target: Optional[Target],
+    hide_values: str,
+    as_json: bool,
+):
+    """Show the SSM parameters that differ between two path preffixes.
+
+    Parameters are matched by their name relative to each preffix, so
+    `/staging/db/url` is compared with `/prod/db/url`. Keys only in NEW_PATH
+    are added (+), keys only in OLD_PATH are removed (-), and keys whose
+    type or value differ are changed (~).
+
+    Exits with 1 if there are differences, like diff(1).
+    """
+    counts = {"added": 0, "removed": 0, "changed": 0}
+
+    for entry in diff_ssm_parameters(
+        old_path, new_path, old_target, new_target, hide_values
+    ):
+        counts[entry["Change"]] += 1
+        click.echo(json.dumps(entry) if as_json else _format_diff_entry(entry))
+
+    click.echo(
+        f"{counts['added']} added, {counts['removed']} removed, "
+        f"{counts['changed']} changed",
+        err=True,
+    )
+
+    if any(counts.values()):
+        exit(1)
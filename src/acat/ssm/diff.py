@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import concurrent.futures
+import hashlib
+from typing import TYPE_CHECKING
+from typing import Iterator
+from typing import Literal
+from typing import Optional
+from typing import TypedDict
+
+from acat.logger import logger
+from acat.ssm.client import Target
+from acat.ssm.client import format_target
+from acat.ssm.client import get_ssm_client
+from acat.ssm.types import Parameter
+from acat.ssm.utils import iter_ssm_parameters
+
+if TYPE_CHECKING:
+    from mypy_boto3_ssm import SSMClient
+
+HIDE_VALUES = ("secure", "all", "none")
+
+Change = Literal["added", "removed", "changed"]
+
+# Type, hash of the value and the value itself, unless it is hidden
+Fingerprint = tuple[str, bytes, Optional[str]]
+
+
+class DiffEntry(TypedDict):
+    Change: Change
+    Key: str
+    OldType: Optional[str]
+    NewType: Optional[str]
+    OldValue: Optional[str]
+    NewValue: Optional[str]
+
+
+def _is_hidden(parameter: Parameter, hide_values: str) -> bool:
+    if hide_values == "secure":
+        return parameter["Type"] == "SecureString"
+
+    return hide_values == "all"
+
+
+def get_key(name: str, path_preffix: str) -> str:
+    """Get the name of a parameter relative to the preffix it was read from.
+
+    Path preffixes keep the leading `/` of the key, so `/staging` and
+    `/prod/` both map `.../db/url` to `/db/url`.
+    """
+    if path_preffix.startswith("/"):
+        path_preffix = path_preffix.rstrip("/")
+
+    return name[len(path_preffix) :] if name.startswith(path_preffix) else name
+
+
+def fingerprint_parameters(
+    path_preffix: str,
+    client: Optional[SSMClient] = None,
+    hide_values: str = "secure",
+) -> dict[str, Fingerprint]:
+    """Fetch the parameters under a preffix keyed by their relative name.
+
+    Values are only kept as a hash, plus the value itself when it is shown,
+    so hidden values never stay in memory.
+    """
+    fingerprints: dict[str, Fingerprint] = {}
+
+    for page in iter_ssm_parameters(path_preffix, client):
+        for parameter in page:
+            value = parameter["Value"]
+            fingerprints[get_key(parameter["Name"], path_preffix)] = (
+                parameter["Type"],
+                hashlib.blake2b(value.encode(), digest_size=16).digest(),
+                None if _is_hidden(parameter, hide_values) else value,
+            )
+
+    return fingerprints
+
+
+def compare_fingerprints(
+    old: dict[str, Fingerprint], new: dict[str, Fingerprint]
+) -> Iterator[DiffEntry]:
+    """Yield the keys that were added, removed or changed in key order.
+
+    Parameters are equal when their types and value hashes are.
+    """
+    for key in sorted(old.keys() | new.keys()):
+        old_type, old_hash, old_value = old.get(key) or (None, None, None)
+        new_type, new_hash, new_value = new.get(key) or (None, None, None)
+
+        if old_type is None:
+            change: Change = "added"
+        elif new_type is None:
+            change = "removed"
+        elif (old_type, old_hash) != (new_type, new_hash):
+            change = "changed"
+        else:
+            continue
+
+        yield {
+            "Change": change,
+            "Key": key,
+            "OldType": old_type,
+            "NewType": new_type,
+            "OldValue": old_value,
+            "NewValue": new_value,
+        }
+
+
+def diff_ssm_parameters(
+    old_path: str,
+    new_path: str,
+    old_target: Optional[Target] = None,
+    new_target: Optional[Target] = None,
+    hide_values: str = "secure",
+) -> Iterator[DiffEntry]:
+    """Diff the parameters under two preffixes, in any region or profile.
+
+    Both sides are fetched concurrently with the bulk fetch functions, each
+    with the client of its target, and matched by their relative names.
+    """
+    if hide_values not in HIDE_VALUES:
+        raise ValueError(f"Hide values must be one of: {', '.join(HIDE_VALUES)}")
+
+    def fetch(side: tuple[str, Optional[Target]]) -> dict[str, Fingerprint]:
+        path, target = side
+        target = target or {"Region": None, "Profile": None}
+        logger.debug("Reading {} in {}", path, format_target(target))
+        client = get_ssm_client(target["Region"], target["Profile"])
+        return fingerprint_parameters(path, client, hide_values)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        old, new = executor.map(fetch, [(old_path, old_target), (new_path, new_target)])
+
+    logger.info("Comparing {} parameters with {} parameters", len(old), len(new))
+    yield from compare_fingerprints(old, new)
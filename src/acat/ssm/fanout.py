@@ -0,0 +1,115 @@
+import concurrent.futures
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Sequence
+from typing import TypedDict
+from typing import TypeVar
+from typing import Union
+
+from acat.logger import logger
+from acat.ssm.client import WRITE_MAX_ATTEMPTS
+from acat.ssm.client import Target
+from acat.ssm.client import format_target
+from acat.ssm.client import get_ssm_client
+from acat.ssm.records import ParameterStore
+from acat.ssm.throttling import DEFAULT_MAX_CONCURRENCY
+from acat.ssm.throttling import DEFAULT_WRITE_RATE
+from acat.ssm.throttling import Failure
+from acat.ssm.types import Parameter
+from acat.ssm.utils import CopyPlan
+from acat.ssm.utils import CopySummary
+from acat.ssm.utils import get_ssm_parameter_store
+from acat.ssm.utils import plan_copy
+from acat.ssm.utils import summarize_copy
+from acat.ssm.utils import write_ssm_parameters
+
+T = TypeVar("T")
+
+
+class TargetPlan(TypedDict):
+    Target: Target
+    Plan: CopyPlan
+
+
+class TargetResult(TypedDict):
+    Target: Target
+    Summary: CopySummary
+    Failures: list[Failure]
+
+
+def _map_targets(func: Callable[[Any], T], items: Sequence[Any]) -> list[T]:
+    """Run `func` over every target concurrently, keeping the input order."""
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=max(len(items), 1)
+    ) as executor:
+        return list(executor.map(func, items))
+
+
+def plan_targets(
+    parameters: Union[ParameterStore, Iterable[Parameter]],
+    destination: str,
+    targets: Sequence[Target],
+    overwrite: bool,
+) -> list[TargetPlan]:
+    """Compare the copied parameters with the destination of every target.
+
+    The source is read once by the caller, and the destination of each target
+    is read concurrently with that target's own client.
+    """
+    store = (
+        parameters
+        if isinstance(parameters, ParameterStore)
+        else ParameterStore(parameters)
+    )
+
+    def plan(target: Target) -> TargetPlan:
+        logger.debug("Reading {} in {}", destination, format_target(target))
+        client = get_ssm_client(target["Region"], target["Profile"])
+        existing = get_ssm_parameter_store(
+            destination, client=client, with_key_ids=True
+        )
+        return {
+            "Target": target,
+            "Plan": plan_copy(store.parameters(), existing, overwrite),
+        }
+
+    return _map_targets(plan, targets)
+
+
+def copy_to_targets(
+    plans: Sequence[TargetPlan],
+    overwrite: bool,
+    rate: float = DEFAULT_WRITE_RATE,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+) -> list[TargetResult]:
+    """Write the planned parameters to every target concurrently.
+
+    SSM rate limits apply per account and region, so every target gets its
+    own `rate` and `max_concurrency` budget instead of sharing one, and a
+    throttled target does not slow down the others.
+    """
+
+    def write(target_plan: TargetPlan) -> TargetResult:
+        target, plan = target_plan["Target"], target_plan["Plan"]
+        client = get_ssm_client(
+            target["Region"],
+            target["Profile"],
+            max_concurrency=max_concurrency,
+            max_attempts=WRITE_MAX_ATTEMPTS,
+        )
+        logger.info("Writing parameters to {}", format_target(target))
+        failures = write_ssm_parameters(
+            plan["Created"] + plan["Updated"],
+            overwrite,
+            client=client,
+            rate=rate,
+            max_concurrency=max_concurrency,
+        )
+        return {
+            "Target": target,
+            "Summary": summarize_copy(plan, failures),
+            "Failures": failures,
+        }
+
+    return _map_targets(write, plans)
@@ -0,0 +1,247 @@
+import queue
+import threading
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import Sequence
+
+from acat.logger import logger
+from acat.ssm.client import WRITE_MAX_ATTEMPTS
+from acat.ssm.client import get_ssm_client
+from acat.ssm.throttling import DEFAULT_MAX_CONCURRENCY
+from acat.ssm.throttling import DEFAULT_WRITE_RATE
+from acat.ssm.throttling import Failure
+from acat.ssm.throttling import WriteScheduler
+from acat.ssm.types import Parameter
+from acat.ssm.utils import CopySummary
+from acat.ssm.utils import get_key_ids
+from acat.ssm.utils import iter_ssm_parameter_metadata
+from acat.ssm.utils import iter_ssm_parameters
+from acat.ssm.utils import iter_ssm_parameters_by_name
+from acat.ssm.utils import plan_copy
+from acat.ssm.utils import set_key_ids
+
+DEFAULT_QUEUE_SIZE = 8
+DEFAULT_STAGE_WORKERS = 4
+
+Stage = tuple[Callable[[Any], Iterable[Any]], int]
+
+_DONE = object()  # Marks the end of the stream in every queue
+
+
+class _PipelineStoppedError(Exception):
+    """Raised inside stage threads once another stage has failed."""
+
+
+class Pipeline:
+    """Stream items through concurrent stages connected by bounded queues.
+
+    Each stage is a `(function, workers)` pair. The function maps one input
+    item to an iterable of output items, and runs in `workers` threads. Every
+    queue holds at most `maxsize` items, so a slow stage applies backpressure
+    to the ones before it and memory stays flat regardless of how many items
+    flow through. The first error raised by any stage stops the pipeline and
+    is re-raised to the consumer, and the source is not read any further
+    once the pipeline stopped.
+    """
+
+    def __init__(self, stages: Sequence[Stage], maxsize: int = DEFAULT_QUEUE_SIZE):
+        self.stages = stages
+        self._queues: list[queue.Queue] = [
+            queue.Queue(maxsize) for _ in range(len(stages) + 1)
+        ]
+        self._remaining = [workers for _, workers in stages]
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._errors: list[BaseException] = []
+
+    def _fail(self, error: BaseException) -> None:
+        if not isinstance(error, _PipelineStoppedError):
+            self._errors.append(error)
+
+        self._stop.set()
+
+    def _put(self, outbox: queue.Queue, item: Any) -> None:
+        # Time out periodically so blocked producers notice a failure downstream
+        while not self._stop.is_set():
+            try:
+                outbox.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+        raise _PipelineStoppedError
+
+    def _produce(self, source: Iterable[Any]) -> None:
+        try:
+            for item in source:
+                self._put(self._queues[0], item)
+
+                if self._stop.is_set():
+                    break  # Do not keep listing the source once stopped
+        except BaseException as e:
+            self._fail(e)
+        finally:
+            self._queues[0].put(_DONE)
+
+    def _work(self, index: int) -> None:
+        func = self.stages[index][0]
+        inbox, outbox = self._queues[index], self._queues[index + 1]
+
+        try:
+            while (item := inbox.get()) is not _DONE:
+                if self._stop.is_set():
+                    continue  # Drain the queue so upstream stages are not blocked
+
+                for result in func(item):
+                    self._put(outbox, result)
+        except BaseException as e:
+            self._fail(e)
+
+            while inbox.get() is not _DONE:
+                pass
+        finally:
+            inbox.put(_DONE)  # Let the sibling workers see the end of the stream
+
+            with self._lock:
+                self._remaining[index] -= 1
+
+                if self._remaining[index] == 0:
+                    outbox.put(_DONE)
+
+    def run(self, source: Iterable[Any]) -> Iterator[Any]:
+        """Feed `source` into the first stage and yield the last stage outputs."""
+        threads = [threading.Thread(target=self._produce, args=(source,))]
+
+        for index, (_, workers) in enumerate(self.stages):
+            threads.extend(
+                threading.Thread(target=self._work, args=(index,))
+                for _ in range(workers)
+            )
+
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+
+        item = None
+
+        try:
+            while (item := self._queues[-1].get()) is not _DONE:
+                yield item
+        finally:
+            self._stop.set()
+
+            # If the consumer stopped early, wait for the stages to wind down
+            while item is not _DONE:
+                item = self._queues[-1].get()
+
+        if self._errors:
+            raise self._errors[0]
+
+
+def _single_page(page: list[Parameter]) -> list[list[Parameter]]:
+    return [page]
+
+
+def _fetch_by_metadata(page: list[Any]) -> Iterator[list[Parameter]]:
+    # The metadata already has the KMS keys of the SecureStrings
+    names = [param["Name"] for param in page if "Name" in param]
+    key_ids = {p["Name"]: p["KeyId"] for p in page if "Name" in p and "KeyId" in p}
+    return iter_ssm_parameters_by_name(names, key_ids=key_ids)
+
+
+def _same_secure_values(
+    new_params: list[Parameter], existing: dict[str, Parameter]
+) -> list[str]:
+    """Name the SecureStrings that only their KMS key may tell apart."""
+    return [
+        parameter["Name"]
+        for parameter in new_params
+        if parameter["Type"] == "SecureString"
+        and (current := existing.get(parameter["Name"]))
+        and current["Type"] == parameter["Type"]
+        and current["Value"] == parameter["Value"]
+    ]
+
+
+def stream_copy_ssm_parameters(
+    source: str,
+    transform: Callable[[Parameter], Parameter],
+    overwrite: bool,
+    rate: float = DEFAULT_WRITE_RATE,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    workers: int = DEFAULT_STAGE_WORKERS,
+) -> tuple[CopySummary, list[Failure]]:
+    """Copy parameters through a list -> fetch -> transform -> put pipeline.
+
+    Source pages are fetched and transformed by the same workers, then
+    compared with the destination and written while the next pages are still
+    being listed, so the stages overlap and only a few pages are held in
+    memory at any time. Each page is compared with a `get_parameters` call on
+    its destination names, so unchanged parameters are not written again.
+    The KMS keys of the destination are only looked up for the SecureStrings
+    whose value is already there.
+    """
+    logger.info("Streaming parameters from {}", source)
+    client = get_ssm_client(
+        max_concurrency=max_concurrency + workers, max_attempts=WRITE_MAX_ATTEMPTS
+    )
+    summary: CopySummary = {
+        "Created": 0,
+        "Updated": 0,
+        "Unchanged": 0,
+        "Skipped": 0,
+        "Failed": 0,
+    }
+    lock = threading.Lock()
+
+    if source.startswith("/"):
+        pages: Iterable[Any] = iter_ssm_parameters(source, with_key_ids=True)
+        fetch: Callable[[Any], Iterable[list[Parameter]]] = _single_page
+    else:
+        pages = iter_ssm_parameter_metadata(source)
+        fetch = _fetch_by_metadata
+
+    def fetch_and_transform(page: Any) -> Iterator[list[Parameter]]:
+        for batch in fetch(page):
+            yield [transform(parameter) for parameter in batch]
+
+    def diff(new_params: list[Parameter]) -> Iterator[tuple[str, Parameter]]:
+        existing = {
+            param["Name"]: param
+            for batch in iter_ssm_parameters_by_name(
+                (p["Name"] for p in new_params), missing_ok=True
+            )
+            for param in batch
+        }
+        set_key_ids(
+            list(existing.values()),
+            get_key_ids(_same_secure_values(new_params, existing)),
+        )
+        plan = plan_copy(new_params, existing, overwrite)
+
+        with lock:
+            summary["Unchanged"] += len(plan["Unchanged"])
+            summary["Skipped"] += len(plan["Skipped"])
+
+        yield from (("Created", parameter) for parameter in plan["Created"])
+        yield from (("Updated", parameter) for parameter in plan["Updated"])
+
+    def create_parameter(item: tuple[str, Parameter]):
+        kind, parameter = item
+        client.put_parameter(Overwrite=overwrite, **parameter)
+
+        with lock:
+            summary[kind] += 1  # type: ignore[literal-required]
+
+    stages: list[Stage] = [(fetch_and_transform, workers), (diff, workers)]
+    scheduler: WriteScheduler[tuple[str, Parameter]] = WriteScheduler(
+        rate, max_concurrency, operation="PutParameter"
+    )
+    failures = scheduler.run(
+        Pipeline(stages).run(pages), create_parameter, key=lambda x: x[1]["Name"]
+    )
+    summary["Failed"] = len(failures)
+
+    return summary, failures
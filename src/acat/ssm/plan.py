@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import concurrent.futures
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Iterable
+from typing import Literal
+from typing import Optional
+from typing import TypedDict
+
+from acat.logger import logger
+from acat.ssm.client import get_scope
+from acat.ssm.client import get_ssm_client
+from acat.ssm.throttling import DEFAULT_MAX_CONCURRENCY
+from acat.ssm.throttling import DEFAULT_WRITE_RATE
+from acat.ssm.throttling import Failure
+from acat.ssm.types import Parameter
+from acat.ssm.utils import GET_PARAMETERS_MAX_NAMES
+from acat.ssm.utils import CopyPlan
+from acat.ssm.utils import chunked
+from acat.ssm.utils import delete_ssm_parameters
+from acat.ssm.utils import private_opener
+from acat.ssm.utils import write_ssm_parameters
+
+if TYPE_CHECKING:
+    from mypy_boto3_ssm import SSMClient
+
+PLAN_FORMAT_VERSION = 2
+ACTIONS = ("create", "update", "delete")
+
+Action = Literal["create", "update", "delete"]
+
+
+class Operation(TypedDict):
+    Action: Action
+    Name: str
+    # Version the parameter must have when the plan is applied, or None if
+    # it must not exist
+    ExpectedVersion: Optional[int]
+    Parameter: Optional[Parameter]
+
+
+class Plan(TypedDict):
+    FormatVersion: int
+    # Account and region the plan was made in, see `acat.ssm.client.get_scope`
+    Scope: str
+    Path: str
+    Operations: list[Operation]
+
+
+class Drift(TypedDict):
+    Name: str
+    ExpectedVersion: Optional[int]
+    CurrentVersion: Optional[int]
+
+
+class ApplyResult(TypedDict):
+    Created: int
+    Updated: int
+    Deleted: int
+    Failed: list[Failure]
+
+
+def get_parameter_versions(
+    names: Iterable[str],
+    client: Optional[SSMClient] = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+) -> dict[str, int]:
+    """Get the current version of the given parameters.
+
+    Names are looked up in concurrent `get_parameters` batches of 10, so only
+    the parameters of a plan are read instead of the trees they belong to.
+    Parameters that do not exist are left out.
+    """
+    client = client or get_ssm_client(max_concurrency=max_concurrency)
+
+    def fetch(batch: list[str]) -> dict[str, int]:
+        response = client.get_parameters(Names=batch)
+        return {
+            param["Name"]: param["Version"]
+            for param in response["Parameters"]
+            if "Name" in param and "Version" in param
+        }
+
+    versions: dict[str, int] = {}
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+        for batch_versions in pool.map(
+            fetch, chunked(sorted(names), GET_PARAMETERS_MAX_NAMES)
+        ):
+            versions.update(batch_versions)
+
+    return versions
+
+
+def copy_operations(plan: CopyPlan) -> list[Operation]:
+    """Turn a copy plan into operations with the versions they expect."""
+    versions = get_parameter_versions(param["Name"] for param in plan["Updated"])
+    operations: list[Operation] = [
+        {
+            "Action": "create",
+            "Name": param["Name"],
+            "ExpectedVersion": None,
+            "Parameter": param,
+        }
+        for param in plan["Created"]
+    ]
+    operations += [
+        {
+            "Action": "update",
+            "Name": param["Name"],
+            "ExpectedVersion": versions.get(param["Name"]),
+            "Parameter": param,
+        }
+        for param in plan["Updated"]
+    ]
+    return sorted(operations, key=lambda x: x["Name"])
+
+
+def delete_operations(names: Iterable[str]) -> list[Operation]:
+    """Turn the names to delete into operations with the versions they expect."""
+    versions = get_parameter_versions(names)
+    return [
+        {
+            "Action": "delete",
+            "Name": name,
+            "ExpectedVersion": version,
+            "Parameter": None,
+        }
+        for name, version in sorted(versions.items())
+    ]
+
+
+def write_plan(path: Path, path_preffix: str, operations: list[Operation]) -> None:
+    """Write the operations on a path preffix to a JSON plan file.
+
+    The plan records the account and region of the default client, so it is
+    not applied somewhere else by mistake. Plans hold the values to write,
+    decrypted, so new plan files are only readable by their owner.
+    """
+    plan: Plan = {
+        "FormatVersion": PLAN_FORMAT_VERSION,
+        "Scope": get_scope(),
+        "Path": path_preffix,
+        "Operations": operations,
+    }
+    with open(path, "w", opener=private_opener) as f:
+        f.write(f"{json.dumps(plan, indent=2)}\n")
+
+
+def _check_operation(number: int, operation: Any) -> Operation:
+    if not isinstance(operation, dict) or operation.get("Action") not in ACTIONS:
+        raise ValueError(f"Operation {number} must have an Action in {ACTIONS}")
+
+    expected_version = operation.get("ExpectedVersion")
+
+    if not isinstance(operation.get("Name"), str) or not (
+        expected_version is None or isinstance(expected_version, int)
+    ):
+        raise ValueError(f"Operation {number} must have a Name and ExpectedVersion")
+
+    parameter = operation.get("Parameter")
+
+    if operation["Action"] != "delete" and (
+        not isinstance(parameter, dict)
+        or parameter.get("Name") != operation["Name"]
+        or not {"Value", "Type"} <= parameter.keys()
+    ):
+        raise ValueError(f"Operation {number} must have the Parameter to write")
+
+    return operation  # type: ignore[return-value]
+
+
+def read_plan(path: Path) -> Plan:
+    """Read and validate a plan file written by `write_plan`."""
+    try:
+        plan = json.loads(path.read_text())
+    except ValueError as e:
+        raise ValueError(f"Plan is not valid JSON: {e}") from e
+
+    if not isinstance(plan, dict) or plan.get("FormatVersion") != PLAN_FORMAT_VERSION:
+        raise ValueError(f"Plan format version must be {PLAN_FORMAT_VERSION}")
+
+    if (
+        not isinstance(plan.get("Scope"), str)
+        or not isinstance(plan.get("Path"), str)
+        or not isinstance(plan.get("Operations"), list)
+    ):
+        raise ValueError("Plan must have a Scope, a Path and a list of Operations")
+
+    return {
+        "FormatVersion": plan["FormatVersion"],
+        "Scope": plan["Scope"],
+        "Path": plan["Path"],
+        "Operations": [
+            _check_operation(number, operation)
+            for number, operation in enumerate(plan["Operations"], start=1)
+        ],
+    }
+
+
+def check_drift(operations: list[Operation]) -> list[Drift]:
+    """Find the parameters whose version changed since the plan was made.
+
+    Only the parameters in the plan are read. Writes made between the check
+    and the apply are not detected, but creations still fail if the
+    parameter was created in the meantime.
+    """
+    versions = get_parameter_versions(operation["Name"] for operation in operations)
+    return [
+        {
+            "Name": operation["Name"],
+            "ExpectedVersion": operation["ExpectedVersion"],
+            "CurrentVersion": versions.get(operation["Name"]),
+        }
+        for operation in operations
+        if versions.get(operation["Name"]) != operation["ExpectedVersion"]
+    ]
+
+
+def apply_plan(
+    operations: list[Operation],
+    rate: float = DEFAULT_WRITE_RATE,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+) -> ApplyResult:
+    """Run the operations of a plan with the batched writers.
+
+    Creations never overwrite, so a parameter created after the plan was
+    checked fails instead of being replaced.
+    """
+    puts: dict[str, list[Parameter]] = {"create": [], "update": []}
+    names: list[str] = []
+
+    for operation in operations:
+        if operation["Action"] == "delete":
+            names.append(operation["Name"])
+        elif operation["Parameter"]:
+            puts[operation["Action"]].append(operation["Parameter"])
+
+    logger.info(
+        "Applying {} creations, {} updates and {} deletions",
+        len(puts["create"]),
+        len(puts["update"]),
+        len(names),
+    )
+    failures = write_ssm_parameters(
+        puts["create"], False, rate=rate, max_concurrency=max_concurrency
+    )
+    failures += write_ssm_parameters(
+        puts["update"], True, rate=rate, max_concurrency=max_concurrency
+    )
+    deleted = delete_ssm_parameters(names, rate=rate, max_concurrency=max_concurrency)
+    failed = {failure["Name"] for failure in failures}
+
+    return {
+        "Created": sum(param["Name"] not in failed for param in puts["create"]),
+        "Updated": sum(param["Name"] not in failed for param in puts["update"]),
+        "Deleted": len(deleted["Deleted"]),
+        "Failed": failures + deleted["Failed"],
+    }
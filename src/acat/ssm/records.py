@@ -0,0 +1,176 @@
+"""Compact in-memory storage for large numbers of SSM parameters.
+
+A `Parameter` dict per entry and a full name string per set or list costs
+hundreds of bytes per parameter, which adds up with 100k+ parameters.
+Here, names are split into their parent path and last segment. Every parent
+path is stored once and every segment is interned, so a row only holds two
+references, and the values and types are kept in columns.
+"""
+
+import sys
+from array import array
+from collections.abc import Mapping
+from collections.abc import Set
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+
+from acat.ssm.types import Parameter
+
+TYPES = ("String", "StringList", "SecureString")
+
+
+def _split(name: str) -> tuple[str, str]:
+    head, separator, leaf = name.rpartition("/")
+    return f"{head}{separator}", leaf
+
+
+class PathIndex(Set[str]):
+    """Set of parameter names indexed by parent path.
+
+    Every name has a row number, in insertion order, that `ParameterStore`
+    uses to look up its columns. On its own, a plain set of names is usually
+    as small and much faster in set operations, which rebuild every name.
+    """
+
+    __slots__ = ("_path_ids", "_paths", "_children", "_parents", "_leaves")
+
+    def __init__(self, names: Iterable[str] = ()):
+        self._path_ids: dict[str, int] = {}
+        self._paths: list[str] = []
+        # Path id -> leaf -> row, or the row of the only leaf, as most paths
+        # of sparse trees have a single child and a dict costs ~200 bytes
+        self._children: list[dict[str, int] | int] = []
+        self._parents = array("I")  # Row -> path id
+        self._leaves: list[str] = []  # Row -> leaf
+
+        for name in names:
+            self.add(name)
+
+    def _find(self, path_id: int, leaf: str) -> Optional[int]:
+        children = self._children[path_id]
+
+        if isinstance(children, int):
+            return children if self._leaves[children] == leaf else None
+
+        return children.get(leaf)
+
+    def add(self, name: str) -> int:
+        """Add a name if it is not in the index and return its row."""
+        path, leaf = _split(name)
+        path_id = self._path_ids.get(path)
+
+        if path_id is not None and (row := self._find(path_id, leaf)) is not None:
+            return row
+
+        row = len(self._leaves)
+        leaf = sys.intern(leaf)
+
+        if path_id is None:
+            path_id = self._path_ids[path] = len(self._paths)
+            self._paths.append(path)
+            self._children.append(row)
+        else:
+            if isinstance(children := self._children[path_id], int):
+                children = {self._leaves[children]: children}
+                self._children[path_id] = children
+
+            children[leaf] = row
+
+        self._parents.append(path_id)
+        self._leaves.append(leaf)
+        return row
+
+    def row(self, name: str) -> Optional[int]:
+        path, leaf = _split(name)
+
+        if (path_id := self._path_ids.get(path)) is None:
+            return None
+
+        return self._find(path_id, leaf)
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and self.row(name) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        paths = self._paths
+
+        for parent, leaf in zip(self._parents, self._leaves):
+            yield f"{paths[parent]}{leaf}"
+
+    def __len__(self) -> int:
+        return len(self._leaves)
+
+
+class ParameterStore(Mapping[str, Parameter]):
+    """Mapping of parameter names to parameters with one row per parameter.
+
+    `Parameter` dicts are only built when a parameter is read, so the store
+    can replace the lists of parameters and the dicts keyed by name. KMS
+    keys are only kept for the rows that have one.
+    """
+
+    __slots__ = ("names", "_values", "_types", "_key_ids")
+
+    def __init__(self, parameters: Iterable[Parameter] = ()):
+        self.names = PathIndex()
+        self._values: list[str] = []
+        self._types = array("B")
+        self._key_ids: dict[int, str] = {}
+        self.extend(parameters)
+
+    def add(self, parameter: Parameter) -> None:
+        """Add a parameter, replacing the one with the same name if any."""
+        row = self.names.add(parameter["Name"])
+        type_id = TYPES.index(parameter["Type"])
+
+        if row < len(self._values):
+            self._values[row] = parameter["Value"]
+            self._types[row] = type_id
+        else:
+            self._values.append(parameter["Value"])
+            self._types.append(type_id)
+
+        if "KeyId" in parameter:
+            self._key_ids[row] = parameter["KeyId"]
+        else:
+            self._key_ids.pop(row, None)
+
+    def extend(self, parameters: Iterable[Parameter]) -> None:
+        for parameter in parameters:
+            self.add(parameter)
+
+    def _parameter(self, row: int, name: str) -> Parameter:
+        parameter: Parameter = {
+            "Name": name,
+            "Value": self._values[row],
+            "Type": TYPES[self._types[row]],  # type: ignore[typeddict-item]
+        }
+
+        if row in self._key_ids:
+            parameter["KeyId"] = self._key_ids[row]
+
+        return parameter
+
+    def parameters(self) -> Iterator[Parameter]:
+        """Iterate over the parameters in insertion order.
+
+        Faster than `values()`, which looks up every name again.
+        """
+        for row, name in enumerate(self.names):
+            yield self._parameter(row, name)
+
+    def __getitem__(self, name: str) -> Parameter:
+        if (row := self.names.row(name)) is None:
+            raise KeyError(name)
+
+        return self._parameter(row, name)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.names
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+
+    def __len__(self) -> int:
+        return len(self.names)
@@ -0,0 +1,234 @@
+"""In-process read-through cache of SSM parameters for services.
+
+Services that read their configuration from SSM on every cold path can go
+over the `GetParameter` quota at high request rates. `ParameterCache` loads
+whole trees with one bulk fetch, serves reads from memory, and refreshes
+expired entries in the background while still serving the old value.
+"""
+
+import collections
+import concurrent.futures
+import threading
+import time
+from types import TracebackType
+from typing import Callable
+from typing import Iterable
+from typing import NamedTuple
+from typing import Optional
+from typing import TypedDict
+
+from acat.logger import logger
+from acat.ssm.store import SSMStore
+from acat.ssm.types import Parameter
+
+DEFAULT_TTL = 60.0  # Seconds an entry is fresh
+DEFAULT_STALE_TTL = 300.0  # Seconds an expired entry is served while refreshed
+DEFAULT_MAX_ENTRIES = 10_000
+
+
+class CacheStats(TypedDict):
+    Hits: int
+    StaleHits: int
+    Misses: int
+    Refreshes: int
+    Evictions: int
+
+
+class _Entry(NamedTuple):
+    # None if the parameter does not exist, so missing names are cached too
+    parameter: Optional[Parameter]
+    expires_at: float
+
+
+class ParameterCache:
+    """Read-through cache of parameters with TTL and LRU eviction.
+
+    Fresh entries are served from memory. Entries that expired less than
+    `stale_ttl` seconds ago are still served, and refreshed in the
+    background in batches of 10. Older entries and unknown names are
+    fetched before returning. Names that do not exist are cached as None.
+    At most `max_entries` are kept, evicting the least recently used.
+
+    Closing the cache closes the store it created if none was given. Stale
+    entries read after closing are served without being refreshed.
+    """
+
+    def __init__(
+        self,
+        store: Optional[SSMStore] = None,
+        ttl: float = DEFAULT_TTL,
+        stale_ttl: float = DEFAULT_STALE_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if ttl <= 0 or stale_ttl < 0 or max_entries < 1:
+            raise ValueError("TTLs must be positive and max entries at least 1")
+
+        self.store = store or SSMStore()
+        self._owns_store = store is None
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries: collections.OrderedDict[str, _Entry] = collections.OrderedDict()
+        self._stats: CacheStats = {
+            "Hits": 0,
+            "StaleHits": 0,
+            "Misses": 0,
+            "Refreshes": 0,
+            "Evictions": 0,
+        }
+        self._pending: set[str] = set()  # Names waiting for a background refresh
+        self._refreshing: set[str] = set()  # Names being refreshed
+        self._closed = False
+        self._lock = threading.Lock()
+        self._refresher = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="acat-ssm-refresh"
+        )
+
+    def __enter__(self) -> "ParameterCache":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Wait for the background refreshes and stop the refresh thread."""
+        with self._lock:
+            self._closed = True
+
+        self._refresher.shutdown()
+
+        if self._owns_store:
+            self.store.close()
+
+    def _store(self, name: str, parameter: Optional[Parameter], ttl: float) -> None:
+        # Must be called with the lock held
+        self._entries[name] = _Entry(parameter, self.clock() + ttl)
+        self._entries.move_to_end(name)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["Evictions"] += 1
+
+    def _fetch(self, names: Iterable[str]) -> dict[str, Optional[Parameter]]:
+        names = list(names)
+        fetched = self.store.get_many(names)
+        found = {name: fetched.get(name) for name in names}
+
+        with self._lock:
+            for name, parameter in found.items():
+                self._store(name, parameter, self.ttl)
+
+        return found
+
+    def _refresh(self) -> None:
+        with self._lock:
+            names, self._pending = self._pending, set()
+            self._refreshing = names
+
+        try:
+            self._fetch(names)
+        except Exception as e:
+            # Entries stay stale, and are fetched again once too old to serve
+            logger.warning("Could not refresh {} parameters: {}", len(names), e)
+            return
+        finally:
+            with self._lock:
+                self._refreshing = set()
+
+        with self._lock:
+            self._stats["Refreshes"] += len(names)
+
+    def _lookup(self, name: str) -> tuple[bool, Optional[Parameter]]:
+        """Get a cached parameter, scheduling a refresh if it expired.
+
+        Must be called with the lock held. Returns whether the name was
+        cached and the parameter.
+        """
+        entry = self._entries.get(name)
+        now = self.clock()
+
+        if entry is None or now >= entry.expires_at + self.stale_ttl:
+            self._stats["Misses"] += 1
+            return False, None
+
+        self._entries.move_to_end(name)
+
+        if now < entry.expires_at:
+            self._stats["Hits"] += 1
+        else:
+            self._stats["StaleHits"] += 1
+            self._schedule_refresh(name)
+
+        return True, entry.parameter
+
+    def _schedule_refresh(self, name: str) -> None:
+        # Must be called with the lock held
+        if self._closed or name in self._pending or name in self._refreshing:
+            return
+
+        if not self._pending:
+            self._refresher.submit(self._refresh)
+
+        self._pending.add(name)
+
+    def preload(self, path_preffix: str, ttl: Optional[float] = None) -> int:
+        """Cache every parameter under a preffix with one bulk fetch.
+
+        `ttl` overrides the TTL of these entries, e.g. for trees that rarely
+        change. Returns how many parameters were cached.
+        """
+        parameters = self.store.get(path_preffix)
+
+        with self._lock:
+            for parameter in parameters.parameters():
+                self._store(parameter["Name"], parameter, ttl or self.ttl)
+
+        logger.debug("Preloaded {} parameters from {}", len(parameters), path_preffix)
+        return len(parameters)
+
+    def get(self, name: str) -> Optional[Parameter]:
+        """Get a parameter, or None if it does not exist."""
+        return self.get_many([name]).get(name)
+
+    def get_many(self, names: Iterable[str]) -> dict[str, Parameter]:
+        """Get several parameters, fetching the missing ones together.
+
+        Names that do not exist are left out.
+        """
+        found: dict[str, Optional[Parameter]] = {}
+        missing: list[str] = []
+
+        with self._lock:
+            for name in names:
+                cached, parameter = self._lookup(name)
+
+                if cached:
+                    found[name] = parameter
+                else:
+                    missing.append(name)
+
+        if missing:
+            found.update(self._fetch(missing))
+
+        return {name: param for name, param in found.items() if param is not None}
+
+    def invalidate(self, path_preffix: str = "") -> None:
+        """Drop the cached entries whose names start with a preffix."""
+        with self._lock:
+            for name in [n for n in self._entries if n.startswith(path_preffix)]:
+                del self._entries[name]
+
+    def stats(self) -> CacheStats:
+        """Get a copy of the hit, miss, refresh and eviction counters."""
+        with self._lock:
+            return self._stats.copy()
+
+    def __len__(self) -> int:
+        return len(self._entries)
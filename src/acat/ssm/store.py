@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import concurrent.futures
+import os
+from types import TracebackType
+from typing import TYPE_CHECKING
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+from typing import TypedDict
+
+from acat.logger import logger
+from acat.ssm.client import WRITE_MAX_ATTEMPTS
+from acat.ssm.client import get_ssm_client
+from acat.ssm.records import ParameterStore
+from acat.ssm.throttling import DEFAULT_MAX_CONCURRENCY
+from acat.ssm.throttling import DEFAULT_WRITE_RATE
+from acat.ssm.throttling import Failure
+from acat.ssm.transform import Transform
+from acat.ssm.types import Parameter
+from acat.ssm.utils import GET_PARAMETERS_MAX_NAMES
+from acat.ssm.utils import CopyPlan
+from acat.ssm.utils import CopySummary
+from acat.ssm.utils import DeleteResult
+from acat.ssm.utils import chunked
+from acat.ssm.utils import delete_ssm_parameters
+from acat.ssm.utils import get_ssm_parameter_names
+from acat.ssm.utils import get_ssm_parameter_store
+from acat.ssm.utils import iter_ssm_parameters_by_name
+from acat.ssm.utils import plan_copy
+from acat.ssm.utils import summarize_copy
+from acat.ssm.utils import write_ssm_parameters
+
+if TYPE_CHECKING:
+    from mypy_boto3_ssm import SSMClient
+
+
+class PutResult(TypedDict):
+    Written: int
+    Failed: list[Failure]
+
+
+class CopyResult(TypedDict):
+    Summary: CopySummary
+    Failures: list[Failure]
+
+
+class SSMStore:
+    """Batched SSM operations for long-running processes.
+
+    A store keeps its client and thread pool warm, so it can be created once
+    (e.g. at module level in a Lambda function) and reused by every call.
+    Operations never write to the terminal, they return their results.
+
+    Without a client, region, profile or endpoint, the store uses the default
+    client, and `cache_ttl` and the async backend apply to it as they do to
+    the functions of `acat.ssm.utils`.
+    """
+
+    def __init__(
+        self,
+        region_name: Optional[str] = None,
+        profile_name: Optional[str] = None,
+        endpoint_url: Optional[str] = None,
+        client: Optional[SSMClient] = None,
+        cache_ttl: Optional[float] = None,
+        write_rate: float = DEFAULT_WRITE_RATE,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ):
+        self.client = client or get_ssm_client(
+            region_name, profile_name, endpoint_url, max_concurrency
+        )
+        # The write scheduler retries throttles, so writes skip botocore's
+        self._write_client = client or get_ssm_client(
+            region_name,
+            profile_name,
+            endpoint_url,
+            max_concurrency,
+            max_attempts=WRITE_MAX_ATTEMPTS,
+        )
+        self.cache_ttl = cache_ttl
+        self.write_rate = write_rate
+        self.max_concurrency = max_concurrency
+        self._is_default = client is None and not (
+            region_name or profile_name or endpoint_url
+        )
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="acat-ssm"
+        )
+
+    def __enter__(self) -> SSMStore:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._executor.shutdown()
+
+    @property
+    def _shared_client(self) -> Optional[SSMClient]:
+        # None lets the functions of `acat.ssm.utils` use the cache and backend
+        return None if self._is_default else self.client
+
+    def _invalidate(self, names: Iterable[str]) -> None:
+        """Mark the cached snapshots that may hold the written names as stale."""
+        names = list(names)
+
+        if self.cache_ttl is None or not self._is_default or not names:
+            return
+
+        from acat.ssm.cache import SnapshotCache
+
+        with SnapshotCache() as cache:
+            cache.invalidate(os.path.commonprefix(names))
+
+    def list(self, path_preffix: str) -> set[str]:
+        """List the names of the parameters under a path preffix."""
+        return get_ssm_parameter_names(
+            path_preffix, self.cache_ttl, client=self._shared_client
+        )
+
+    def get(self, path_preffix: str, with_key_ids: bool = False) -> ParameterStore:
+        """Get the parameters under a path preffix.
+
+        SecureStrings only get their KMS keys if `with_key_ids` is set, see
+        `acat.ssm.utils.iter_ssm_parameters`.
+        """
+        return get_ssm_parameter_store(
+            path_preffix, self.cache_ttl, self._shared_client, with_key_ids
+        )
+
+    def get_many(self, names: Iterable[str]) -> ParameterStore:
+        """Get parameters by name in concurrent batches of 10.
+
+        Parameters that do not exist are left out.
+        """
+
+        def fetch(batch: list[str]) -> list[Parameter]:
+            pages = iter_ssm_parameters_by_name(batch, self.client, missing_ok=True)
+            return [parameter for page in pages for parameter in page]
+
+        store = ParameterStore()
+
+        for batch in self._executor.map(
+            fetch, chunked(sorted(names), GET_PARAMETERS_MAX_NAMES)
+        ):
+            store.extend(batch)
+
+        return store
+
+    def put(
+        self, parameters: Iterable[Parameter], overwrite: bool = False
+    ) -> PutResult:
+        """Write parameters, throttled to `write_rate` per second."""
+        count = 0
+        names: list[str] = []
+
+        def counted(parameters: Iterable[Parameter]) -> Iterator[Parameter]:
+            nonlocal count
+
+            for parameter in parameters:
+                yield parameter
+                count += 1
+
+                if self.cache_ttl is not None:
+                    names.append(parameter["Name"])
+
+        failures = write_ssm_parameters(
+            counted(parameters),
+            overwrite,
+            client=None if self._is_default else self._write_client,
+            rate=self.write_rate,
+            max_concurrency=self.max_concurrency,
+            executor=self._executor,
+        )
+        self._invalidate(names)
+
+        return {"Written": count - len(failures), "Failed": failures}
+
+    def delete(self, names: Iterable[str]) -> DeleteResult:
+        """Delete parameters in concurrent batches of 10."""
+        result = delete_ssm_parameters(
+            names,
+            rate=self.write_rate,
+            max_concurrency=self.max_concurrency,
+            client=self._write_client,
+            executor=self._executor,
+        )
+        self._invalidate(result["Deleted"])
+
+        return result
+
+    def plan_copy(
+        self,
+        source: str,
+        destination: str,
+        overwrite: bool = False,
+        transform: Optional[Transform] = None,
+    ) -> CopyPlan:
+        """Compare the copies of the source parameters with the destination.
+
+        Parameters are moved from the `source` preffix to the `destination`
+        one, or go through `transform` if given. Both trees are only held
+        until the plan is made.
+        """
+        transform = transform or Transform(source, destination)
+        source_params = self.get(source, with_key_ids=True)
+        logger.debug("Found {} parameters in {}", len(source_params), source)
+        dest_params = self.get(destination, with_key_ids=True)
+        logger.debug("Found {} parameters in {}", len(dest_params), destination)
+        new_params = (transform(parameter) for parameter in source_params.parameters())
+
+        return plan_copy(new_params, dest_params, overwrite)
+
+    def apply_copy(self, plan: CopyPlan, overwrite: bool = False) -> CopyResult:
+        """Write the created and updated parameters of a copy plan."""
+        result = self.put(plan["Created"] + plan["Updated"], overwrite)
+
+        return {
+            "Summary": summarize_copy(plan, result["Failed"]),
+            "Failures": result["Failed"],
+        }
+
+    def copy(
+        self,
+        source: str,
+        destination: str,
+        overwrite: bool = False,
+        transform: Optional[Transform] = None,
+    ) -> CopyResult:
+        """Copy the parameters under a preffix to another one."""
+        plan = self.plan_copy(source, destination, overwrite, transform)
+        return self.apply_copy(plan, overwrite)
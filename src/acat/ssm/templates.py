@@ -0,0 +1,173 @@
+import concurrent.futures
+import errno
+import glob
+import hashlib
+import json
+import mmap
+import os
+import re
+from pathlib import Path
+from typing import Iterable
+from typing import Optional
+from typing import TypedDict
+
+from acat.logger import logger
+
+TEMPLATE_EXTENSIONS = (".yaml", ".yml", ".json")
+MATCH_STR = r"\{\{ ?resolve:ssm:\/\$\{AWS::StackName\}(\/[^\s}]+) ?\}\+?\}"
+MATCH_PATTERN = re.compile(MATCH_STR.encode())
+DEFAULT_SCAN_WORKERS = 8
+
+
+class ScanEntry(TypedDict):
+    mtime_ns: int
+    size: int
+    digest: str
+    params: list[str]
+
+
+def find_templates(template_paths: Iterable[str]) -> list[Path]:
+    """Expand files, directories and glob patterns into template files.
+
+    Directories are searched recursively for `.yaml`, `.yml` and `.json`
+    files, so nested stacks are included. Files given explicitly must have
+    one of those extensions.
+    """
+    templates: dict[Path, None] = {}  # Keeps the order and drops duplicates
+
+    for template_path in template_paths:
+        if glob.has_magic(template_path):
+            matches = sorted(glob.glob(template_path, recursive=True))
+
+            if not matches:
+                raise FileNotFoundError(
+                    errno.ENOENT, "No template files match", template_path
+                )
+
+            candidates = [Path(match) for match in matches]
+        elif os.path.isdir(template_path):
+            candidates = sorted(
+                path
+                for path in Path(template_path).rglob("*")
+                if path.suffix in TEMPLATE_EXTENSIONS and path.is_file()
+            )
+        else:
+            if not template_path.endswith(TEMPLATE_EXTENSIONS):
+                raise ValueError(
+                    "Template file must have .yaml, .yml or .json extension"
+                )
+
+            candidates = [Path(template_path)]
+
+        templates.update(
+            (path, None) for path in candidates if path.suffix in TEMPLATE_EXTENSIONS
+        )
+
+    return list(templates)
+
+
+def scan_template(path: Path) -> list[str]:
+    """Find the stack-relative SSM parameter references in a template.
+
+    The file is memory-mapped and scanned in one pass with the precompiled
+    pattern instead of line by line.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return []
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            return sorted(
+                {match.group(1).decode() for match in MATCH_PATTERN.finditer(buffer)}
+            )
+
+
+def _digest(path: Path) -> str:
+    return hashlib.blake2b(path.read_bytes()).hexdigest()
+
+
+class TemplateScanCache:
+    """JSON cache of template scan results keyed by file path.
+
+    An entry is reused while the file's modification time and size are
+    unchanged. If they changed but the content hash did not (e.g. after a
+    checkout), the entry is reused without rescanning. The file stores the
+    pattern the entries were scanned with, and all of them are dropped when
+    `MATCH_STR` changes.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        if path is None:
+            from acat.ssm.cache import get_cache_dir
+
+            path = get_cache_dir() / "templates.json"
+
+        self.path = path
+        self._dirty = False
+
+        self._entries: dict[str, ScanEntry] = {}
+
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return
+
+        if isinstance(data, dict) and data.get("match") == MATCH_STR:
+            self._entries = data["entries"]
+
+    def scan(self, path: Path) -> list[str]:
+        stat = path.stat()
+        key = str(path.resolve())
+        entry = self._entries.get(key)
+
+        if entry and (entry["mtime_ns"], entry["size"]) == (
+            stat.st_mtime_ns,
+            stat.st_size,
+        ):
+            return entry["params"]
+
+        digest = _digest(path)
+
+        if entry and entry["digest"] == digest:
+            params = entry["params"]
+        else:
+            logger.debug("Scanning template file: {}", path)
+            params = scan_template(path)
+
+        self._entries[key] = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "digest": digest,
+            "params": params,
+        }
+        self._dirty = True
+        return params
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({"match": MATCH_STR, "entries": self._entries}))
+        tmp_path.replace(self.path)
+
+
+def scan_templates(
+    template_paths: Iterable[str],
+    use_cache: bool = True,
+    max_workers: int = DEFAULT_SCAN_WORKERS,
+) -> set[str]:
+    """Scan several templates in parallel for stack-relative SSM references."""
+    templates = find_templates(template_paths)
+    logger.debug("Scanning {} template files", len(templates))
+    cache = TemplateScanCache() if use_cache else None
+    scan = cache.scan if cache else scan_template
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(scan, templates))
+
+    if cache:
+        cache.save()
+
+    return {param for params in results for param in params}
@@ -0,0 +1,268 @@
+import asyncio
+import concurrent.futures
+import contextlib
+import random
+import threading
+import time
+from typing import Callable
+from typing import Generic
+from typing import Iterable
+from typing import Optional
+from typing import TypedDict
+from typing import TypeVar
+
+from acat.logger import logger
+
+T = TypeVar("T")
+
+THROTTLING_ERROR_CODES = {
+    "RequestLimitExceeded",
+    "Throttling",
+    "ThrottlingException",
+    "TooManyRequestsException",
+    "TooManyUpdates",
+}
+TRANSIENT_ERROR_CODES = {
+    "InternalFailure",
+    "InternalServerError",
+    "RequestTimeout",
+    "RequestTimeoutException",
+    "ServiceUnavailable",
+}
+DEFAULT_WRITE_RATE = 10.0  # PutParameter requests per second
+DEFAULT_MAX_CONCURRENCY = 10
+DEFAULT_MAX_ATTEMPTS = 10
+
+
+class Failure(TypedDict):
+    Name: str
+    Error: str
+
+
+def is_throttling_error(error: Exception) -> bool:
+    """Check whether an exception raised by a boto3 client is a throttle."""
+    response = getattr(error, "response", None) or {}
+    return response.get("Error", {}).get("Code") in THROTTLING_ERROR_CODES
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """Check whether a request may succeed if sent again.
+
+    That is a throttle, a server error or a connection that failed or was
+    reset, which botocore would retry on its own.
+    """
+    from botocore.exceptions import ConnectionError as BotocoreConnectionError
+    from botocore.exceptions import HTTPClientError
+
+    if is_throttling_error(error) or isinstance(
+        error, (BotocoreConnectionError, HTTPClientError)
+    ):
+        return True
+
+    response = getattr(error, "response", None) or {}
+    status = response.get("ResponseMetadata", {}).get("HTTPStatusCode", 0)
+    code = response.get("Error", {}).get("Code")
+    return status >= 500 or code in TRANSIENT_ERROR_CODES
+
+
+def backoff(attempt: int, base_delay: float = 0.1, max_delay: float = 20.0) -> float:
+    """Exponential backoff with full jitter for the given retry attempt."""
+    return random.uniform(0, min(max_delay, base_delay * 2**attempt))
+
+
+class TokenBucket:
+    """Thread-safe token bucket that limits how many requests are sent per second.
+
+    The bucket starts full, so small batches are sent without waiting, and is
+    refilled at `rate` tokens per second up to `capacity`. The capacity is at
+    least one token, so rates below one request per second still hand out
+    tokens.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        if rate <= 0:
+            raise ValueError("Rate must be greater than 0")
+
+        self.rate = rate
+        self.capacity = max(1.0, capacity or rate)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take(self) -> float:
+        """Take a token if available, or return how long to wait for one."""
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._updated_at
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated_at = now
+
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self) -> None:
+        """Take a token from the bucket, blocking until one is available."""
+        while wait := self._take():
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        """Take a token from the bucket without blocking the event loop."""
+        while wait := self._take():
+            await asyncio.sleep(wait)
+
+
+class AdaptiveConcurrency:
+    """Concurrency limit driven by additive-increase/multiplicative-decrease.
+
+    Every successful request grows the limit by roughly one slot per round of
+    requests, and every throttle halves it. Decreases are applied at most once
+    per `cooldown` seconds so a burst of throttled in-flight requests only
+    counts as a single congestion signal.
+    """
+
+    def __init__(self, maximum: int, minimum: int = 1, cooldown: float = 1.0):
+        if not 1 <= minimum <= maximum:
+            raise ValueError("Concurrency limits must satisfy 1 <= minimum <= maximum")
+
+        self.minimum = minimum
+        self.maximum = maximum
+        self.cooldown = cooldown
+        self.limit = float(maximum)
+        self._in_flight = 0
+        self._decreased_at = float("-inf")
+        self._condition = threading.Condition()
+
+    def acquire(self) -> None:
+        with self._condition:
+            while self._in_flight >= int(self.limit):
+                self._condition.wait()
+
+            self._in_flight += 1
+
+    def release(self) -> None:
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def on_success(self) -> None:
+        with self._condition:
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._condition.notify_all()
+
+    def on_throttle(self) -> None:
+        with self._condition:
+            now = time.monotonic()
+
+            if now - self._decreased_at < self.cooldown:
+                return
+
+            self._decreased_at = now
+            self.limit = max(self.minimum, self.limit / 2)
+            logger.debug("Throttled, reducing concurrency to {}", int(self.limit))
+
+
+class WriteScheduler(Generic[T]):
+    """Run write requests under a rate limit with adaptive concurrency.
+
+    Throttled requests, server errors and failed connections are retried
+    with exponential backoff and full jitter until `max_attempts` is reached,
+    and throttles also halve the concurrency. Any other error fails the item
+    straight away. Items that could not be written are returned by `run`, so
+    callers can report them instead of silently losing writes. Clients should
+    not retry requests themselves, so the concurrency backs off from the first
+    throttle (see `acat.ssm.client.WRITE_MAX_ATTEMPTS`). Retries are counted
+    for `operation` in the API call statistics, if given.
+    """
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_WRITE_RATE,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        base_delay: float = 0.1,
+        max_delay: float = 20.0,
+        operation: Optional[str] = None,
+    ):
+        self.bucket = TokenBucket(rate)
+        self.concurrency = AdaptiveConcurrency(max_concurrency)
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.operation = operation
+
+    def _execute(self, item: T, func: Callable[[T], None], name: str) -> Failure | None:
+        try:
+            for attempt in range(self.max_attempts):
+                self.bucket.acquire()
+
+                try:
+                    func(item)
+                except Exception as e:
+                    if not is_retryable_error(e):
+                        return {"Name": name, "Error": str(e)}
+
+                    if is_throttling_error(e):
+                        self.concurrency.on_throttle()
+
+                    if attempt + 1 == self.max_attempts:
+                        return {"Name": name, "Error": str(e)}
+
+                    delay = backoff(attempt, self.base_delay, self.max_delay)
+                    logger.debug(
+                        "Failed writing {} ({}), retrying in {:.2f}s", name, e, delay
+                    )
+
+                    if self.operation:
+                        # Imported here, acat.stats imports this module
+                        from acat.stats import record_retry
+
+                        record_retry(self.operation)
+
+                    time.sleep(delay)
+                else:
+                    self.concurrency.on_success()
+                    return None
+        finally:
+            self.concurrency.release()
+
+        return None  # pragma: no cover
+
+    def run(
+        self,
+        items: Iterable[T],
+        func: Callable[[T], None],
+        key: Callable[[T], str],
+        executor: Optional[concurrent.futures.Executor] = None,
+    ) -> list[Failure]:
+        """Apply `func` to every item and return the items that failed.
+
+        Items are consumed lazily: a new item is only taken from `items` once
+        a concurrency slot is free, so iterators are never fully materialized.
+        Requests run in `executor` if given, which is left open and needs at
+        least `max_concurrency` workers, or in a new thread pool otherwise.
+        """
+        failures: list[Failure] = []
+        futures: set[concurrent.futures.Future] = set()
+
+        with (
+            contextlib.nullcontext(executor)
+            if executor
+            else concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.concurrency.maximum
+            )
+        ) as executor:
+            for item in items:
+                self.concurrency.acquire()
+                futures.add(executor.submit(self._execute, item, func, key(item)))
+                done = {future for future in futures if future.done()}
+                futures -= done
+                failures.extend(f.result() for f in done if f.result() is not None)
+
+            for future in concurrent.futures.as_completed(futures):
+                if (failure := future.result()) is not None:
+                    failures.append(failure)
+
+        return failures
@@ -0,0 +1,234 @@
+import re
+from pathlib import Path
+from typing import Iterable
+from typing import Mapping
+from typing import Optional
+
+from acat.logger import logger
+from acat.ssm.types import Parameter
+
+REPLACE_FORMAT = "s/old/new/[flags]"
+
+# sed flags that map to regular expression flags. Rules always replace every
+# match, so sed's `g` flag is rejected instead of being silently ignored.
+REGEX_FLAGS = {"i": re.IGNORECASE, "m": re.MULTILINE, "s": re.DOTALL}
+RULE_TARGETS = ("name", "value")
+
+
+def _invalid(expression: str, reason: Optional[str] = None) -> ValueError:
+    return ValueError(
+        f"Invalid replace format: {expression!r}, "
+        + (reason or f"expected {REPLACE_FORMAT}")
+    )
+
+
+def _split_expression(body: str, delimiter: str) -> list[str]:
+    """Split on the delimiters that are not escaped, unescaping the others.
+
+    Every other `\\x` pair is kept as is, so an escaped backslash right
+    before a delimiter does not escape it.
+    """
+    parts: list[str] = []
+    part: list[str] = []
+    chars = iter(body)
+
+    for char in chars:
+        if char == "\\":
+            escaped = next(chars, "")
+            part.append(escaped if escaped == delimiter else char + escaped)
+        elif char == delimiter:
+            parts.append("".join(part))
+            part = []
+        else:
+            part.append(char)
+
+    parts.append("".join(part))
+    return parts
+
+
+class Rule:
+    """A compiled `s/old/new/flags` substitution.
+
+    Any character that is not alphanumeric, a backslash or whitespace can be
+    used as the delimiter, e.g. `s|/dev/|/prod/|`, and is escaped with a
+    backslash to use it as a literal character in the pattern or replacement.
+    Unlike sed, every match is replaced.
+    """
+
+    def __init__(self, expression: str):
+        delimiter = expression[1:2]
+
+        if expression[:1] != "s" or not delimiter or delimiter in "\\ \t":
+            raise _invalid(expression)
+
+        if delimiter.isalnum():
+            raise _invalid(expression)
+
+        parts = _split_expression(expression[2:], delimiter)
+
+        if len(parts) != 3:
+            raise _invalid(expression)
+
+        old, new, flags = parts
+
+        if "g" in flags:
+            raise _invalid(expression, "rules always replace every match, drop `g`")
+
+        if not set(flags) <= set(REGEX_FLAGS):
+            raise _invalid(expression)
+
+        # Delimiters are only left in the parts where they were escaped
+        old = old.replace(delimiter, re.escape(delimiter))
+        regex_flags = 0
+
+        for flag in flags:
+            regex_flags |= REGEX_FLAGS.get(flag, 0)
+
+        try:
+            self.pattern = re.compile(old, regex_flags)
+        except re.error as e:
+            raise _invalid(expression, str(e)) from e
+
+        self.expression = expression
+        self.replacement = new
+
+    def apply(self, text: str) -> str:
+        return self.pattern.sub(self.replacement, text)
+
+
+def parse_rules_file(path: Path) -> tuple[list[Rule], list[Rule]]:
+    """Read the name and value rules of a rules file.
+
+    Every line is a rule, optionally preceded by `name` or `value` to choose
+    what it applies to (values by default). Blank lines and lines starting
+    with `#` are ignored.
+    """
+    rules: dict[str, list[Rule]] = {target: [] for target in RULE_TARGETS}
+
+    for number, line in enumerate(path.read_text().splitlines(), start=1):
+        line = line.strip()
+
+        if not line or line.startswith("#"):
+            continue
+
+        target, _, expression = line.partition(" ")
+
+        if target not in RULE_TARGETS:
+            target, expression = "value", line
+
+        try:
+            rules[target].append(Rule(expression.strip()))
+        except ValueError as e:
+            raise ValueError(f"{path}:{number}: {e}") from e
+
+    return rules["name"], rules["value"]
+
+
+def parse_key_map(mappings: Iterable[str]) -> dict[str, str]:
+    """Parse `SOURCE=DESTINATION` KMS key mappings."""
+    key_map: dict[str, str] = {}
+
+    for mapping in mappings:
+        source, separator, destination = mapping.partition("=")
+
+        if not (source and separator and destination):
+            raise ValueError(
+                f"Invalid KMS key mapping: {mapping!r}, expected SOURCE=DESTINATION"
+            )
+
+        key_map[source] = destination
+
+    return key_map
+
+
+class Transform:
+    """Map source parameters to their copies with compiled rules.
+
+    Names are moved from the `source` preffix to the `destination` one, only
+    at the start of the name, and then go through the name rules. Values go
+    through the value rules. Rules are applied in order. The KMS keys of
+    SecureStrings are replaced as given in `key_map`, and kept otherwise.
+    """
+
+    def __init__(
+        self,
+        source: str,
+        destination: str,
+        name_rules: Iterable[Rule] = (),
+        value_rules: Iterable[Rule] = (),
+        key_map: Optional[Mapping[str, str]] = None,
+    ):
+        self.source = source
+        self.destination = destination
+        self.name_rules = list(name_rules)
+        self.value_rules = list(value_rules)
+        self.key_map = key_map or {}
+
+    def rename(self, name: str) -> str:
+        if name.startswith(self.source):
+            name = f"{self.destination}{name[len(self.source) :]}"
+
+        for rule in self.name_rules:
+            name = rule.apply(name)
+
+        return name
+
+    def __call__(self, parameter: Parameter) -> Parameter:
+        new_name = self.rename(parameter["Name"])
+        value = parameter["Value"]
+
+        for rule in self.value_rules:
+            value = rule.apply(value)
+
+        if self.value_rules and parameter["Type"] == "SecureString":
+            logger.info(
+                "SecureString '{}' will become '{}'", parameter["Name"], new_name
+            )
+        elif self.value_rules:
+            logger.info(
+                "Parameter '{}' with value '{}' will become '{}' with value '{}'",
+                parameter["Name"],
+                parameter["Value"],
+                new_name,
+                value,
+            )
+
+        new_parameter: Parameter = {
+            "Name": new_name,
+            "Value": value,
+            "Type": parameter["Type"],
+        }
+
+        if "KeyId" in parameter:
+            key_id = parameter["KeyId"]
+            new_parameter["KeyId"] = self.key_map.get(key_id, key_id)
+
+        return new_parameter
+
+
+def build_transform(
+    source: str,
+    destination: str,
+    replace: Iterable[str] = (),
+    replace_name: Iterable[str] = (),
+    rules_file: Optional[Path] = None,
+    key_map: Iterable[str] = (),
+) -> Transform:
+    """Compile the rules given on the command line and in a rules file.
+
+    Raises `ValueError` if any rule or KMS key mapping is invalid.
+    """
+    name_rules = [Rule(expression) for expression in replace_name]
+    value_rules = [Rule(expression) for expression in replace]
+
+    if rules_file:
+        file_name_rules, file_value_rules = parse_rules_file(rules_file)
+        name_rules += file_name_rules
+        value_rules += file_value_rules
+
+    for rule in (*name_rules, *value_rules):
+        logger.debug("Replacing {} with {}", rule.pattern.pattern, rule.replacement)
+
+    return Transform(
+        source, destination, name_rules, value_rules, parse_key_map(key_map)
+    )
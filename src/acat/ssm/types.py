@@ -1,9 +1,18 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
 from typing import TypedDict
 
-from mypy_boto3_ssm.literals import ParameterTypeType
+if TYPE_CHECKING:
+    from mypy_boto3_ssm.literals import ParameterTypeType
 
 
-class Parameter(TypedDict):
+class _ParameterFields(TypedDict):
     Name: str
     Value: str
     Type: ParameterTypeType
+
+
+class Parameter(_ParameterFields, total=False):
+    # KMS key of SecureString parameters
+    KeyId: str
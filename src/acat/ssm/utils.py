@@ -1,55 +1,134 @@
+from __future__ import annotations
+
+import collections
 import concurrent.futures
-import re
+import itertools
+import os
+import string
+import threading
+from typing import TYPE_CHECKING
+from typing import Iterable
+from typing import Iterator
+from typing import Mapping
+from typing import Optional
 from typing import Sequence
 from typing import Set
+from typing import TypedDict
+from typing import TypeVar
 
-import boto3
 import click
-from mypy_boto3_ssm import SSMClient
-from mypy_boto3_ssm.type_defs import ParameterStringFilterTypeDef
 
+from acat.logger import is_enabled
 from acat.logger import logger
+from acat.ssm.client import WRITE_MAX_ATTEMPTS
+from acat.ssm.client import get_ssm_client
+from acat.ssm.records import ParameterStore
+from acat.ssm.templates import MATCH_STR
+from acat.ssm.templates import scan_templates
+from acat.ssm.throttling import DEFAULT_MAX_CONCURRENCY
+from acat.ssm.throttling import DEFAULT_WRITE_RATE
+from acat.ssm.throttling import Failure
+from acat.ssm.throttling import WriteScheduler
 from acat.ssm.types import Parameter
 
-MATCH_STR = r"\{\{ ?resolve:ssm:\/\$\{AWS::StackName\}(\/.+) ?\}\+?\}"
+if TYPE_CHECKING:
+    from mypy_boto3_ssm import SSMClient
+    from mypy_boto3_ssm.type_defs import ParameterMetadataTypeDef
+    from mypy_boto3_ssm.type_defs import ParameterStringFilterTypeDef
+    from mypy_boto3_ssm.type_defs import ParameterTypeDef
+
+T = TypeVar("T")
+
+DELETE_PARAMETERS_MAX_NAMES = 10  # AWS maximum allowed value
+GET_PARAMETERS_MAX_NAMES = 10  # AWS maximum allowed value
+GET_PARAMETERS_BY_PATH_MAX_RESULTS = 10  # AWS maximum allowed value
+DESCRIBE_PARAMETERS_MAX_NAMES = 50  # AWS maximum values per filter
+DESCRIBE_PARAMETERS_MAX_RESULTS = 50  # AWS maximum allowed value
+# Characters allowed in parameter names, to list the branches off a preffix
+SHARD_CHARS = string.ascii_letters + string.digits + "_.-/"
+MAX_SHARD_DEPTH = 1  # Times a preffix is split on the way down in listing shards
+
+
+BACKENDS = ("thread", "async")
+_backend = "thread"
+
+
+def set_backend(backend: str) -> None:
+    """Select the concurrency backend used by the functions of this module.
+
+    `thread` uses boto3 and thread pools. `async` runs the same operations on
+    asyncio with aiobotocore (see `acat.ssm.aio`).
+    """
+    global _backend
+
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend must be one of: {', '.join(BACKENDS)}")
+
+    _backend = backend
+
 
+class CopyPlan(TypedDict):
+    Created: list[Parameter]
+    Updated: list[Parameter]
+    Unchanged: list[Parameter]
+    Skipped: list[Parameter]
 
-def get_current_params(template_path: str, path_preffix: str) -> Set[str]:
-    logger.info(f"Reading SSM parameters used in template file: {template_path}")
 
-    if not re.search(r"\.ya?ml$", template_path):
-        raise ValueError("Template file must have .yaml or .yml extension")
+class CopySummary(TypedDict):
+    Created: int
+    Updated: int
+    Unchanged: int
+    Skipped: int
+    Failed: int
 
-    logger.debug(f"Path preffix: {path_preffix}")
-    logger.debug(f"Match string: {MATCH_STR}")
-    current_params = set()
 
-    with open(template_path, "r") as f:
-        for line in f:
-            match = re.search(MATCH_STR, line)
-            if match:
-                param = f"/{path_preffix.strip('/')}/{match.group(1).strip('/')}"
-                current_params.add(param)
+class DeleteResult(TypedDict):
+    Deleted: list[str]
+    Invalid: list[str]
+    Failed: list[Failure]
 
-    logger.info(f"Found {len(current_params)} current parameters")
 
-    for param in sorted(current_params):
-        logger.debug(f"\t{param}")
+def get_current_params(
+    template_path: str | Sequence[str], path_preffix: str, use_cache: bool = True
+) -> Set[str]:
+    """Get the SSM parameters referenced by one or more templates.
+
+    `template_path` can be a file, a directory or a glob pattern, or a list
+    of them. YAML and JSON templates are scanned in parallel, and unchanged
+    files are served from the scan cache unless `use_cache` is False.
+    """
+    if isinstance(template_path, str):
+        template_path = [template_path]
+
+    logger.info("Reading SSM parameters used in template files: {}", template_path)
+    logger.debug("Path preffix: {}", path_preffix)
+    logger.debug("Match string: {}", MATCH_STR)
+    current_params = {
+        f"/{path_preffix.strip('/')}/{param.strip('/')}"
+        for param in scan_templates(template_path, use_cache)
+    }
+
+    logger.info("Found {} current parameters", len(current_params))
+
+    if is_enabled("DEBUG"):
+        for param in sorted(current_params):
+            logger.debug("\t{}", param)
 
     return current_params
 
 
-def get_ssm_parameter_names(path_preffix: str) -> set[str]:
-    logger.info(f"Getting SSM parameter names with path preffix: {path_preffix}")
-    client: SSMClient = boto3.client("ssm")
+def iter_ssm_parameter_metadata(
+    path_preffix: str, client: Optional[SSMClient] = None
+) -> Iterator[list[ParameterMetadataTypeDef]]:
+    """Yield pages of `describe_parameters` metadata for a path preffix."""
+    client = client or get_ssm_client()
     parameter_filters: Sequence[ParameterStringFilterTypeDef] = [
         {"Key": "Name", "Option": "BeginsWith", "Values": [path_preffix]}
     ]
     i = 1
-    parameters: set[str] = set()
 
     while True:
-        logger.debug(f"Getting parameters page {i:02d}")
+        logger.debug("Getting parameters page {:02d}", i)
         args = {
             "MaxResults": 50,  # AWS maximum allowed value
             "ParameterFilters": parameter_filters,
@@ -60,71 +139,669 @@ def get_ssm_parameter_names(path_preffix: str) -> set[str]:
             args["NextToken"] = response["NextToken"]  # type: ignore # noqa F821
 
         response = client.describe_parameters(**args)  # type: ignore
-        parameters.update({param.get("Name", "") for param in response["Parameters"]})
+        yield response["Parameters"]
         i += 1
 
         if "NextToken" not in response:
             break
 
-    return parameters
 
+def _describe_names(
+    client: SSMClient,
+    option: str,
+    values: list[str],
+    next_token: Optional[str] = None,
+) -> tuple[list[str], Optional[str]]:
+    """Get a page of names matching a filter and the token of the next page."""
+    args = {
+        "MaxResults": DESCRIBE_PARAMETERS_MAX_RESULTS,
+        "ParameterFilters": [{"Key": "Name", "Option": option, "Values": values}],
+    }
+
+    if next_token:
+        args["NextToken"] = next_token
+
+    response = client.describe_parameters(**args)  # type: ignore
+    names = [param["Name"] for param in response["Parameters"] if "Name" in param]
+    return names, response.get("NextToken")
+
+
+def _child_segments(path_preffix: str, names: Iterable[str]) -> set[str]:
+    """Get the next path segments under a preffix, e.g. `/app/prod/` for `/app`."""
+    children = set()
+
+    for name in names:
+        end = name.find("/", len(path_preffix) + 1)
+
+        if name.startswith(path_preffix) and end != -1:
+            children.add(name[: end + 1])
+
+    return children
+
+
+def _complement(
+    path_preffix: str, children: set[str]
+) -> Iterator[tuple[str, list[str]]]:
+    """Yield the filters for the names under a preffix outside its children.
+
+    These are the `BeginsWith` values of every branch off the way from the
+    preffix to each child, and the `Equals` values of the preffixes on the
+    way, which can be names too, in batches of 50.
+    """
+    preffixes = {
+        child[:end]
+        for child in children
+        for end in range(len(path_preffix), len(child))
+    }
+    branches = [
+        f"{preffix}{char}"
+        for preffix in sorted(preffixes)
+        for char in SHARD_CHARS
+        if f"{preffix}{char}" not in preffixes | children
+    ]
+
+    equals = sorted(preffix for preffix in preffixes if preffix)
+
+    for option, values in (("BeginsWith", branches), ("Equals", equals)):
+        for batch in chunked(values, DESCRIBE_PARAMETERS_MAX_NAMES):
+            yield option, batch
+
+
+def _list_filter(
+    client: SSMClient, option: str, values: list[str]
+) -> tuple[list[str], list[tuple[str, list[str]]]]:
+    """List every name matching a filter, with no finer filters to split in."""
+    names, next_token = _describe_names(client, option, values)
+
+    while next_token:
+        page, next_token = _describe_names(client, option, values, next_token)
+        names += page
+
+    return names, []
+
+
+def _split(values: list[str], names: list[str]) -> list[tuple[str, list[str]]]:
+    """Get finer `BeginsWith` filters for a filter, from the names of a page.
+
+    A single preffix is split in the child path segments seen in the page,
+    or in the next characters if there are none, and the filters of its
+    complement. Several preffixes are split in one filter for each preffix
+    seen in the page, and two halves of the rest, so that no more than six
+    splits are needed to get to single preffixes, whatever the page holds.
+    """
+    if len(values) == 1:
+        path_preffix = values[0]
+        children = _child_segments(path_preffix, names) or {
+            name[: len(path_preffix) + 1]
+            for name in names
+            if len(name) > len(path_preffix)
+        }
+        shards = [("BeginsWith", [child]) for child in sorted(children)]
+        return shards + list(_complement(path_preffix, children))
+
+    seen = [value for value in values if any(n.startswith(value) for n in names)]
+    rest = [value for value in values if value not in seen]
+    halves = [rest[: len(rest) // 2], rest[len(rest) // 2 :]]
+    return [("BeginsWith", [value]) for value in seen] + [
+        ("BeginsWith", half) for half in halves if half
+    ]
+
+
+def _list_shard(
+    client: SSMClient, option: str, values: list[str], split: bool
+) -> tuple[list[str], list[tuple[str, list[str]]]]:
+    """List the names that match a filter.
 
-def get_ssm_parameters(path_preffix: str) -> list[Parameter]:
-    logger.info(f"Getting SSM parameters with path preffix: {path_preffix}")
-    client: SSMClient = boto3.client("ssm")
-    parameter_names = get_ssm_parameter_names(path_preffix)
-    parameters: list[Parameter] = []
-
-    def fetch_parameter(name: str) -> Parameter | None:
-        try:
-            full_param = client.get_parameter(Name=name)["Parameter"]
-            if (
-                "Name" not in full_param
-                or "Value" not in full_param
-                or "Type" not in full_param
-            ):  # pragma: no cover
-                logger.warning(
-                    f"Parameter {full_param} does not have all required fields"
-                )
-                return None
-            parameter: Parameter = {
-                "Name": full_param["Name"],
-                "Value": full_param["Value"],
-                "Type": full_param["Type"],
-            }
-            return parameter
-        except Exception as e:  # pragma: no cover
-            logger.error(f"Error fetching parameter {name}: {e}")
-            return None
-
-    with concurrent.futures.ThreadPoolExecutor() as executor:
-        futures = [executor.submit(fetch_parameter, name) for name in parameter_names]
-
-        for future in concurrent.futures.as_completed(futures):
-            parameter = future.result()
-
-            if parameter:
-                parameters.append(parameter)
+    If `split` is set and there are more pages after the first one, only
+    the first page is read, and the second value has the finer filters to
+    list instead (see `_split`). `Equals` filters match 50 names at most
+    and are never split.
+    """
+    if option != "BeginsWith" or not split:
+        return _list_filter(client, option, values)
+
+    names, next_token = _describe_names(client, option, values)
+
+    if next_token:
+        return names, _split(values, names)
+
+    return names, []
+
+
+def list_ssm_parameter_names(
+    path_preffix: str,
+    client: Optional[SSMClient] = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    max_depth: int = MAX_SHARD_DEPTH,
+) -> set[str]:
+    """List the names that begin with a preffix in concurrent shards.
+
+    The first page is read on its own, so small preffixes take a single
+    call. If there are more pages, the preffix is split in one shard per
+    child path segment seen in that page (e.g. the environments under
+    `/app/`), and the names outside them are listed with the `BeginsWith`
+    values of every other branch off the preffix, and with one `Equals`
+    filter for the preffixes on the way, 50 values at a time. Any of these
+    shards with more pages is split again (see `_split`), so the split does
+    not depend on the order of the names in the first page. A preffix is
+    split up to `max_depth` times on the way down, at most
+    `max_concurrency` calls are in flight, and names seen by several shards
+    are merged.
+    """
+    client = client or get_ssm_client(max_concurrency=max_concurrency)
+    names: set[str] = set()
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+        root = ("BeginsWith", [path_preffix])
+        futures = {pool.submit(_list_shard, client, *root, max_depth > 0): (root, 0)}
+
+        while futures:
+            done, _ = concurrent.futures.wait(
+                futures, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+
+            for future in done:
+                (_, values), depth = futures.pop(future)
+                shard_names, shards = future.result()
+
+                names.update(shard_names)
+
+                # Splitting several preffixes does not go any deeper
+                depth += len(values) == 1
+
+                for option, batch in shards:
+                    split = len(batch) > 1 or depth < max_depth
+                    future = pool.submit(_list_shard, client, option, batch, split)
+                    futures[future] = ((option, batch), depth)
+
+    return names
+
+
+def get_ssm_parameter_names(
+    path_preffix: str,
+    cache_ttl: Optional[float] = None,
+    client: Optional[SSMClient] = None,
+) -> set[str]:
+    """Get the names of all SSM parameters that begin with a path preffix.
+
+    Names are listed in concurrent shards with `list_ssm_parameter_names`.
+    They are returned in a plain set rather than a `PathIndex`, which is only
+    smaller when many names share their last segment and is much slower in
+    set differences, e.g. in `delete-unused`. If `cache_ttl` is given, names
+    are served from the local snapshot cache, which is refreshed when it is
+    older than `cache_ttl` seconds. The cache and the async backend only
+    apply to the default client.
+    """
+    logger.info("Getting SSM parameter names with path preffix: {}", path_preffix)
+
+    if cache_ttl is not None and client is None:
+        from acat.ssm.cache import SnapshotCache
+
+        with SnapshotCache() as cache:
+            return cache.names(path_preffix, cache_ttl)
+
+    if _backend == "async" and client is None:
+        from acat.ssm import aio
+
+        return aio.run(aio.get_ssm_parameter_names(path_preffix))
+
+    return list_ssm_parameter_names(path_preffix, client)
+
+
+def to_parameter(full_param: ParameterTypeDef) -> Parameter | None:
+    if (
+        "Name" not in full_param
+        or "Value" not in full_param
+        or "Type" not in full_param
+    ):  # pragma: no cover
+        logger.warning("Parameter {} does not have all required fields", full_param)
+        return None
+
+    parameter: Parameter = {
+        "Name": full_param["Name"],
+        "Value": full_param["Value"],
+        "Type": full_param["Type"],
+    }
+    return parameter
+
+
+def set_key_ids(
+    parameters: list[Parameter], key_ids: Mapping[str, Optional[str]]
+) -> list[Parameter]:
+    """Set the KMS key of the SecureString parameters found in `key_ids`."""
+    for parameter in parameters:
+        if parameter["Type"] != "SecureString":
+            continue
+
+        if key_id := key_ids.get(parameter["Name"]):
+            parameter["KeyId"] = key_id
 
     return parameters
 
 
-def create_ssm_parameters(parameters: Sequence[Parameter], overwrite: bool) -> None:
-    """Create SSM parameters in parallel."""
-    client = boto3.client("ssm")
+def get_key_ids(
+    names: Iterable[str], client: Optional[SSMClient] = None
+) -> dict[str, str]:
+    """Get the KMS key of parameters from their metadata.
+
+    `get_parameters` and `get_parameters_by_path` do not return the key, so
+    it is read with `describe_parameters`, filtering up to 50 names at once.
+    """
+    client = client or get_ssm_client()
+    paginator = client.get_paginator("describe_parameters")
+    key_ids: dict[str, str] = {}
+
+    for batch in chunked(sorted(names), DESCRIBE_PARAMETERS_MAX_NAMES):
+        pages = paginator.paginate(
+            ParameterFilters=[{"Key": "Name", "Option": "Equals", "Values": batch}],
+            PaginationConfig={"PageSize": DESCRIBE_PARAMETERS_MAX_NAMES},
+        )
+        key_ids.update(
+            (param["Name"], param["KeyId"])
+            for page in pages
+            for param in page["Parameters"]
+            if "Name" in param and "KeyId" in param
+        )
+
+    return key_ids
+
+
+def _secure_names(parameters: list[Parameter]) -> list[str]:
+    return [p["Name"] for p in parameters if p["Type"] == "SecureString"]
+
+
+def iter_with_key_ids(
+    pages: Iterable[list[Parameter]], client: Optional[SSMClient] = None
+) -> Iterator[list[Parameter]]:
+    """Set the KMS keys of the SecureStrings in pages of parameters.
+
+    Keys are looked up with `get_key_ids` 50 names at a time across pages,
+    so pages are held back until the keys of their SecureStrings are known.
+    Pages without SecureStrings pass through in order, without any call.
+    """
+    client = client or get_ssm_client()
+    held: collections.deque[list[Parameter]] = collections.deque()
+    pending: list[str] = []
+    key_ids: dict[str, str] = {}
+
+    def release(page: list[Parameter]) -> list[Parameter]:
+        set_key_ids(page, key_ids)
+
+        for name in _secure_names(page):
+            key_ids.pop(name, None)
+
+        return page
+
+    for page in pages:
+        held.append(page)
+        pending += _secure_names(page)
+
+        while len(pending) >= DESCRIBE_PARAMETERS_MAX_NAMES:
+            key_ids.update(get_key_ids(pending[:DESCRIBE_PARAMETERS_MAX_NAMES], client))
+            del pending[:DESCRIBE_PARAMETERS_MAX_NAMES]
 
-    def create_parameter(parameter: Parameter, overwrite: bool):
-        try:
+        waiting = set(pending)
+
+        while held and waiting.isdisjoint(_secure_names(held[0])):
+            yield release(held.popleft())
+
+    key_ids.update(get_key_ids(pending, client))
+
+    while held:
+        yield release(held.popleft())
+
+
+def iter_ssm_parameters_by_path(
+    path: str, client: Optional[SSMClient] = None
+) -> Iterator[list[Parameter]]:
+    """Yield pages of SSM parameters stored under a path hierarchy.
+
+    Names and values are fetched together with `get_parameters_by_path`, so
+    each API call returns up to 10 full parameters. SecureStrings are
+    decrypted in the same call, but their KMS keys are not returned (see
+    `iter_with_key_ids`).
+    """
+    client = client or get_ssm_client()
+    paginator = client.get_paginator("get_parameters_by_path")
+    path = path.rstrip("/") or "/"
+    pages = paginator.paginate(
+        Path=path,
+        Recursive=True,
+        WithDecryption=True,
+        PaginationConfig={"PageSize": GET_PARAMETERS_BY_PATH_MAX_RESULTS},
+    )
+
+    for i, page in enumerate(pages, start=1):
+        logger.debug("Getting parameters by path page {:02d}", i)
+        parameters = [to_parameter(param) for param in page["Parameters"]]
+        yield [param for param in parameters if param]
+
+
+def private_opener(path: str, flags: int) -> int:
+    """`open` opener for files with decrypted values, only readable by the owner."""
+    return os.open(path, flags, 0o600)
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[list[T]]:
+    """Split an iterable in lists of at most `size` items."""
+    iterator = iter(items)
+
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
+
+
+def iter_ssm_parameters_by_name(
+    names: Iterable[str],
+    client: Optional[SSMClient] = None,
+    key_ids: Optional[Mapping[str, str]] = None,
+    missing_ok: bool = False,
+) -> Iterator[list[Parameter]]:
+    """Yield batches of SSM parameters fetched by name with `get_parameters`.
+
+    SecureStrings are decrypted in the same call. Their KMS keys are not
+    returned, and are only set if given in `key_ids`. Names that do not exist
+    are left out with a warning, or only logged at debug level if
+    `missing_ok` is set, e.g. when checking a destination.
+    """
+    client = client or get_ssm_client()
+
+    for batch in chunked(sorted(names), GET_PARAMETERS_MAX_NAMES):
+        response = client.get_parameters(Names=batch, WithDecryption=True)
+
+        for name in response.get("InvalidParameters", []):
+            logger.log(
+                "DEBUG" if missing_ok else "WARNING",
+                "Parameter {} could not be fetched",
+                name,
+            )
+
+        parameters = [to_parameter(param) for param in response["Parameters"]]
+        yield set_key_ids([param for param in parameters if param], key_ids or {})
+
+
+def outside_path_filters(path_preffix: str) -> Iterator[tuple[str, list[str]]]:
+    """Yield the name filters for `list_names_outside_path`, 50 values each."""
+    return _complement(path_preffix, {f"{path_preffix.rstrip('/')}/"})
+
+
+def list_names_outside_path(
+    path_preffix: str, client: Optional[SSMClient] = None
+) -> list[str]:
+    """List the names that begin with a preffix but are not under it as a path.
+
+    `get_parameters_by_path` only returns the parameters under `/app/prod/`,
+    while the preffix `/app/prod` also matches `/app/prod` itself and
+    siblings like `/app/prod-eu/db`. These are listed with the `BeginsWith`
+    values of the other branches off the preffix, which takes a few calls.
+    """
+    client = client or get_ssm_client()
+
+    return [
+        name
+        for option, values in outside_path_filters(path_preffix)
+        for name in _list_filter(client, option, values)[0]
+    ]
+
+
+def _iter_path_parameters(
+    path_preffix: str, client: SSMClient
+) -> Iterator[list[Parameter]]:
+    yield from iter_ssm_parameters_by_path(path_preffix, client)
+    outside = list_names_outside_path(path_preffix, client)
+    yield from iter_ssm_parameters_by_name(outside, client)
+
+
+def iter_ssm_parameters(
+    path_preffix: str, client: Optional[SSMClient] = None, with_key_ids: bool = False
+) -> Iterator[list[Parameter]]:
+    """Yield pages of SSM parameters whose name begins with a path preffix.
+
+    Only one page is held at a time. Path preffixes are paged with
+    `get_parameters_by_path`, and the names outside the path (see
+    `list_names_outside_path`) are fetched by name. Any other preffix is
+    listed one metadata page at a time and fetched by name.
+
+    The metadata listing has the KMS keys of SecureStrings. Path preffixes
+    only get them if `with_key_ids` is set, e.g. to copy the parameters,
+    since it takes an extra call per 50 SecureStrings.
+    """
+    if path_preffix.startswith("/"):
+        client = client or get_ssm_client()
+        pages = _iter_path_parameters(path_preffix, client)
+        yield from iter_with_key_ids(pages, client) if with_key_ids else pages
+        return
+
+    for page in iter_ssm_parameter_metadata(path_preffix, client):
+        names = [param["Name"] for param in page if "Name" in param]
+        key_ids = {p["Name"]: p["KeyId"] for p in page if "Name" in p and "KeyId" in p}
+        yield from iter_ssm_parameters_by_name(names, client, key_ids)
+
+
+def get_ssm_parameters(
+    path_preffix: str,
+    cache_ttl: Optional[float] = None,
+    client: Optional[SSMClient] = None,
+    with_key_ids: bool = False,
+) -> list[Parameter]:
+    """Get all SSM parameters (names, values and types) under a path preffix.
+
+    Like `get_ssm_parameter_names`, every name that begins with the preffix
+    matches, so `/app/prod` also gets `/app/prod` and `/app/prod-eu/db`.
+    Path preffixes (starting with `/`) are fetched in a single paginated pass
+    with `get_parameters_by_path`, plus the few names outside the path. Any
+    other preffix falls back to listing the matching names and fetching them
+    in batches of 10 with `get_parameters`. See `iter_ssm_parameters` for
+    `with_key_ids`.
+
+    If `cache_ttl` is given, parameters are served from the local snapshot
+    cache, which only re-fetches the values that changed since it was last
+    refreshed. The cache and the async backend only apply to the default
+    client.
+    """
+    logger.info("Getting SSM parameters with path preffix: {}", path_preffix)
+
+    if cache_ttl is not None and client is None:
+        from acat.ssm.cache import SnapshotCache
+
+        with SnapshotCache() as cache:
+            return cache.parameters(path_preffix, cache_ttl)
+
+    if _backend == "async" and client is None:
+        from acat.ssm import aio
+
+        return aio.run(aio.get_ssm_parameters(path_preffix, with_key_ids=with_key_ids))
+
+    pages = iter_ssm_parameters(path_preffix, client, with_key_ids)
+    return [parameter for page in pages for parameter in page]
+
+
+def get_ssm_parameter_store(
+    path_preffix: str,
+    cache_ttl: Optional[float] = None,
+    client: Optional[SSMClient] = None,
+    with_key_ids: bool = False,
+) -> ParameterStore:
+    """Get all SSM parameters under a path preffix in a `ParameterStore`.
+
+    Same as `get_ssm_parameters`, but pages are added to the store as they
+    are fetched, so a full list of parameter dicts is never held.
+    """
+    if (cache_ttl is not None or _backend == "async") and client is None:
+        return ParameterStore(
+            get_ssm_parameters(path_preffix, cache_ttl, with_key_ids=with_key_ids)
+        )
+
+    logger.info("Getting SSM parameters with path preffix: {}", path_preffix)
+    store = ParameterStore()
+
+    for page in iter_ssm_parameters(path_preffix, client, with_key_ids):
+        store.extend(page)
+
+    return store
+
+
+def plan_copy(
+    parameters: Iterable[Parameter],
+    existing: Mapping[str, Parameter],
+    overwrite: bool,
+) -> CopyPlan:
+    """Classify the parameters to copy against the ones already in place.
+
+    A parameter is unchanged when the existing one has the same value, type
+    and KMS key, so writing it again would only bump its version. Parameters
+    that differ are updated if `overwrite` is set and skipped otherwise.
+    """
+    plan: CopyPlan = {"Created": [], "Updated": [], "Unchanged": [], "Skipped": []}
+
+    for parameter in parameters:
+        current = existing.get(parameter["Name"])
+
+        if current is None:
+            plan["Created"].append(parameter)
+        elif (
+            current["Value"] == parameter["Value"]
+            and current["Type"] == parameter["Type"]
+            and current.get("KeyId") == parameter.get("KeyId")
+        ):
+            plan["Unchanged"].append(parameter)
+        elif overwrite:
+            plan["Updated"].append(parameter)
+        else:
+            plan["Skipped"].append(parameter)
+
+    if is_enabled("DEBUG"):
+        for parameter in plan["Skipped"]:
+            logger.debug("Parameter {} already exists, skipping", parameter["Name"])
+
+    return plan
+
+
+def summarize_copy(plan: CopyPlan, failures: Sequence[Failure]) -> CopySummary:
+    """Count the parameters of a copy plan, leaving out the failed writes."""
+    failed = {failure["Name"] for failure in failures}
+
+    return {
+        "Created": sum(param["Name"] not in failed for param in plan["Created"]),
+        "Updated": sum(param["Name"] not in failed for param in plan["Updated"]),
+        "Unchanged": len(plan["Unchanged"]),
+        "Skipped": len(plan["Skipped"]),
+        "Failed": len(failed),
+    }
+
+
+def write_ssm_parameters(
+    parameters: Iterable[Parameter],
+    overwrite: bool,
+    client: Optional[SSMClient] = None,
+    rate: float = DEFAULT_WRITE_RATE,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    executor: Optional[concurrent.futures.Executor] = None,
+) -> list[Failure]:
+    """Write SSM parameters through a `WriteScheduler` and return the failures.
+
+    The scheduler keeps writes under `rate` requests per second, backs off
+    when AWS throttles and retries the throttled writes. Each call has its
+    own scheduler, so writes to different clients are rate limited apart.
+    Writes run in `executor` if given, see `WriteScheduler.run`.
+    """
+    if _backend == "async" and client is None:
+        from acat.ssm import aio
+
+        return aio.run(
+            aio.create_ssm_parameters(
+                parameters, overwrite, rate=rate, max_concurrency=max_concurrency
+            )
+        )
+
+    client = client or get_ssm_client(
+        max_concurrency=max_concurrency, max_attempts=WRITE_MAX_ATTEMPTS
+    )
+    scheduler: WriteScheduler[Parameter] = WriteScheduler(
+        rate, max_concurrency, operation="PutParameter"
+    )
+
+    def create_parameter(parameter: Parameter):
+        client.put_parameter(Overwrite=overwrite, **parameter)
+
+    return scheduler.run(
+        parameters, create_parameter, key=lambda x: x["Name"], executor=executor
+    )
+
+
+def create_ssm_parameters(
+    parameters: Iterable[Parameter],
+    overwrite: bool,
+    rate: float = DEFAULT_WRITE_RATE,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+) -> list[Failure]:
+    """Create SSM parameters in parallel.
+
+    Parameters are written with `write_ssm_parameters`. Each write is echoed,
+    and the parameters that could not be written are echoed in a final
+    summary and returned.
+    """
+
+    def announce(parameters: Iterable[Parameter]) -> Iterator[Parameter]:
+        for parameter in parameters:
             click.echo(f"Creating parameter: {parameter['Name']}")
-            client.put_parameter(Overwrite=overwrite, **parameter)
-        except Exception as e:  # pragma: no cover
-            click.echo(f"Error creating parameter {parameter['Name']}: {e}")
-
-    with concurrent.futures.ThreadPoolExecutor() as executor:
-        futures = [
-            executor.submit(create_parameter, parameter, overwrite)
-            for parameter in parameters
-        ]
-        for future in concurrent.futures.as_completed(futures):
-            # Raise any exceptions that occurred during parameter creation
-            future.result()
+            yield parameter
+
+    failures = write_ssm_parameters(
+        announce(parameters), overwrite, rate=rate, max_concurrency=max_concurrency
+    )
+
+    for failure in failures:
+        click.echo(f"Error creating parameter {failure['Name']}: {failure['Error']}")
+
+    if failures:
+        click.echo(f"Failed to create {len(failures)} parameters")
+
+    return failures
+
+
+def delete_ssm_parameters(
+    names: Iterable[str],
+    rate: float = DEFAULT_WRITE_RATE,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    client: Optional[SSMClient] = None,
+    executor: Optional[concurrent.futures.Executor] = None,
+) -> DeleteResult:
+    """Delete SSM parameters in concurrent batches of 10.
+
+    Batches are sent with `delete_parameters` through a `WriteScheduler`, so
+    throttled batches are retried. The result tells apart the names that were
+    deleted, the ones AWS reported as invalid (e.g. already deleted) and the
+    ones whose batch failed.
+    """
+    client = client or get_ssm_client(
+        max_concurrency=max_concurrency, max_attempts=WRITE_MAX_ATTEMPTS
+    )
+    scheduler: WriteScheduler[list[str]] = WriteScheduler(
+        rate, max_concurrency, operation="DeleteParameters"
+    )
+    batches = {
+        batch[0]: batch for batch in chunked(sorted(names), DELETE_PARAMETERS_MAX_NAMES)
+    }
+    result: DeleteResult = {"Deleted": [], "Invalid": [], "Failed": []}
+    lock = threading.Lock()
+
+    def delete_batch(batch: list[str]):
+        response = client.delete_parameters(Names=batch)
+
+        with lock:
+            result["Deleted"].extend(response.get("DeletedParameters", []))
+            result["Invalid"].extend(response.get("InvalidParameters", []))
+
+    failures = scheduler.run(
+        batches.values(), delete_batch, key=lambda x: x[0], executor=executor
+    )
+    result["Failed"] = [
+        {"Name": name, "Error": failure["Error"]}
+        for failure in failures
+        for name in batches[failure["Name"]]
+    ]
+
+    result["Deleted"].sort()
+    result["Invalid"].sort()
+
+    return result
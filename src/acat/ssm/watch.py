@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING
+from typing import Callable
+from typing import Literal
+from typing import Optional
+from typing import TypedDict
+
+from acat.logger import logger
+from acat.ssm.client import get_ssm_client
+from acat.ssm.utils import iter_ssm_parameter_metadata
+from acat.ssm.utils import iter_ssm_parameters_by_name
+
+if TYPE_CHECKING:
+    from mypy_boto3_ssm import SSMClient
+
+DEFAULT_MIN_INTERVAL = 5.0  # Seconds between polls after a change
+DEFAULT_MAX_INTERVAL = 60.0  # Seconds between polls when nothing changes
+BACKOFF_FACTOR = 2.0
+
+EventType = Literal["added", "changed", "deleted"]
+
+
+class Snapshot(TypedDict):
+    Version: int
+    LastModifiedDate: Optional[str]
+    Type: Optional[str]
+
+
+class Event(TypedDict):
+    Event: EventType
+    Name: str
+    Version: Optional[int]
+    LastModifiedDate: Optional[str]
+    Type: Optional[str]
+    Value: Optional[str]
+
+
+class AdaptiveInterval:
+    """Poll interval that backs off while nothing changes.
+
+    It starts at `min_interval`, is multiplied by `factor` after every poll
+    without changes up to `max_interval`, and goes back to `min_interval` as
+    soon as something changes.
+    """
+
+    def __init__(
+        self,
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+        max_interval: float = DEFAULT_MAX_INTERVAL,
+        factor: float = BACKOFF_FACTOR,
+    ):
+        if not 0 < min_interval <= max_interval:
+            raise ValueError("Intervals must be positive and min <= max")
+
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.factor = factor
+        self.current = min_interval
+
+    def next(self, changed: bool) -> float:
+        if changed:
+            self.current = self.min_interval
+        else:
+            self.current = min(self.current * self.factor, self.max_interval)
+
+        return self.current
+
+
+def get_versions(
+    path_preffix: str, client: Optional[SSMClient] = None
+) -> dict[str, Snapshot]:
+    """List the version and type of every parameter under a preffix.
+
+    Only `describe_parameters` metadata is read, which returns up to 50
+    parameters per call and no values.
+    """
+    return {
+        param["Name"]: {
+            "Version": param.get("Version", 0),
+            "LastModifiedDate": param["LastModifiedDate"].isoformat()
+            if "LastModifiedDate" in param
+            else None,
+            "Type": param.get("Type"),
+        }
+        for page in iter_ssm_parameter_metadata(path_preffix, client)
+        for param in page
+        if "Name" in param
+    }
+
+
+def _event(
+    event_type: EventType, name: str, snapshot: Optional[Snapshot] = None
+) -> Event:
+    return {
+        "Event": event_type,
+        "Name": name,
+        "Version": snapshot["Version"] if snapshot else None,
+        "LastModifiedDate": snapshot["LastModifiedDate"] if snapshot else None,
+        "Type": snapshot["Type"] if snapshot else None,
+        "Value": None,
+    }
+
+
+def diff_versions(
+    previous: dict[str, Snapshot], current: dict[str, Snapshot]
+) -> list[Event]:
+    """Compare two listings and return the events, without values.
+
+    A parameter changed if its version or its last modified date did, e.g.
+    when it was deleted and created again between two polls.
+    """
+    events = [
+        _event("added" if name not in previous else "changed", name, snapshot)
+        for name, snapshot in current.items()
+        if name not in previous
+        or (previous[name]["Version"], previous[name]["LastModifiedDate"])
+        != (snapshot["Version"], snapshot["LastModifiedDate"])
+    ]
+    events += [_event("deleted", name) for name in previous.keys() - current.keys()]
+    return sorted(events, key=lambda x: x["Name"])
+
+
+def fill_values(
+    events: list[Event],
+    client: Optional[SSMClient] = None,
+    show_secure: bool = False,
+) -> None:
+    """Fetch the values of added and changed parameters in batches of 10.
+
+    SecureString values are left as None, and not even fetched, unless
+    `show_secure` is set.
+    """
+    by_name = {
+        e["Name"]: e
+        for e in events
+        if e["Event"] != "deleted" and (show_secure or e["Type"] != "SecureString")
+    }
+
+    for page in iter_ssm_parameters_by_name(by_name, client):
+        for parameter in page:
+            event = by_name[parameter["Name"]]
+            event["Type"] = parameter["Type"]
+
+            if show_secure or parameter["Type"] != "SecureString":
+                event["Value"] = parameter["Value"]
+
+
+def watch_ssm_parameters(
+    path_preffix: str,
+    emit: Callable[[Event], None],
+    interval: Optional[AdaptiveInterval] = None,
+    initial: bool = False,
+    polls: Optional[int] = None,
+    stop: Optional[threading.Event] = None,
+    client: Optional[SSMClient] = None,
+    show_secure: bool = False,
+) -> None:
+    """Poll the metadata of a preffix and emit an event per change.
+
+    The first poll is the baseline, and its parameters are only emitted as
+    `added` if `initial` is set. Values are only fetched for the parameters
+    that were added or changed, and SecureString values are hidden unless
+    `show_secure` is set. Stops after `polls` polls, or when `stop` is
+    set.
+    """
+    client = client or get_ssm_client()
+    interval = interval or AdaptiveInterval()
+    stop = stop or threading.Event()
+    previous: dict[str, Snapshot] = {}
+    count = 0
+
+    while True:
+        current = get_versions(path_preffix, client)
+        events = diff_versions(previous, current) if count or initial else []
+        count += 1
+        logger.debug(
+            "Poll {}: {} parameters, {} events", count, len(current), len(events)
+        )
+        fill_values(events, client, show_secure)
+
+        for event in events:
+            emit(event)
+
+        previous = current
+
+        if polls is not None and count >= polls:
+            return
+
+        if stop.wait(interval.next(bool(events))):
+            return
@@ -0,0 +1,220 @@
+"""API call statistics collected with botocore event hooks.
+
+Collection is disabled by default. Once `enable_stats` is called, every
+client created by the package is instrumented to count calls, retries,
+throttles and errors per operation, and to record a latency histogram.
+"""
+
+import bisect
+import json
+import threading
+import time
+from typing import Any
+from typing import Optional
+from typing import TypedDict
+
+from acat.ssm.throttling import THROTTLING_ERROR_CODES
+
+# Upper bounds of the latency histogram buckets, the last bucket is unbounded
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+_STARTED_AT = "acat_started_at"
+
+
+class OperationStats(TypedDict):
+    Calls: int
+    Retries: int
+    Throttles: int
+    Errors: int
+    LatencyMs: float
+    Histogram: list[int]
+
+
+def _new_operation() -> OperationStats:
+    return {
+        "Calls": 0,
+        "Retries": 0,
+        "Throttles": 0,
+        "Errors": 0,
+        "LatencyMs": 0.0,
+        "Histogram": [0] * (len(LATENCY_BUCKETS_MS) + 1),
+    }
+
+
+def percentile(histogram: list[int], q: float) -> Optional[int]:
+    """Estimate a latency percentile as the upper bound of its bucket.
+
+    Returns `None` if there are no calls, or if the percentile falls in the
+    unbounded last bucket.
+    """
+    total = sum(histogram)
+
+    if total == 0:
+        return None
+
+    rank, seen = q * total, 0
+
+    for bound, count in zip(LATENCY_BUCKETS_MS, histogram):
+        seen += count
+
+        if seen >= rank:
+            return bound
+
+    return None
+
+
+def _format_estimate(estimate: Optional[int], calls: int) -> str:
+    if calls == 0:
+        return "-"
+
+    return f">{LATENCY_BUCKETS_MS[-1]}" if estimate is None else f"<={estimate}"
+
+
+class Stats:
+    """Thread-safe per-operation counters fed by botocore events.
+
+    Calls and latencies are recorded around each API call, so the latency
+    includes the retries botocore made. Retries are taken from the response
+    metadata, and throttles are counted on every attempt, whether or not it
+    was retried. Writes are retried by `WriteScheduler` instead of botocore,
+    as new calls, which it counts with `record_retry`.
+    """
+
+    def __init__(self):
+        self._operations: dict[str, OperationStats] = {}
+        self._lock = threading.Lock()
+
+    def _operation(self, name: str) -> OperationStats:
+        if name not in self._operations:
+            self._operations[name] = _new_operation()
+
+        return self._operations[name]
+
+    def instrument(self, client: Any) -> None:
+        """Register the event hooks on a boto3 or aiobotocore client."""
+        events = client.meta.events
+        events.register("before-call", self._before_call)
+        events.register("after-call", self._after_call)
+        events.register("after-call-error", self._after_call_error)
+        events.register("needs-retry", self._needs_retry)
+
+    def _before_call(self, model, context, **_) -> None:
+        context[_STARTED_AT] = time.perf_counter()
+
+        with self._lock:
+            self._operation(model.name)["Calls"] += 1
+
+    def _record_latency(self, operation: OperationStats, context: dict) -> None:
+        latency = (time.perf_counter() - context.pop(_STARTED_AT)) * 1000
+        operation["LatencyMs"] += latency
+        operation["Histogram"][bisect.bisect_left(LATENCY_BUCKETS_MS, latency)] += 1
+
+    def _after_call(self, model, parsed, context, **_) -> None:
+        if _STARTED_AT not in context:
+            return
+
+        with self._lock:
+            operation = self._operation(model.name)
+            self._record_latency(operation, context)
+            metadata = parsed.get("ResponseMetadata", {})
+            operation["Retries"] += metadata.get("RetryAttempts", 0)
+
+            if "Error" in parsed:
+                operation["Errors"] += 1
+
+    def _after_call_error(self, model, context, **_) -> None:
+        if _STARTED_AT not in context:
+            return
+
+        with self._lock:
+            operation = self._operation(model.name)
+            self._record_latency(operation, context)
+            operation["Errors"] += 1
+
+    def _needs_retry(self, response, operation, **_) -> None:
+        if not response:
+            return
+
+        code = response[1].get("Error", {}).get("Code")
+
+        if code in THROTTLING_ERROR_CODES:
+            with self._lock:
+                self._operation(operation.name)["Throttles"] += 1
+
+    def record_retry(self, operation_name: str) -> None:
+        """Count a retry made outside botocore."""
+        with self._lock:
+            self._operation(operation_name)["Retries"] += 1
+
+    def report(self) -> dict[str, OperationStats]:
+        """Get a copy of the statistics of every operation called so far."""
+        with self._lock:
+            return {
+                name: {**operation, "Histogram": list(operation["Histogram"])}
+                for name, operation in sorted(self._operations.items())
+            }
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {"LatencyBucketsMs": LATENCY_BUCKETS_MS, "Operations": self.report()},
+            indent=2,
+        )
+
+    def format_table(self) -> str:
+        columns = ("Calls", "Retries", "Throttles", "Errors")
+        latencies = ("Avg ms", "p50 ms", "p99 ms")
+        report = self.report()
+        width = max([len("Operation"), *(len(name) for name in report)])
+        lines = [
+            f"{'Operation':<{width}}  "
+            + "  ".join(f"{column:>9}" for column in (*columns, *latencies))
+        ]
+
+        for name, operation in report.items():
+            histogram = operation["Histogram"]
+            timed_calls = sum(histogram)
+            cells = [str(operation[column]) for column in columns]  # type: ignore
+            cells.append(f"{operation['LatencyMs'] / max(timed_calls, 1):.1f}")
+            cells.extend(
+                _format_estimate(percentile(histogram, q), timed_calls)
+                for q in (0.5, 0.99)
+            )
+            lines.append(
+                f"{name:<{width}}  " + "  ".join(f"{cell:>9}" for cell in cells)
+            )
+
+        return "\n".join(lines)
+
+
+_stats: Optional[Stats] = None
+
+
+def enable_stats() -> Stats:
+    """Start instrumenting the clients created from now on.
+
+    Clients are cached, so this must be called before the first one is
+    created, e.g. when the CLI starts.
+    """
+    global _stats
+
+    if _stats is None:
+        _stats = Stats()
+
+    return _stats
+
+
+def disable_stats() -> None:
+    global _stats
+    _stats = None
+
+
+def instrument(client: Any) -> None:
+    """Instrument a new client if statistics are enabled."""
+    if _stats is not None:
+        _stats.instrument(client)
+
+
+def record_retry(operation_name: str) -> None:
+    """Count a retry made by acat itself if statistics are enabled."""
+    if _stats is not None:
+        _stats.record_retry(operation_name)
@@ -0,0 +1,213 @@
+"""Scale benchmarks for the SSM commands against moto.
+
+Benchmarks are skipped unless pytest runs with `--benchmark`. Every benchmark
+records its wall time, API calls per operation, peak traced memory and
+maximum thread count, and compares them with `baseline.json`. Use
+`--update-baseline` to store new results.
+
+Only API calls and thread counts fail a benchmark, since they are the same on
+every machine. API calls have no tolerance, so a change that makes more or
+fewer calls must commit the new baseline with it, and the suite passes at
+every commit. Wall time and memory depend on the machine and interpreter the
+baseline was recorded on, so their regressions are only reported as warnings.
+
+moto pages `describe_parameters` and `get_parameters_by_path` in quadratic
+time, so only 1k parameters are seeded by default. Larger trees are
+benchmarked with `--benchmark-sizes 1000,10000,50000`.
+"""
+
+import collections
+import json
+import threading
+import time
+import tracemalloc
+import warnings
+from pathlib import Path
+from typing import Callable
+from typing import Generator
+from typing import TypedDict
+
+import botocore.client
+import pytest
+from moto import mock_aws
+from moto.core import DEFAULT_ACCOUNT_ID
+from moto.ssm.models import ssm_backends
+
+from acat.ssm.client import clear_ssm_clients
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+DEPTHS = (1, 3, 6)
+ROOT = "/bench"
+
+# Allowed relative increase over the baseline before a metric is a regression
+TOLERANCES = {
+    "api_calls": 0.0,
+    "max_threads": 0.5,
+}
+
+# Machine dependent metrics, their regressions are warnings
+ADVISORY_TOLERANCES = {
+    "wall_time": 0.5,
+    "peak_memory": 0.25,
+}
+
+
+class Result(TypedDict):
+    wall_time: float
+    api_calls: int
+    calls_per_operation: dict[str, int]
+    peak_memory: int
+    max_threads: int
+
+
+def parameter_name(index: int, depth: int) -> str:
+    """Spread parameters over a tree with 10 branches per level."""
+    branches = "".join(f"/n{(index // 10**level) % 10}" for level in range(depth - 1))
+    return f"{ROOT}{branches}/param{index}"
+
+
+def pytest_generate_tests(metafunc: pytest.Metafunc):
+    if "size" in metafunc.fixturenames:
+        sizes = metafunc.config.getoption("benchmark_sizes").split(",")
+        metafunc.parametrize("size", [int(size) for size in sizes])
+
+    if "depth" in metafunc.fixturenames:
+        metafunc.parametrize("depth", DEPTHS)
+
+
+@pytest.fixture
+def seeded_ssm(size: int, depth: int) -> Generator[list[str], None, None]:
+    """Seed moto through its backend, which is much faster than the API."""
+    clear_ssm_clients()
+
+    with mock_aws():
+        backend = ssm_backends[DEFAULT_ACCOUNT_ID]["us-east-1"]
+        names = [parameter_name(i, depth) for i in range(size)]
+
+        for name in names:
+            backend.put_parameter(
+                name=name,
+                description="",
+                value=f"value-{name}",
+                parameter_type="String",
+                allowed_pattern="",
+                keyid="",
+                overwrite=False,
+                tags=[],
+                data_type="text",
+                tier=None,
+                policies=None,
+            )
+
+        yield names
+
+
+class _ThreadSampler(threading.Thread):
+    def __init__(self, interval: float = 0.005):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.max_threads = threading.active_count()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            # The sampler itself is not part of the measured threads
+            self.max_threads = max(self.max_threads, threading.active_count() - 1)
+
+    def stop(self) -> int:
+        self._stop_event.set()
+        self.join()
+        return self.max_threads
+
+
+@pytest.fixture
+def measure(monkeypatch) -> Callable[[Callable[[], object]], Result]:
+    """Run a function once and collect its metrics."""
+    calls: collections.Counter[str] = collections.Counter()
+    lock = threading.Lock()
+    make_api_call = botocore.client.BaseClient._make_api_call
+
+    def counting_make_api_call(self, operation_name, api_params):
+        with lock:
+            calls[operation_name] += 1
+
+        return make_api_call(self, operation_name, api_params)
+
+    monkeypatch.setattr(
+        botocore.client.BaseClient, "_make_api_call", counting_make_api_call
+    )
+
+    def run(func: Callable[[], object]) -> Result:
+        sampler = _ThreadSampler()
+        sampler.start()
+        tracemalloc.start()
+        start = time.perf_counter()
+
+        try:
+            func()
+        finally:
+            wall_time = time.perf_counter() - start
+            _, peak_memory = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            max_threads = sampler.stop()
+
+        return {
+            "wall_time": round(wall_time, 3),
+            "api_calls": sum(calls.values()),
+            "calls_per_operation": dict(sorted(calls.items())),
+            "peak_memory": peak_memory,
+            "max_threads": max_threads,
+        }
+
+    return run
+
+
+@pytest.fixture(scope="session")
+def baseline(request: pytest.FixtureRequest) -> Generator[dict, None, None]:
+    try:
+        stored: dict[str, Result] = json.loads(BASELINE_PATH.read_text())
+    except FileNotFoundError:
+        stored = {}
+
+    results: dict[str, Result] = {}
+    yield {"stored": stored, "results": results}
+
+    if request.config.getoption("update_baseline") and results:
+        stored.update(results)
+        BASELINE_PATH.write_text(json.dumps(stored, indent=2, sort_keys=True) + "\n")
+
+
+def find_regressions(
+    result: Result, expected: Result, tolerances: dict[str, float] = TOLERANCES
+) -> list[str]:
+    return [
+        f"{metric}: {result[metric]} > {expected[metric]} (+{tolerance:.0%})"  # type: ignore
+        for metric, tolerance in tolerances.items()
+        if result[metric] > expected[metric] * (1 + tolerance)  # type: ignore
+    ]
+
+
+@pytest.fixture
+def benchmark(
+    request: pytest.FixtureRequest, baseline: dict, measure
+) -> Callable[[Callable[[], object]], Result]:
+    """Measure a function and compare its metrics with the stored baseline."""
+    key = request.node.name
+
+    def run(func: Callable[[], object]) -> Result:
+        result = measure(func)
+        baseline["results"][key] = result
+        print(f"\n{key}: {json.dumps(result)}")
+
+        expected = baseline["stored"].get(key)
+
+        if expected and not request.config.getoption("update_baseline"):
+            if regressions := find_regressions(result, expected):
+                pytest.fail(f"{key} regressed: " + ", ".join(regressions))
+
+            if slower := find_regressions(result, expected, ADVISORY_TOLERANCES):
+                warnings.warn(f"{key} regressed: " + ", ".join(slower))
+
+        return result
+
+    return run
@@ -0,0 +1,48 @@
+import json
+from typing import Iterator
+
+import pytest
+
+from acat.ssm.records import ParameterStore
+from acat.ssm.records import PathIndex
+from acat.ssm.types import Parameter
+from tests.benchmarks.conftest import parameter_name
+
+pytestmark = pytest.mark.benchmark
+
+# Repeat the cheap operations so their wall time is measurable
+REPEAT = 20
+
+
+def iter_parameters(size: int, depth: int) -> Iterator[Parameter]:
+    # Fresh dicts and names, like the pages of an API response
+    for i in range(size):
+        yield {"Name": parameter_name(i, depth), "Value": f"value{i}", "Type": "String"}
+
+
+class TestRecords:
+    """Compare the compact records with the plain structures they replace.
+
+    These only run with `--benchmark` and print both results. They are not
+    stored in the baseline, the assertions are the claims made for them.
+    """
+
+    def test_parameter_store_memory(self, size, depth, measure):
+        store = measure(lambda: ParameterStore(iter_parameters(size, depth)))
+        dicts = measure(lambda: list(iter_parameters(size, depth)))
+        print(f"\nstore: {json.dumps(store)}\ndicts: {json.dumps(dicts)}")
+
+        assert store["peak_memory"] < dicts["peak_memory"]
+
+    def test_names_difference(self, size, depth, measure):
+        names = [parameter["Name"] for parameter in iter_parameters(size, depth)]
+        current = set(names[::2])
+        names_set = set(names)
+        index = PathIndex(names)
+
+        plain = measure(lambda: [names_set - current for _ in range(REPEAT)])
+        indexed = measure(lambda: [index - current for _ in range(REPEAT)])
+        print(f"\nset: {json.dumps(plain)}\nindex: {json.dumps(indexed)}")
+
+        # Why get_ssm_parameter_names returns a plain set
+        assert plain["wall_time"] < indexed["wall_time"]
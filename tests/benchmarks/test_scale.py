@@ -0,0 +1,57 @@
+import pytest
+
+from acat.ssm.core import copy
+from acat.ssm.core import delete_unused
+from acat.ssm.utils import get_ssm_parameter_names
+from acat.ssm.utils import get_ssm_parameters
+from tests.benchmarks.conftest import ROOT
+from tests.conftest import BaseTest
+
+pytestmark = pytest.mark.benchmark
+
+
+class TestScale(BaseTest):
+    def test_get_ssm_parameter_names(self, seeded_ssm, benchmark):
+        names: set[str] = set()
+        benchmark(lambda: names.update(get_ssm_parameter_names(ROOT)))
+
+        assert names == set(seeded_ssm)
+
+    def test_get_ssm_parameters(self, seeded_ssm, benchmark):
+        parameters = []
+        benchmark(lambda: parameters.extend(get_ssm_parameters(ROOT)))
+
+        assert len(parameters) == len(seeded_ssm)
+
+    def test_copy(self, seeded_ssm, benchmark):
+        args = [ROOT, "/copy", "--write-rate", "1000000"]
+
+        def run():
+            result = self.runner.invoke(copy, args, input="y\n")
+            assert result.exit_code == 0, result.output
+
+        result = benchmark(run)
+
+        assert result["calls_per_operation"]["PutParameter"] == len(seeded_ssm)
+
+    def test_delete_unused(self, seeded_ssm, benchmark, tmp_path):
+        # The template keeps every other parameter, so half of them are deleted
+        template = tmp_path / "template.yaml"
+        template.write_text(
+            "\n".join(
+                f"- '{{{{resolve:ssm:/${{AWS::StackName}}{name[len(ROOT) :]}}}}}'"
+                for name in seeded_ssm[::2]
+            )
+        )
+        args = [ROOT, "-t", str(template), "--no-template-cache"]
+
+        def run():
+            result = self.runner.invoke(delete_unused, args, input="y\n")
+            assert result.exit_code == 0, result.output
+
+        result = benchmark(run)
+
+        assert (
+            result["calls_per_operation"]["DeleteParameters"] == len(seeded_ssm) // 20
+        )
+        assert len(get_ssm_parameter_names(ROOT)) == -(-len(seeded_ssm) // 2)
@@ -0,0 +1,40 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytestmark = pytest.mark.benchmark
+
+RUNS = 5
+
+
+def run_cli(*args: str, **env: str) -> None:
+    code = "from acat.cli import cli; cli(prog_name='acat')"
+
+    for _ in range(RUNS):
+        subprocess.run(
+            [sys.executable, "-c", code, *args],
+            check=True,
+            capture_output=True,
+            env={**os.environ, **env},
+        )
+
+
+class TestStartup:
+    def test_help(self, benchmark):
+        benchmark(lambda: run_cli("--help"))
+
+    def test_ssm_help(self, benchmark):
+        benchmark(lambda: run_cli("ssm", "--help"))
+
+    @pytest.mark.parametrize(
+        "words", ["acat s", "acat ssm co"], ids=["commands", "subcommands"]
+    )
+    def test_completion(self, benchmark, words):
+        env = {
+            "_ACAT_COMPLETE": "bash_complete",
+            "COMP_WORDS": words,
+            "COMP_CWORD": str(len(words.split()) - 1),
+        }
+        benchmark(lambda: run_cli(**env))
@@ -1,5 +1,38 @@
+import pytest
 from click.testing import CliRunner
 
 
+def pytest_addoption(parser: pytest.Parser):
+    group = parser.getgroup("benchmark")
+    group.addoption(
+        "--benchmark",
+        action="store_true",
+        default=False,
+        help="Run the scale benchmarks in tests/benchmarks",
+    )
+    group.addoption(
+        "--benchmark-sizes",
+        default="1000",
+        help="Comma-separated number of parameters to seed, e.g. 1000,10000,50000",
+    )
+    group.addoption(
+        "--update-baseline",
+        action="store_true",
+        default=False,
+        help="Store the benchmark results as the new baseline",
+    )
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]):
+    if config.getoption("benchmark"):
+        return
+
+    skip = pytest.mark.skip(reason="Benchmarks only run with --benchmark")
+
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
 class BaseTest:
     runner = CliRunner()
@@ -1,13 +1,17 @@
 import tempfile
+import threading
 from textwrap import dedent
 from typing import Generator
 
 import boto3
+import botocore.client
 import pytest
 from click.testing import CliRunner
 from moto import mock_aws
 from mypy_boto3_ssm import SSMClient
 
+from acat.ssm.client import clear_ssm_clients
+
 PARAMETERS = {
     "/test1/source/param1": "value1",
     "/test1/source/param2": "value2",
@@ -18,6 +22,8 @@ PARAMETERS = {
 
 @pytest.fixture(autouse=True)
 def mock_ssm() -> Generator[SSMClient, None, None]:
+    clear_ssm_clients()
+
     with mock_aws():
         client: SSMClient = boto3.client("ssm")
 
@@ -32,6 +38,33 @@ def mock_ssm() -> Generator[SSMClient, None, None]:
         yield client
 
 
+@pytest.fixture
+def serial_moto(monkeypatch):
+    """Send one API call at a time to moto, which is not thread-safe.
+
+    The streaming copy lists the source while its writers put parameters, and
+    moto's `describe_parameters` iterates over every stored parameter, so it
+    can fail with "dictionary changed size during iteration".
+    """
+    lock = threading.Lock()
+    make_api_call = botocore.client.BaseClient._make_api_call
+
+    def serial_make_api_call(self, operation_name, api_params):
+        with lock:
+            return make_api_call(self, operation_name, api_params)
+
+    monkeypatch.setattr(
+        botocore.client.BaseClient, "_make_api_call", serial_make_api_call
+    )
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(monkeypatch, tmp_path) -> str:
+    path = str(tmp_path / "cache")
+    monkeypatch.setenv("ACAT_CACHE_DIR", path)
+    return path
+
+
 @pytest.fixture
 def template_file() -> Generator[str, None, None]:
     with tempfile.NamedTemporaryFile(suffix=".yaml", mode="w") as f:
@@ -0,0 +1,225 @@
+import asyncio
+from typing import Generator
+
+import boto3
+import pytest
+import requests
+from botocore.exceptions import ClientError
+from mypy_boto3_ssm import SSMClient
+
+from acat.ssm import utils
+from acat.ssm.types import Parameter
+
+aio = pytest.importorskip("acat.ssm.aio")
+pytest.importorskip("aiobotocore")
+server = pytest.importorskip("moto.server")
+
+
+@pytest.fixture(scope="module")
+def moto_server() -> Generator[str, None, None]:
+    moto = server.ThreadedMotoServer(ip_address="127.0.0.1", port=0)
+    moto.start()
+    host, port = moto.get_host_and_port()
+    yield f"http://{host}:{port}"
+    moto.stop()
+
+
+@pytest.fixture(autouse=True)
+def mock_ssm(moto_server: str, monkeypatch) -> Generator[SSMClient, None, None]:
+    """Seed moto's server mode instead of the in-process mock.
+
+    aiobotocore sends requests through aiohttp, which the in-process mock
+    cannot intercept.
+    """
+    monkeypatch.setenv("AWS_ENDPOINT_URL", moto_server)
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    requests.post(f"{moto_server}/moto-api/reset")
+    client: SSMClient = boto3.client("ssm", endpoint_url=moto_server)
+
+    for i in range(15):
+        client.put_parameter(Name=f"/aio/param{i:02d}", Value=f"v{i}", Type="String")
+
+    client.put_parameter(Name="plain-aio", Value="plain", Type="String")
+    yield client
+
+
+class TestGetSsmParameterNames:
+    def test_success(self):
+        names = aio.run(aio.get_ssm_parameter_names("/aio"))
+
+        assert names == {f"/aio/param{i:02d}" for i in range(15)}
+
+
+class TestGetSsmParameters:
+    def test_success(self):
+        params = aio.run(aio.get_ssm_parameters("/aio"))
+
+        assert sorted(param["Value"] for param in params) == sorted(
+            f"v{i}" for i in range(15)
+        )
+
+    def test_success_begins_with(self, mock_ssm):
+        mock_ssm.put_parameter(Name="/aio-x/param", Value="x", Type="String")
+
+        params = aio.run(aio.get_ssm_parameters("/aio"))
+
+        assert len(params) == 16
+        assert {"Name": "/aio-x/param", "Value": "x", "Type": "String"} in params
+
+    def test_success_without_leading_slash(self):
+        params = aio.run(aio.get_ssm_parameters("plain-"))
+
+        assert params == [{"Name": "plain-aio", "Value": "plain", "Type": "String"}]
+
+    def test_success_many_paths(self):
+        results = aio.run(aio.get_many_ssm_parameters(["/aio", "plain-", "/no_path"]))
+
+        assert len(results["/aio"]) == 15
+        assert len(results["plain-"]) == 1
+        assert results["/no_path"] == []
+
+
+class TestSecureStrings:
+    @pytest.mark.parametrize("path_preffix", ["/aio-secure/", "aio-secure-"])
+    def test_success(self, mock_ssm, path_preffix):
+        mock_ssm.put_parameter(
+            Name=f"{path_preffix}param", Value="s", Type="SecureString", KeyId="k"
+        )
+
+        params = aio.run(aio.get_ssm_parameters(path_preffix, with_key_ids=True))
+
+        assert params == [
+            {
+                "Name": f"{path_preffix}param",
+                "Value": "s",
+                "Type": "SecureString",
+                "KeyId": "k",
+            }
+        ]
+
+
+class TestCreateSsmParameters:
+    def test_success(self):
+        parameters = [
+            Parameter(Name=f"/aio/new{i}", Value="new", Type="String")
+            for i in range(12)
+        ]
+
+        failures = aio.run(aio.create_ssm_parameters(parameters, False, rate=1000))
+
+        assert failures == []
+        assert len(aio.run(aio.get_ssm_parameter_names("/aio/new"))) == 12
+
+    def test_fail_existing_parameter(self):
+        parameters = [Parameter(Name="/aio/param00", Value="new", Type="String")]
+
+        failures = aio.run(aio.create_ssm_parameters(parameters, False))
+
+        assert len(failures) == 1
+        assert failures[0]["Name"] == "/aio/param00"
+        assert "ParameterAlreadyExists" in failures[0]["Error"]
+
+    def test_success_retries_server_errors(self):
+        attempts = []
+
+        class Client:
+            async def put_parameter(self, **kwargs):
+                attempts.append(kwargs["Name"])
+
+                if len(attempts) == 1:
+                    raise ClientError(
+                        {
+                            "Error": {"Code": "InternalServerError"},
+                            "ResponseMetadata": {"HTTPStatusCode": 500},
+                        },
+                        "PutParameter",
+                    )
+
+        parameters = [Parameter(Name="/aio/new", Value="new", Type="String")]
+
+        failures = aio.run(aio.create_ssm_parameters(parameters, False, Client()))
+
+        assert failures == []
+        assert attempts == ["/aio/new", "/aio/new"]
+
+    def test_success_consumes_parameters_lazily(self):
+        consumed = []
+
+        class Client:
+            async def put_parameter(self, **_kwargs):
+                await asyncio.sleep(0)
+
+        def parameters():
+            for i in range(100):
+                consumed.append(i)
+                yield Parameter(Name=f"/aio/new{i}", Value="new", Type="String")
+
+        async def first_write(client):
+            generator = parameters()
+            task = asyncio.create_task(
+                aio.create_ssm_parameters(
+                    generator, False, client, rate=1000, max_concurrency=4
+                )
+            )
+            await asyncio.sleep(0)
+            count = len(consumed)
+            await task
+            return count
+
+        assert aio.run(first_write(Client())) <= 5
+        assert len(consumed) == 100
+
+    def test_success_throttles_reduce_concurrency(self, monkeypatch):
+        in_flight = []
+        attempts = []
+
+        class Client:
+            async def put_parameter(self, **kwargs):
+                in_flight.append(kwargs["Name"])
+                attempts.append((kwargs["Name"], len(in_flight)))
+                await asyncio.sleep(0)
+                in_flight.remove(kwargs["Name"])
+
+                if len(attempts) <= 8:
+                    raise ClientError(
+                        {"Error": {"Code": "ThrottlingException"}}, "PutParameter"
+                    )
+
+        monkeypatch.setattr(aio, "backoff", lambda _: 0)
+        parameters = [
+            Parameter(Name=f"/aio/new{i}", Value="new", Type="String")
+            for i in range(40)
+        ]
+
+        failures = aio.run(
+            aio.create_ssm_parameters(
+                parameters, False, Client(), rate=1000, max_concurrency=8
+            )
+        )
+
+        assert failures == []
+        # The throttled writes are retried, but new ones start at a lower limit
+        assert max(count for _, count in attempts[16:24]) < 8
+
+
+class TestAsyncBackend:
+    @pytest.fixture(autouse=True)
+    def async_backend(self):
+        utils.set_backend("async")
+        yield
+        utils.set_backend("thread")
+
+    def test_success_same_functions(self):
+        params = utils.get_ssm_parameters("/aio")
+        failures = utils.create_ssm_parameters(
+            [Parameter(Name="/aio/new", Value="new", Type="String")], False
+        )
+
+        assert len(params) == 15
+        assert failures == []
+        assert "/aio/new" in utils.get_ssm_parameter_names("/aio")
+
+    def test_fail_invalid_backend(self):
+        with pytest.raises(ValueError, match="Backend must be one of"):
+            utils.set_backend("invalid")
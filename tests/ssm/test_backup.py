@@ -0,0 +1,134 @@
+import gzip
+import io
+import json
+import os
+
+import pytest
+
+from acat.ssm.backup import export_ssm_parameters
+from acat.ssm.backup import import_ssm_parameters
+from acat.ssm.backup import iter_records
+from acat.ssm.backup import open_records
+from acat.ssm.types import Parameter
+from acat.ssm.utils import get_ssm_parameters
+
+
+class TestExportSsmParameters:
+    def test_success(self):
+        file = io.StringIO()
+        progress = []
+
+        count = export_ssm_parameters("/test3", file, progress=progress.append)
+
+        records = [json.loads(line) for line in file.getvalue().splitlines()]
+        assert count == 7
+        assert progress == [7]
+        assert records[0] == {
+            "Name": "/test3/source/param0",
+            "Value": "value0",
+            "Type": "String",
+        }
+
+    def test_success_without_leading_slash(self, mock_ssm):
+        mock_ssm.put_parameter(Name="plain-param", Value="plain", Type="String")
+        file = io.StringIO()
+
+        assert export_ssm_parameters("plain-", file) == 1
+        assert json.loads(file.getvalue())["Name"] == "plain-param"
+
+
+class TestIterRecords:
+    def test_success_key_id(self):
+        file = io.StringIO(
+            '{"Name": "/a", "Value": "b", "Type": "SecureString", "KeyId": "k"}\n'
+        )
+
+        assert list(iter_records(file)) == [
+            {"Name": "/a", "Value": "b", "Type": "SecureString", "KeyId": "k"}
+        ]
+
+    def test_success_skips_blank_lines(self):
+        file = io.StringIO('{"Name": "/a", "Value": "b", "Type": "String"}\n\n')
+
+        assert list(iter_records(file)) == [
+            {"Name": "/a", "Value": "b", "Type": "String"}
+        ]
+
+    def test_fail_invalid_json(self):
+        with pytest.raises(ValueError, match="Line 1 is not valid JSON"):
+            list(iter_records(io.StringIO("not json\n")))
+
+    def test_fail_missing_keys(self):
+        file = io.StringIO('{"Name": "/a", "Value": "b", "Type": "String"}\n{}\n')
+
+        with pytest.raises(ValueError, match="Line 2 must have the keys"):
+            list(iter_records(file))
+
+
+class TestImportSsmParameters:
+    def test_success(self):
+        parameters = [
+            Parameter(Name=f"/import/param{i}", Value="value", Type="String")
+            for i in range(12)
+        ]
+        progress = []
+
+        count, failures = import_ssm_parameters(
+            iter(parameters), False, rate=1000, progress=progress.append
+        )
+
+        assert count == 12
+        assert failures == []
+        assert progress == list(range(1, 13))
+        assert len(get_ssm_parameters("/import")) == 12
+
+    def test_fail_existing_parameters(self):
+        parameters = [
+            Parameter(Name="/test1/source/param1", Value="new", Type="String")
+        ]
+
+        count, failures = import_ssm_parameters(parameters, False, rate=1000)
+
+        assert count == 1
+        assert [failure["Name"] for failure in failures] == ["/test1/source/param1"]
+
+
+class TestOpenRecords:
+    @pytest.mark.parametrize("name", ["backup.jsonl", "backup.jsonl.gz"])
+    def test_success_round_trip(self, tmp_path, name):
+        path = str(tmp_path / name)
+
+        with open_records(path, "w") as file:
+            file.write("line\n")
+
+        with open_records(path, "r") as file:
+            assert file.read() == "line\n"
+
+    def test_success_gzip_by_suffix(self, tmp_path):
+        path = tmp_path / "backup.jsonl.gz"
+
+        with open_records(str(path), "w") as file:
+            file.write("line\n")
+
+        assert gzip.decompress(path.read_bytes()) == b"line\n"
+
+    def test_success_force_gzip(self, tmp_path):
+        path = tmp_path / "backup.jsonl"
+
+        with open_records(str(path), "w", compress=True) as file:
+            file.write("line\n")
+
+        assert gzip.decompress(path.read_bytes()) == b"line\n"
+
+    def test_success_private_file(self, tmp_path):
+        path = str(tmp_path / "export.jsonl")
+
+        with open_records(path, "w") as file:
+            file.write("{}\n")
+
+        assert os.stat(path).st_mode & 0o777 == 0o600
+
+    def test_fail_invalid_mode(self):
+        with pytest.raises(ValueError, match="Mode must be"):
+            with open_records("-", "a"):
+                pass  # pragma: no cover
@@ -0,0 +1,184 @@
+import sqlite3
+import time
+from pathlib import Path
+
+import pytest
+
+from acat.ssm.cache import CACHE_FILE
+from acat.ssm.cache import SnapshotCache
+from acat.ssm.cache import get_cache_dir
+from acat.ssm.utils import get_ssm_parameter_names
+from acat.ssm.utils import get_ssm_parameters
+
+
+@pytest.fixture
+def cache():
+    with SnapshotCache() as cache:
+        yield cache
+
+
+class TestGetCacheDir:
+    def test_success_from_environment(self, cache_dir: str):
+        assert get_cache_dir() == Path(cache_dir)
+
+    def test_success_default(self, monkeypatch):
+        monkeypatch.delenv("ACAT_CACHE_DIR")
+        monkeypatch.delenv("XDG_CACHE_HOME", raising=False)
+
+        assert get_cache_dir() == Path.home() / ".cache" / "acat"
+
+
+class TestSnapshotCache:
+    def test_success_scope(self, cache: SnapshotCache):
+        assert cache.scope == "123456789012/us-east-1"
+
+    def test_success_names(self, cache: SnapshotCache, path_preffix="/test1"):
+        assert cache.names(path_preffix, ttl=60) == {
+            "/test1/source/param1",
+            "/test1/source/param2",
+        }
+
+    def test_success_parameters(self, cache: SnapshotCache, path_preffix="/test1"):
+        params = cache.parameters(path_preffix, ttl=60)
+
+        assert sorted(params, key=lambda x: x["Name"]) == [
+            {"Name": "/test1/source/param1", "Value": "value1", "Type": "String"},
+            {"Name": "/test1/source/param2", "Value": "value2", "Type": "String"},
+        ]
+
+    def test_success_served_from_cache_while_fresh(
+        self, cache: SnapshotCache, mock_ssm, path_preffix="/test1"
+    ):
+        cache.parameters(path_preffix, ttl=60)
+        mock_ssm.put_parameter(
+            Name="/test1/source/param1", Value="new", Type="String", Overwrite=True
+        )
+
+        params = {p["Name"]: p["Value"] for p in cache.parameters(path_preffix, 60)}
+
+        assert params["/test1/source/param1"] == "value1"
+
+    def test_success_refreshes_changed_parameters(
+        self, cache: SnapshotCache, mock_ssm, path_preffix="/test1"
+    ):
+        cache.parameters(path_preffix, ttl=60)
+        mock_ssm.put_parameter(
+            Name="/test1/source/param1", Value="new", Type="String", Overwrite=True
+        )
+        mock_ssm.delete_parameter(Name="/test1/source/param2")
+        mock_ssm.put_parameter(Name="/test1/source/param3", Value="v", Type="String")
+
+        params = {p["Name"]: p["Value"] for p in cache.parameters(path_preffix, 0)}
+
+        assert params == {"/test1/source/param1": "new", "/test1/source/param3": "v"}
+
+    def test_success_refreshes_recreated_parameters(
+        self, cache: SnapshotCache, mock_ssm, path_preffix="/recreated"
+    ):
+        mock_ssm.put_parameter(Name="/recreated/param", Value="old", Type="String")
+        cache.parameters(path_preffix, ttl=60)
+        time.sleep(0.01)
+        mock_ssm.delete_parameter(Name="/recreated/param")
+        mock_ssm.put_parameter(Name="/recreated/param", Value="new", Type="String")
+
+        params = cache.parameters(path_preffix, ttl=0)
+
+        assert params == [
+            {"Name": "/recreated/param", "Value": "new", "Type": "String"}
+        ]
+
+    def test_success_only_changed_values_are_fetched(
+        self, cache: SnapshotCache, mock_ssm, monkeypatch, path_preffix="/test3"
+    ):
+        cache.parameters(path_preffix, ttl=60)
+        mock_ssm.put_parameter(
+            Name="/test3/source/param0", Value="new", Type="String", Overwrite=True
+        )
+        fetched: list[str] = []
+        get_parameters = mock_ssm.get_parameters
+
+        def spy(Names):  # noqa N803
+            fetched.extend(Names)
+            return get_parameters(Names=Names)
+
+        monkeypatch.setattr(mock_ssm, "get_parameters", spy)
+        monkeypatch.setattr("acat.ssm.cache.get_ssm_client", lambda: mock_ssm)
+
+        cache.parameters(path_preffix, ttl=0)
+
+        assert fetched == ["/test3/source/param0"]
+
+    def test_success_values_after_names_refresh(
+        self, cache: SnapshotCache, mock_ssm, path_preffix="/test3"
+    ):
+        cache.parameters(path_preffix, ttl=600)
+        mock_ssm.put_parameter(
+            Name="/test3/source/param1", Value="new", Type="String", Overwrite=True
+        )
+        cache.names(path_preffix, ttl=0)
+
+        parameters = cache.parameters(path_preffix, ttl=600)
+
+        assert len(parameters) == 7
+        assert parameters[1] == {
+            "Name": "/test3/source/param1",
+            "Value": "new",
+            "Type": "String",
+        }
+
+    def test_success_secure_strings_not_stored(
+        self, cache: SnapshotCache, mock_ssm, cache_dir: str
+    ):
+        mock_ssm.put_parameter(Name="/secure/param", Value="s", Type="SecureString")
+
+        params = cache.parameters("/secure", ttl=60)
+
+        assert params == [
+            {
+                "Name": "/secure/param",
+                "Value": "s",
+                "Type": "SecureString",
+                "KeyId": "alias/aws/ssm",
+            }
+        ]
+        with sqlite3.connect(Path(cache_dir) / CACHE_FILE) as connection:
+            rows = connection.execute("SELECT value, key_id FROM parameters")
+            assert rows.fetchall() == [(None, "alias/aws/ssm")]
+
+    def test_success_rebuilds_old_schema(self, cache_dir: str):
+        path = Path(cache_dir) / CACHE_FILE
+        path.parent.mkdir(parents=True)
+
+        with sqlite3.connect(path) as connection:
+            connection.execute("CREATE TABLE parameters (scope TEXT, name TEXT)")
+
+        with SnapshotCache() as cache:
+            assert len(cache.parameters("/test1", ttl=60)) == 2
+
+    def test_success_broader_snapshot_covers_preffix(self, cache: SnapshotCache):
+        cache.names("/", ttl=60)
+
+        assert cache.is_fresh("/test2", ttl=60, with_values=False)
+        assert not cache.is_fresh("/test2", ttl=60, with_values=True)
+
+    def test_success_invalidate(self, cache: SnapshotCache, path_preffix="/test1"):
+        cache.names("/", ttl=60)
+        cache.invalidate(path_preffix)
+
+        assert not cache.is_fresh(path_preffix, ttl=60, with_values=False)
+
+
+class TestCachedFetchFunctions:
+    def test_success_get_ssm_parameter_names(self, path_preffix="/test2"):
+        assert get_ssm_parameter_names(path_preffix, cache_ttl=60) == (
+            get_ssm_parameter_names(path_preffix)
+        )
+
+    @pytest.mark.parametrize("path_preffix", ["/test3", "/test"])
+    def test_success_get_ssm_parameters(self, path_preffix):
+        def key(param):
+            return param["Name"]
+
+        assert sorted(get_ssm_parameters(path_preffix, cache_ttl=60), key=key) == (
+            sorted(get_ssm_parameters(path_preffix), key=key)
+        )
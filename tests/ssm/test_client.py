@@ -0,0 +1,47 @@
+from acat.ssm.client import MAX_RETRY_ATTEMPTS
+from acat.ssm.client import WRITE_MAX_ATTEMPTS
+from acat.ssm.client import clear_ssm_clients
+from acat.ssm.client import get_ssm_client
+
+
+class TestGetSsmClient:
+    def test_success_same_client_is_reused(self):
+        assert get_ssm_client() is get_ssm_client()
+
+    def test_success_keyed_by_region_and_endpoint(self):
+        default = get_ssm_client()
+        other_region = get_ssm_client(region_name="eu-west-1")
+        other_endpoint = get_ssm_client(endpoint_url="http://localhost:5000")
+
+        assert other_region is not default
+        assert other_region.meta.region_name == "eu-west-1"
+        assert other_endpoint is not default
+        assert other_endpoint.meta.endpoint_url == "http://localhost:5000"
+
+    def test_success_pool_matches_concurrency(self):
+        client = get_ssm_client(max_concurrency=10)
+
+        assert client.meta.config.max_pool_connections == 10
+        assert client.meta.config.retries["mode"] == "standard"
+
+    def test_success_write_client_does_not_retry(self):
+        client = get_ssm_client()
+        write_client = get_ssm_client(max_attempts=WRITE_MAX_ATTEMPTS)
+
+        assert write_client is not client
+        assert client.meta.config.retries["total_max_attempts"] == MAX_RETRY_ATTEMPTS
+        assert write_client.meta.config.retries["total_max_attempts"] == 1
+
+    def test_success_pool_grows_with_concurrency(self):
+        small = get_ssm_client(max_concurrency=10)
+        large = get_ssm_client(max_concurrency=50)
+
+        assert large is not small
+        assert large.meta.config.max_pool_connections == 50
+        assert get_ssm_client(max_concurrency=10) is large
+
+    def test_success_clear_clients(self):
+        client = get_ssm_client()
+        clear_ssm_clients()
+
+        assert get_ssm_client() is not client
@@ -0,0 +1,151 @@
+import os
+import time
+
+import click
+import pytest
+
+from acat.ssm import completion
+from acat.ssm.completion import PrefixTrie
+from acat.ssm.completion import complete_parameter_path
+from acat.ssm.completion import get_index_path
+from acat.ssm.completion import refresh_index
+from acat.ssm.completion import run_refresh
+from acat.ssm.completion import schedule_refresh
+from acat.ssm.core import copy
+
+NAMES = ["/app/db/host", "/app/db/port", "/app/db", "/app/key", "/other", "plain"]
+
+
+@pytest.fixture
+def popen(mocker):
+    return mocker.patch.object(completion.subprocess, "Popen")
+
+
+class TestPrefixTrie:
+    @pytest.mark.parametrize(
+        ("incomplete", "expected"),
+        [
+            ("", ["/", "plain"]),
+            ("/", ["/app/", "/other"]),
+            ("/a", ["/app/"]),
+            ("/app/", ["/app/db", "/app/db/", "/app/key"]),
+            ("/app/db/p", ["/app/db/port"]),
+            ("/missing/", []),
+            ("pl", ["plain"]),
+        ],
+    )
+    def test_success_complete(self, incomplete, expected):
+        trie = PrefixTrie.from_names(NAMES)
+
+        assert trie.complete(incomplete) == expected
+
+    def test_success_complete_limit(self):
+        trie = PrefixTrie.from_names(f"/app/param{i}" for i in range(10))
+
+        assert len(trie.complete("/app/", limit=3)) == 3
+
+    def test_success_save_and_load(self, tmp_path):
+        path = tmp_path / "index.json"
+        PrefixTrie.from_names(NAMES).save(path)
+
+        assert PrefixTrie.load(path).complete("/app/db/") == [
+            "/app/db/host",
+            "/app/db/port",
+        ]
+
+
+class TestGetIndexPath:
+    def test_success_keyed_by_profile_and_region(self, monkeypatch, cache_dir):
+        monkeypatch.setenv("AWS_PROFILE", "prod")
+        monkeypatch.setenv("AWS_REGION", "eu-west-1")
+
+        assert str(get_index_path()) == os.path.join(
+            cache_dir, "completion", "prod", "eu-west-1.json"
+        )
+
+
+class TestRefreshIndex:
+    def test_success(self, mock_ssm):
+        mock_ssm.put_parameter(Name="plain-param", Value="plain", Type="String")
+
+        trie = refresh_index()
+
+        assert PrefixTrie.load(get_index_path()).root == trie.root
+        assert trie.complete("/test1/source/") == [
+            "/test1/source/param1",
+            "/test1/source/param2",
+        ]
+        assert trie.complete("plain") == ["plain-param"]
+
+
+class TestScheduleRefresh:
+    def test_success_missing_index(self, popen, tmp_path):
+        assert schedule_refresh(tmp_path / "index.json")
+        assert popen.call_args.args[0][1:] == ["-m", "acat.ssm.completion"]
+        assert (tmp_path / "index.refreshing").exists()
+
+    def test_success_fresh_index(self, popen, tmp_path):
+        path = tmp_path / "index.json"
+        PrefixTrie().save(path)
+
+        assert not schedule_refresh(path)
+        popen.assert_not_called()
+
+    def test_success_stale_index(self, popen, tmp_path):
+        path = tmp_path / "index.json"
+        PrefixTrie().save(path)
+        stale = time.time() - completion.COMPLETION_TTL - 1
+        os.utime(path, (stale, stale))
+
+        assert schedule_refresh(path)
+        popen.assert_called_once()
+
+    def test_success_refresh_already_running(self, popen, tmp_path):
+        path = tmp_path / "index.json"
+        schedule_refresh(path)
+
+        assert not schedule_refresh(path)
+        popen.assert_called_once()
+
+
+class TestRunRefresh:
+    @pytest.mark.usefixtures("mock_ssm", "popen")
+    def test_success(self, tmp_path):
+        path = tmp_path / "index.json"
+        schedule_refresh(path)
+
+        run_refresh(path)
+
+        assert path.exists()
+        assert not (tmp_path / "index.refreshing").exists()
+
+    def test_fail_keeps_marker(self, popen, mocker, tmp_path):
+        path = tmp_path / "index.json"
+        schedule_refresh(path)
+        mocker.patch.object(
+            completion, "refresh_index", side_effect=Exception("test error")
+        )
+
+        with pytest.raises(Exception, match="test error"):
+            run_refresh(path)
+
+        assert (tmp_path / "index.refreshing").exists()
+        assert not schedule_refresh(path)
+        popen.assert_called_once()
+
+
+class TestCompleteParameterPath:
+    def test_success(self, popen):
+        refresh_index()
+        ctx = click.Context(copy)
+
+        items = complete_parameter_path(ctx, copy.params[0], "/test")
+
+        assert [item.value for item in items] == ["/test1/", "/test2/", "/test3/"]
+        popen.assert_not_called()
+
+    def test_success_without_index(self, popen):
+        ctx = click.Context(copy)
+
+        assert complete_parameter_path(ctx, copy.params[0], "/test") == []
+        popen.assert_called_once()
@@ -1,5 +1,15 @@
+import json
+
+import pytest
+
+from acat.ssm.client import clear_ssm_clients
+from acat.ssm.client import get_ssm_client
+from acat.ssm.core import apply
 from acat.ssm.core import copy
 from acat.ssm.core import delete_unused
+from acat.ssm.core import diff_parameters
+from acat.ssm.core import export_parameters
+from acat.ssm.core import import_parameters
 from acat.ssm.utils import get_ssm_parameter_names
 from tests.conftest import BaseTest
 
@@ -14,6 +24,18 @@ class TestDeleteUnused(BaseTest):
 
         assert result.exit_code == 0
         assert params_after < params_before
+        assert "Deleted parameter: /test1/source/param2" in result.output
+        assert "Deleted all unused parameters" in result.output
+
+    def test_success_multiple_templates(self, template_file: str, tmp_path):
+        (tmp_path / "nested.json").write_text(
+            '{"Value": "{{resolve:ssm:/${AWS::StackName}/source/param2}}"}'
+        )
+        args = ["/test1", "-t", template_file, "-t", str(tmp_path)]
+        result = self.runner.invoke(delete_unused, args)
+
+        assert result.exit_code == 0
+        assert result.output == "No parameters to delete\n"
 
     def test_success_no_parameters_to_delete(self, template_file: str):
         result = self.runner.invoke(
@@ -50,7 +72,8 @@ class TestDeleteUnused(BaseTest):
 
         assert result.exit_code == 1
         assert (
-            str(result.exception) == "Template file must have .yaml or .yml extension"
+            str(result.exception)
+            == "Template file must have .yaml, .yml or .json extension"
         )
 
     def test_fail_template_file_no_parameters(self, template_file_invalid_content: str):
@@ -62,6 +85,110 @@ class TestDeleteUnused(BaseTest):
         assert result.output == "No parameters found in the template\n"
 
 
+class TestPlanApply(BaseTest):
+    def test_success_copy(self, mock_ssm, tmp_path):
+        plan_file = tmp_path / "plan.json"
+        args = ["/test1", "/test2", "--overwrite", "--plan-out", str(plan_file)]
+
+        result = self.runner.invoke(copy, args)
+
+        assert result.exit_code == 0
+        assert "\tcreate /test2/source/param1" in result.output
+        assert "\tupdate /test2/source/param2" in result.output
+        assert get_ssm_parameter_names("/test2") == {
+            "/test2/source/param2",
+            "/test2/source/param3",
+        }
+
+        result = self.runner.invoke(apply, [str(plan_file)])
+
+        assert result.exit_code == 0
+        assert result.output == "1 created, 1 updated, 0 deleted\n"
+        parameter = mock_ssm.get_parameter(Name="/test2/source/param2")["Parameter"]
+        assert parameter["Value"] == "value2"
+
+    def test_success_delete_unused(self, template_file, tmp_path):
+        plan_file = tmp_path / "plan.json"
+        args = ["/test1", "-t", template_file, "--plan-out", str(plan_file)]
+
+        result = self.runner.invoke(delete_unused, args)
+
+        assert result.exit_code == 0
+        assert json.loads(plan_file.read_text())["Operations"][0]["Action"] == "delete"
+
+        result = self.runner.invoke(apply, [str(plan_file)])
+
+        assert result.exit_code == 0
+        assert get_ssm_parameter_names("/test1") == {"/test1/source/param1"}
+
+    def test_success_empty_plan(self, tmp_path):
+        plan_file = tmp_path / "plan.json"
+        self.runner.invoke(copy, ["/no-path", "/test2", "--plan-out", str(plan_file)])
+
+        result = self.runner.invoke(apply, [str(plan_file)])
+
+        assert result.exit_code == 0
+        assert result.output == "No operations to apply\n"
+
+    def test_success_invalidates_cache(self, tmp_path):
+        plan_file = tmp_path / "plan.json"
+        get_ssm_parameter_names("/test2", cache_ttl=60)
+        args = ["/test1", "/test2", "--plan-out", str(plan_file)]
+        self.runner.invoke(copy, args)
+
+        result = self.runner.invoke(apply, [str(plan_file)])
+
+        assert result.exit_code == 0
+        assert "/test2/source/param1" in get_ssm_parameter_names("/test2", 60)
+
+    def test_fail_drift(self, mock_ssm, tmp_path):
+        plan_file = tmp_path / "plan.json"
+        args = ["/test1", "/test2", "--overwrite", "--plan-out", str(plan_file)]
+        self.runner.invoke(copy, args)
+        mock_ssm.put_parameter(
+            Name="/test2/source/param2", Value="x", Type="String", Overwrite=True
+        )
+
+        result = self.runner.invoke(apply, [str(plan_file)])
+
+        assert result.exit_code == 1
+        assert "1 parameters changed since the plan was made" in result.output
+        assert "/test2/source/param2: expected version 1, found 2" in result.output
+        assert "/test2/source/param1" not in get_ssm_parameter_names("/test2")
+
+    def test_fail_other_scope(self, tmp_path, monkeypatch):
+        plan_file = tmp_path / "plan.json"
+        args = ["/test1", "/test2", "--plan-out", str(plan_file)]
+        self.runner.invoke(copy, args)
+        monkeypatch.setenv("AWS_DEFAULT_REGION", "eu-west-1")
+        clear_ssm_clients()
+
+        result = self.runner.invoke(apply, [str(plan_file)])
+
+        assert result.exit_code == 1
+        assert "current account and region are 123456789012/eu-west-1" in (
+            result.stderr
+        )
+        assert get_ssm_parameter_names("/test2") == set()
+
+    def test_fail_invalid_plan(self, tmp_path):
+        plan_file = tmp_path / "plan.json"
+        plan_file.write_text("[]")
+
+        result = self.runner.invoke(apply, [str(plan_file)])
+
+        assert result.exit_code == 1
+        assert "Invalid plan" in result.stderr
+
+    def test_fail_plan_out_with_stream(self, tmp_path):
+        args = ["/test1", "/test2", "--stream", "--plan-out", str(tmp_path / "p")]
+
+        result = self.runner.invoke(copy, args)
+
+        assert result.exit_code == 2
+        assert "--plan-out cannot be used" in result.output
+
+
 class TestCopy(BaseTest):
     def test_success(self, source="/test1", destination="/test2"):
         params_before = get_ssm_parameter_names(destination)
@@ -69,9 +196,85 @@ class TestCopy(BaseTest):
         params_after = get_ssm_parameter_names(destination)
 
         assert result.exit_code == 0
-        assert "Creating parameter: " in result.output
+        assert "Created parameter: /test2/source/param1" in result.output
         assert params_after > params_before
 
+    def test_success_cache_ttl(self, source="/test1", destination="/test2"):
+        args = [source, destination, "--cache-ttl", "60"]
+        result = self.runner.invoke(copy, args, input="y\n")
+        params_after = get_ssm_parameter_names(destination, cache_ttl=60)
+
+        assert result.exit_code == 0
+        assert "/test2/source/param1" in params_after
+
+    def test_success_skips_unchanged_parameters(
+        self, source="/test1", destination="/copy"
+    ):
+        args = [source, destination, "--overwrite"]
+        self.runner.invoke(copy, args, input="y\n")
+        result = self.runner.invoke(copy, args, input="y\n")
+
+        assert result.exit_code == 0
+        assert "No parameters to copy" in result.output
+        assert "0 created, 0 updated, 2 unchanged, 0 skipped" in result.output
+
+    def test_success_updates_changed_parameters(
+        self, mock_ssm, source="/test1", destination="/copy"
+    ):
+        mock_ssm.put_parameter(Name="/copy/source/param1", Value="old", Type="String")
+        args = [source, destination, "--overwrite"]
+        result = self.runner.invoke(copy, args, input="y\n")
+
+        assert result.exit_code == 0
+        assert "2 parameters will be created/overwritten" in result.output
+        assert "1 created, 1 updated, 0 unchanged, 0 skipped" in result.output
+        assert "Updated parameter: /copy/source/param1" in result.output
+        assert "Created parameter: /copy/source/param2" in result.output
+        parameter = mock_ssm.get_parameter(Name="/copy/source/param1")["Parameter"]
+        assert parameter["Value"] == "value1"
+
+    def test_fail_write_not_reported_as_created(
+        self, monkeypatch, source="/test1", destination="/copy"
+    ):
+        def write_ssm_parameters(parameters, *args, **kwargs):
+            list(parameters)
+            return [{"Name": "/copy/source/param1", "Error": "test error"}]
+
+        monkeypatch.setattr("acat.ssm.store.write_ssm_parameters", write_ssm_parameters)
+        result = self.runner.invoke(copy, [source, destination], input="y\n")
+
+        assert result.exit_code == 1
+        assert "Created parameter: /copy/source/param1" not in result.output
+        assert "Created parameter: /copy/source/param2" in result.output
+        assert "Error creating parameter /copy/source/param1: test error" in (
+            result.output
+        )
+
+    @pytest.mark.usefixtures("serial_moto")
+    def test_success_stream(self, caplog, source="/test1", destination="/stream"):
+        args = [source, destination, "--stream"]
+        result = self.runner.invoke(copy, args, input="y\n")
+
+        assert result.exit_code == 0
+        assert "2 parameters will be streamed" in result.output
+        assert "2 created, 0 updated, 0 unchanged, 0 skipped" in result.output
+        # New parameters are expected to be missing from the destination
+        assert not [r for r in caplog.records if r.levelname == "WARNING"]
+        assert len(get_ssm_parameter_names(destination)) == 2
+
+    def test_success_stream_aborted(self, source="/test1", destination="/test2"):
+        args = [source, destination, "--stream"]
+        result = self.runner.invoke(copy, args, input="n\n")
+
+        assert result.exit_code == 1
+        assert "Aborted" in result.output
+
+    def test_success_stream_no_parameters_to_copy(self):
+        result = self.runner.invoke(copy, ["/no-path", "/test2", "--stream"])
+
+        assert result.exit_code == 0
+        assert "No parameters to copy" in result.output
+
     def test_success_no_parameters_to_copy(self):
         result = self.runner.invoke(copy, ["/no-path", "/test2"], input="y\n")
 
@@ -97,7 +300,7 @@ class TestCopy(BaseTest):
         )
 
         assert result.exit_code == 0
-        assert "Creating parameter:" in result.output
+        assert "Created parameter:" in result.output
 
     def test_fail_invalid_replace_format(self, source="/test1", destination="/test2"):
         result = self.runner.invoke(
@@ -106,3 +309,205 @@ class TestCopy(BaseTest):
 
         assert result.exit_code == 1
         assert "Invalid replace format" in result.output
+
+    def test_success_multiple_rules(self, mock_ssm, tmp_path):
+        rules_file = tmp_path / "rules"
+        rules_file.write_text("name s/param/key/\n")
+        args = ["/test1", "/rules", "-r", "s/value/v/", "-r", "s/v1/one/"]
+        args += ["--replace-name", "s/source/src/", "--rules-file", str(rules_file)]
+
+        result = self.runner.invoke(copy, args, input="y\n")
+
+        assert result.exit_code == 0
+        parameter = mock_ssm.get_parameter(Name="/rules/src/key1")["Parameter"]
+        assert parameter["Value"] == "one"
+
+    @pytest.mark.usefixtures("serial_moto")
+    def test_success_stream_multiple_rules(self, mock_ssm):
+        args = ["/test1", "/rules", "--stream", "-r", "s/VALUE/v/i"]
+        args += ["--replace-name", "s/param/key/"]
+
+        result = self.runner.invoke(copy, args, input="y\n")
+
+        assert result.exit_code == 0
+        parameter = mock_ssm.get_parameter(Name="/rules/source/key2")["Parameter"]
+        assert parameter["Value"] == "v2"
+
+    def test_success_secure_strings(self, mock_ssm):
+        mock_ssm.put_parameter(Name="/secure/param1", Value="s1", Type="SecureString")
+        mock_ssm.put_parameter(
+            Name="/secure/param2", Value="s2", Type="SecureString", KeyId="alias/o"
+        )
+        args = ["/secure", "/copy", "--kms-key-map", "alias/aws/ssm=alias/dest"]
+
+        result = self.runner.invoke(copy, args, input="y\n")
+
+        assert result.exit_code == 0
+        response = mock_ssm.get_parameters(
+            Names=["/copy/param1", "/copy/param2"], WithDecryption=True
+        )
+        assert sorted(p["Value"] for p in response["Parameters"]) == ["s1", "s2"]
+        metadata = mock_ssm.describe_parameters(
+            ParameterFilters=[
+                {"Key": "Name", "Option": "BeginsWith", "Values": ["/copy"]}
+            ]
+        )
+        assert {p["Name"]: p["KeyId"] for p in metadata["Parameters"]} == {
+            "/copy/param1": "alias/dest",
+            "/copy/param2": "alias/o",
+        }
+
+    @pytest.mark.usefixtures("serial_moto")
+    def test_success_stream_secure_strings(self, mock_ssm):
+        mock_ssm.put_parameter(Name="/secure/param", Value="s", Type="SecureString")
+
+        result = self.runner.invoke(copy, ["/secure", "/copy", "--stream"], input="y\n")
+
+        assert result.exit_code == 0
+        parameter = mock_ssm.get_parameter(Name="/copy/param", WithDecryption=True)
+        assert parameter["Parameter"]["Value"] == "s"
+
+    def test_fail_invalid_kms_key_map(self):
+        result = self.runner.invoke(copy, ["/test1", "/copy", "--kms-key-map", "x"])
+
+        assert result.exit_code == 1
+        assert "Invalid KMS key mapping" in result.output
+
+
+class TestCopyTargets(BaseTest):
+    def test_success(self, source="/test1", destination="/copy"):
+        args = [source, destination, "-T", "eu-west-1", "-T", "ap-south-1"]
+        result = self.runner.invoke(copy, args, input="y\n")
+
+        assert result.exit_code == 0
+        assert "4 parameters will be created/overwritten" in result.output
+        assert "\teu-west-1: 2" in result.output
+        lines = result.output.splitlines()
+        assert lines[-3].split() == [
+            "Target",
+            "Created",
+            "Updated",
+            "Unchanged",
+            "Skipped",
+            "Failed",
+        ]
+        assert lines[-2].split() == ["eu-west-1", "2", "0", "0", "0", "0"]
+        assert lines[-1].split() == ["ap-south-1", "2", "0", "0", "0", "0"]
+        client = get_ssm_client("eu-west-1")
+        assert len(get_ssm_parameter_names(destination, client=client)) == 2
+
+    def test_success_no_parameters_to_copy(self):
+        result = self.runner.invoke(copy, ["/no-path", "/copy", "-T", "eu-west-1"])
+
+        assert result.exit_code == 0
+        assert "No parameters to copy" in result.output
+
+    def test_success_aborted(self):
+        args = ["/test1", "/copy", "-T", "eu-west-1"]
+        result = self.runner.invoke(copy, args, input="n\n")
+
+        assert result.exit_code == 1
+        assert "Aborted" in result.output
+
+    def test_fail_invalid_target(self):
+        result = self.runner.invoke(copy, ["/test1", "/copy", "-T", "@eu-west-1"])
+
+        assert result.exit_code == 2
+        assert "[PROFILE@][REGION]" in result.output
+
+    def test_fail_stream_with_target(self):
+        args = ["/test1", "/copy", "-T", "eu-west-1", "--stream"]
+        result = self.runner.invoke(copy, args)
+
+        assert result.exit_code == 2
+        assert "--stream cannot be used with --target" in result.output
+
+
+class TestExportImport(BaseTest):
+    def test_success_round_trip(self, mock_ssm, tmp_path):
+        path = str(tmp_path / "backup.jsonl.gz")
+        export = self.runner.invoke(export_parameters, ["/test3", "-o", path])
+        mock_ssm.delete_parameters(Names=[f"/test3/source/param{i}" for i in range(7)])
+
+        result = self.runner.invoke(import_parameters, [path, "--write-rate", "1000"])
+
+        assert export.exit_code == 0
+        assert "Exported 7 parameters" in export.stderr
+        assert result.exit_code == 0
+        assert "Imported 7 parameters" in result.output
+        assert len(get_ssm_parameter_names("/test3")) == 7
+
+    def test_success_stdout_and_stdin(self):
+        export = self.runner.invoke(export_parameters, ["/test1"])
+        records = export.stdout.replace("/test1/", "/restored/")
+
+        result = self.runner.invoke(import_parameters, ["-"], input=records)
+
+        assert len(export.stdout.splitlines()) == 2
+        assert result.exit_code == 0
+        assert get_ssm_parameter_names("/restored") == {
+            "/restored/source/param1",
+            "/restored/source/param2",
+        }
+
+    def test_fail_existing_parameters(self):
+        export = self.runner.invoke(export_parameters, ["/test1"])
+
+        result = self.runner.invoke(import_parameters, ["-"], input=export.stdout)
+
+        assert result.exit_code == 1
+        assert "Error creating parameter /test1/source/param1" in result.output
+        assert "Failed to import 2 parameters" in result.output
+
+    def test_fail_invalid_file(self):
+        result = self.runner.invoke(import_parameters, ["-"], input="not json\n")
+
+        assert result.exit_code == 1
+        assert "Line 1 is not valid JSON" in result.stderr
+
+
+class TestDiff(BaseTest):
+    def test_success(self, mock_ssm):
+        mock_ssm.put_parameter(Name="/prod/source/param1", Value="new", Type="String")
+        mock_ssm.put_parameter(Name="/prod/source/key", Value="k", Type="SecureString")
+
+        result = self.runner.invoke(diff_parameters, ["/test1", "/prod"])
+
+        assert result.exit_code == 1
+        assert result.stdout.splitlines() == [
+            "+ /source/key (SecureString) <hidden>",
+            "~ /source/param1 (String) value1 -> (String) new",
+            "- /source/param2 (String) value2",
+        ]
+        assert "1 added, 1 removed, 1 changed" in result.stderr
+
+    def test_success_json(self):
+        args = ["/test1", "/test1/", "--json", "--new-target", "us-east-1"]
+
+        result = self.runner.invoke(diff_parameters, args)
+
+        assert result.exit_code == 0
+        assert result.stdout == ""
+        assert "0 added, 0 removed, 0 changed" in result.stderr
+
+    def test_success_json_entries(self, mock_ssm):
+        mock_ssm.put_parameter(Name="/prod/source/param1", Value="new", Type="String")
+        args = ["/test1/source", "/prod/source", "--json", "--hide-values", "all"]
+
+        result = self.runner.invoke(diff_parameters, args)
+
+        assert result.exit_code == 1
+        entries = [json.loads(line) for line in result.stdout.splitlines()]
+        assert [(e["Change"], e["Key"]) for e in entries] == [
+            ("changed", "/param1"),
+            ("removed", "/param2"),
+        ]
+        assert entries[0]["OldValue"] is None
+
+    def test_fail_invalid_target(self):
+        args = ["/test1", "/prod", "--old-target", "@"]
+
+        result = self.runner.invoke(diff_parameters, args)
+
+        assert result.exit_code == 2
+        assert "Target must be in the format" in result.output
@@ -0,0 +1,109 @@
+import boto3
+import pytest
+
+from acat.ssm.diff import compare_fingerprints
+from acat.ssm.diff import diff_ssm_parameters
+from acat.ssm.diff import fingerprint_parameters
+from acat.ssm.diff import get_key
+
+
+@pytest.fixture
+def prod(mock_ssm):
+    mock_ssm.put_parameter(Name="/prod/source/param1", Value="value1", Type="String")
+    mock_ssm.put_parameter(Name="/prod/source/param2", Value="other", Type="String")
+    mock_ssm.put_parameter(Name="/prod/source/extra", Value="x", Type="String")
+    return mock_ssm
+
+
+class TestGetKey:
+    @pytest.mark.parametrize(
+        "name, path_preffix, expected",
+        [
+            ("/staging/db/url", "/staging", "/db/url"),
+            ("/staging/db/url", "/staging/", "/db/url"),
+            ("app-db-url", "app-", "db-url"),
+            ("/other/db/url", "/staging", "/other/db/url"),
+        ],
+    )
+    def test_success(self, name, path_preffix, expected):
+        assert get_key(name, path_preffix) == expected
+
+
+class TestFingerprintParameters:
+    def test_success_hides_secure_strings(self, mock_ssm):
+        mock_ssm.put_parameter(Name="/secure/key", Value="secret", Type="SecureString")
+        mock_ssm.put_parameter(Name="/secure/plain", Value="plain", Type="String")
+
+        fingerprints = fingerprint_parameters("/secure")
+
+        assert fingerprints["/key"][0] == "SecureString"
+        assert fingerprints["/key"][2] is None
+        assert fingerprints["/plain"][2] == "plain"
+
+    def test_success_hides_all(self):
+        fingerprints = fingerprint_parameters("/test1", hide_values="all")
+
+        assert [value for _, _, value in fingerprints.values()] == [None, None]
+
+
+class TestCompareFingerprints:
+    def test_success(self):
+        old = {
+            "/a": ("String", b"1", "1"),
+            "/b": ("String", b"2", "2"),
+            "/c": ("String", b"3", "3"),
+        }
+        new = {
+            "/a": ("String", b"1", "1"),
+            "/b": ("StringList", b"2", "2"),
+            "/d": ("String", b"4", None),
+        }
+
+        entries = list(compare_fingerprints(old, new))
+
+        assert [(e["Change"], e["Key"]) for e in entries] == [
+            ("changed", "/b"),
+            ("removed", "/c"),
+            ("added", "/d"),
+        ]
+        assert entries[2]["NewValue"] is None
+
+
+class TestDiffSsmParameters:
+    @pytest.mark.usefixtures("prod")
+    def test_success(self):
+        entries = list(diff_ssm_parameters("/test1", "/prod"))
+
+        assert entries == [
+            {
+                "Change": "added",
+                "Key": "/source/extra",
+                "OldType": None,
+                "NewType": "String",
+                "OldValue": None,
+                "NewValue": "x",
+            },
+            {
+                "Change": "changed",
+                "Key": "/source/param2",
+                "OldType": "String",
+                "NewType": "String",
+                "OldValue": "value2",
+                "NewValue": "other",
+            },
+        ]
+
+    def test_success_across_regions(self):
+        client = boto3.client("ssm", region_name="eu-west-1")
+        client.put_parameter(Name="/test1/source/param1", Value="value1", Type="String")
+        target = {"Region": "eu-west-1", "Profile": None}
+
+        entries = list(diff_ssm_parameters("/test1", "/test1", new_target=target))
+
+        assert [(e["Change"], e["Key"]) for e in entries] == [
+            ("removed", "/source/param2")
+        ]
+
+    def test_fail_invalid_hide_values(self):
+        with pytest.raises(ValueError, match="Hide values must be one of"):
+            list(diff_ssm_parameters("/a", "/b", hide_values="some"))
@@ -0,0 +1,95 @@
+import boto3
+import pytest
+
+from acat.ssm.client import WRITE_MAX_ATTEMPTS
+from acat.ssm.client import format_target
+from acat.ssm.client import get_ssm_client
+from acat.ssm.client import parse_target
+from acat.ssm.fanout import copy_to_targets
+from acat.ssm.fanout import plan_targets
+from acat.ssm.types import Parameter
+from acat.ssm.utils import get_ssm_parameter_names
+
+PARAMETERS = [
+    Parameter(Name="/copy/param1", Value="value1", Type="String"),
+    Parameter(Name="/copy/param2", Value="value2", Type="String"),
+]
+TARGETS = [
+    {"Region": "eu-west-1", "Profile": None},
+    {"Region": "ap-south-1", "Profile": None},
+]
+
+
+class TestParseTarget:
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [
+            ("eu-west-1", {"Region": "eu-west-1", "Profile": None}),
+            ("prod@", {"Region": None, "Profile": "prod"}),
+            ("prod@eu-west-1", {"Region": "eu-west-1", "Profile": "prod"}),
+        ],
+    )
+    def test_success(self, value, expected):
+        assert parse_target(value) == expected
+        assert format_target(expected) == value
+
+    @pytest.mark.parametrize("value", ["", "@", "@eu-west-1"])
+    def test_fail_invalid_format(self, value):
+        with pytest.raises(ValueError, match=r"\[PROFILE@\]\[REGION\]"):
+            parse_target(value)
+
+    def test_success_format_default_target(self):
+        assert format_target({"Region": None, "Profile": None}) == "default"
+
+
+class TestPlanTargets:
+    def test_success_per_target_destination(self):
+        client = boto3.client("ssm", region_name="eu-west-1")
+        client.put_parameter(Name="/copy/param1", Value="value1", Type="String")
+
+        plans = plan_targets(PARAMETERS, "/copy", TARGETS, overwrite=False)
+
+        assert [plan["Target"] for plan in plans] == TARGETS
+        assert len(plans[0]["Plan"]["Created"]) == 1
+        assert len(plans[0]["Plan"]["Unchanged"]) == 1
+        assert len(plans[1]["Plan"]["Created"]) == 2
+
+
+class TestCopyToTargets:
+    def test_success(self):
+        plans = plan_targets(PARAMETERS, "/copy", TARGETS, overwrite=False)
+
+        results = copy_to_targets(plans, overwrite=False, rate=1000)
+
+        assert [result["Failures"] for result in results] == [[], []]
+        assert [result["Summary"]["Created"] for result in results] == [2, 2]
+
+        for target in TARGETS:
+            client = get_ssm_client(target["Region"])
+            assert get_ssm_parameter_names("/copy", client=client) == {
+                "/copy/param1",
+                "/copy/param2",
+            }
+
+        # The default region is left untouched
+        assert get_ssm_parameter_names("/copy") == set()
+
+    def test_fail_one_target(self, monkeypatch):
+        def put_parameter(**_):
+            raise Exception("AccessDeniedException")
+
+        monkeypatch.setattr(
+            get_ssm_client("ap-south-1", max_attempts=WRITE_MAX_ATTEMPTS),
+            "put_parameter",
+            put_parameter,
+        )
+        plans = plan_targets(PARAMETERS, "/copy", TARGETS, overwrite=False)
+
+        results = copy_to_targets(plans, overwrite=False, rate=1000)
+
+        assert results[0]["Failures"] == []
+        assert sorted(f["Name"] for f in results[1]["Failures"]) == [
+            "/copy/param1",
+            "/copy/param2",
+        ]
+        assert results[1]["Summary"]["Failed"] == 2
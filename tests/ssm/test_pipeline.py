@@ -0,0 +1,155 @@
+import threading
+import time
+
+import pytest
+
+from acat.ssm.pipeline import Pipeline
+from acat.ssm.pipeline import stream_copy_ssm_parameters
+from acat.ssm.utils import get_ssm_parameters
+
+
+def identity(parameter):
+    return parameter
+
+
+class TestPipeline:
+    def test_success(self):
+        pipeline = Pipeline([(lambda x: [x, x * 10], 3), (lambda x: [x + 1], 2)])
+
+        results = list(pipeline.run(range(20)))
+
+        assert sorted(results) == sorted(
+            [x + 1 for i in range(20) for x in (i, i * 10)]
+        )
+
+    def test_success_without_stages(self):
+        assert list(Pipeline([]).run(range(5))) == list(range(5))
+
+    def test_success_stages_overlap(self):
+        started = threading.Event()
+
+        def source():
+            yield 1
+            # The second item is only produced once the first one was processed
+            assert started.wait(timeout=5)
+            yield 2
+
+        def stage(item):
+            started.set()
+            return [item]
+
+        assert sorted(Pipeline([(stage, 1)]).run(source())) == [1, 2]
+
+    def test_success_bounded_queues(self):
+        produced = []
+
+        def source():
+            for i in range(100):
+                produced.append(i)
+                yield i
+
+        results = Pipeline([(lambda x: [x], 1)], maxsize=2).run(source())
+        next(results)
+        time.sleep(0.1)
+
+        # source, stage and consumer queues can only hold a handful of items
+        assert len(produced) < 10
+        results.close()
+
+    def test_fail_stage_error(self):
+        def stage(item):
+            if item == 5:
+                raise ValueError("test error")
+            return [item]
+
+        with pytest.raises(ValueError, match="test error"):
+            list(Pipeline([(stage, 2)]).run(range(50)))
+
+    def test_success_source_stops_after_early_exit(self):
+        produced = []
+
+        def source():
+            for i in range(300):
+                produced.append(i)
+                yield i
+
+        results = Pipeline([(lambda x: [x], 2)], maxsize=2).run(source())
+
+        for item in results:
+            if item == 3:
+                break
+
+        results.close()
+
+        # Only the items already queued when the pipeline stopped are produced
+        assert len(produced) < 20
+
+    def test_fail_source_stops_after_stage_error(self):
+        produced = []
+
+        def source():
+            for i in range(300):
+                produced.append(i)
+                yield i
+
+        def stage(item):
+            if item == 3:
+                raise ValueError("test error")
+            return [item]
+
+        with pytest.raises(ValueError, match="test error"):
+            list(Pipeline([(stage, 2)], maxsize=2).run(source()))
+
+        assert len(produced) < 20
+
+    def test_fail_source_error(self):
+        def source():
+            yield 1
+            raise ValueError("test error")
+
+        with pytest.raises(ValueError, match="test error"):
+            list(Pipeline([(lambda x: [x], 2)]).run(source()))
+
+
+@pytest.mark.usefixtures("serial_moto")
+class TestStreamCopySsmParameters:
+    def test_success(self, source="/test3", destination="/stream"):
+        def transform(parameter):
+            return {**parameter, "Name": parameter["Name"].replace(source, destination)}
+
+        summary, failures = stream_copy_ssm_parameters(source, transform, False)
+
+        assert failures == []
+        assert summary["Created"] == 7
+        assert len(get_ssm_parameters(destination)) == 7
+
+    def test_success_unchanged_parameters_are_not_written(self, source="/test3"):
+        summary, failures = stream_copy_ssm_parameters(source, identity, True)
+
+        assert failures == []
+        assert summary["Created"] == summary["Updated"] == 0
+        assert summary["Unchanged"] == 7
+
+    def test_success_unchanged_secure_strings(self, mock_ssm):
+        mock_ssm.put_parameter(Name="/secure/param1", Value="s1", Type="SecureString")
+        mock_ssm.put_parameter(
+            Name="/secure/param2", Value="s2", Type="SecureString", KeyId="alias/k"
+        )
+
+        summary, failures = stream_copy_ssm_parameters("/secure", identity, True)
+
+        assert failures == []
+        assert summary["Unchanged"] == 2
+
+    def test_success_without_leading_slash(self, mock_ssm):
+        mock_ssm.put_parameter(Name="plain-param", Value="plain", Type="String")
+
+        def transform(parameter):
+            return {**parameter, "Name": "plain-copy"}
+
+        summary, _ = stream_copy_ssm_parameters("plain", transform, False)
+
+        assert summary["Created"] == 1
+        assert mock_ssm.get_parameter(Name="plain-copy")["Parameter"]["Value"] == (
+            "plain"
+        )
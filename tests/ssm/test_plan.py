@@ -0,0 +1,153 @@
+import os
+from typing import Sequence
+
+import pytest
+
+from acat.ssm.client import get_scope
+from acat.ssm.plan import PLAN_FORMAT_VERSION
+from acat.ssm.plan import apply_plan
+from acat.ssm.plan import check_drift
+from acat.ssm.plan import copy_operations
+from acat.ssm.plan import delete_operations
+from acat.ssm.plan import get_parameter_versions
+from acat.ssm.plan import read_plan
+from acat.ssm.plan import write_plan
+from acat.ssm.utils import CopyPlan
+from acat.ssm.utils import get_ssm_parameter_names
+
+
+def make_plan(created: Sequence[str] = (), updated: Sequence[str] = ()) -> CopyPlan:
+    return {
+        "Created": [{"Name": n, "Value": "1", "Type": "String"} for n in created],
+        "Updated": [{"Name": n, "Value": "2", "Type": "String"} for n in updated],
+        "Unchanged": [],
+        "Skipped": [],
+    }
+
+
+class TestGetParameterVersions:
+    def test_success(self, mock_ssm):
+        mock_ssm.put_parameter(
+            Name="/test1/source/param1", Value="new", Type="String", Overwrite=True
+        )
+        names = [f"/test3/source/param{i}" for i in range(7)]
+        names += ["/test1/source/param1", "/missing"]
+
+        versions = get_parameter_versions(names)
+
+        assert len(versions) == 8
+        assert versions["/test1/source/param1"] == 2
+        assert versions["/test3/source/param0"] == 1
+
+
+class TestOperations:
+    def test_success_copy_operations(self):
+        operations = copy_operations(make_plan(["/b"], ["/test1/source/param1"]))
+
+        assert [(o["Action"], o["ExpectedVersion"]) for o in operations] == [
+            ("create", None),
+            ("update", 1),
+        ]
+
+    def test_success_delete_operations_skip_missing(self):
+        operations = delete_operations(["/test1/source/param2", "/missing"])
+
+        assert operations == [
+            {
+                "Action": "delete",
+                "Name": "/test1/source/param2",
+                "ExpectedVersion": 1,
+                "Parameter": None,
+            }
+        ]
+
+
+class TestReadPlan:
+    def test_success_roundtrip(self, tmp_path):
+        path = tmp_path / "plan.json"
+        operations = delete_operations(["/test1/source/param2"])
+
+        write_plan(path, "/test1", operations)
+
+        assert read_plan(path) == {
+            "FormatVersion": PLAN_FORMAT_VERSION,
+            "Scope": get_scope(),
+            "Path": "/test1",
+            "Operations": operations,
+        }
+        assert os.stat(path).st_mode & 0o777 == 0o600
+
+    @pytest.mark.parametrize(
+        "content, error",
+        [
+            ("{", "not valid JSON"),
+            ('{"FormatVersion": 1}', "format version"),
+            ('{"FormatVersion": 2, "Path": "/", "Operations": []}', "Scope"),
+            ('{"FormatVersion": 2, "Scope": "a/r", "Path": "/"}', "list of Operations"),
+            (
+                '{"FormatVersion": 2, "Scope": "a/r", "Path": "/", "Operations": [1]}',
+                "Action",
+            ),
+            (
+                '{"FormatVersion": 2, "Scope": "a/r", "Path": "/", "Operations": '
+                '[{"Action": "delete", "Name": "/a", "ExpectedVersion": "1"}]}',
+                "ExpectedVersion",
+            ),
+            (
+                '{"FormatVersion": 2, "Scope": "a/r", "Path": "/", "Operations": '
+                '[{"Action": "create", "Name": "/a", "ExpectedVersion": null}]}',
+                "Parameter",
+            ),
+        ],
+    )
+    def test_fail_invalid(self, tmp_path, content, error):
+        path = tmp_path / "plan.json"
+        path.write_text(content)
+
+        with pytest.raises(ValueError, match=error):
+            read_plan(path)
+
+
+class TestApplyPlan:
+    def test_success(self, mock_ssm):
+        operations = copy_operations(make_plan(["/new"], ["/test1/source/param1"]))
+        operations += delete_operations(["/test1/source/param2"])
+
+        assert check_drift(operations) == []
+
+        result = apply_plan(operations)
+
+        assert result == {"Created": 1, "Updated": 1, "Deleted": 1, "Failed": []}
+        assert get_ssm_parameter_names("/test1") == {"/test1/source/param1"}
+        parameter = mock_ssm.get_parameter(Name="/test1/source/param1")["Parameter"]
+        assert parameter["Value"] == "2"
+
+    def test_success_check_drift(self, mock_ssm):
+        operations = delete_operations(["/test1/source/param1"])
+        operations += copy_operations(make_plan(["/new"]))
+        mock_ssm.put_parameter(
+            Name="/test1/source/param1", Value="x", Type="String", Overwrite=True
+        )
+        mock_ssm.put_parameter(Name="/new", Value="x", Type="String")
+
+        drift = check_drift(operations)
+
+        assert drift == [
+            {
+                "Name": "/test1/source/param1",
+                "ExpectedVersion": 1,
+                "CurrentVersion": 2,
+            },
+            {"Name": "/new", "ExpectedVersion": None, "CurrentVersion": 1},
+        ]
+
+    def test_fail_created_meanwhile(self, mock_ssm, tmp_path):
+        path = tmp_path / "plan.json"
+        operations = copy_operations(make_plan(["/new"]))
+        write_plan(path, "/", operations)
+        mock_ssm.put_parameter(Name="/new", Value="x", Type="String")
+
+        result = apply_plan(read_plan(path)["Operations"])
+
+        assert result["Created"] == 0
+        assert [failure["Name"] for failure in result["Failed"]] == ["/new"]
@@ -0,0 +1,114 @@
+import tracemalloc
+
+import pytest
+
+from acat.ssm.records import ParameterStore
+from acat.ssm.records import PathIndex
+from acat.ssm.types import Parameter
+
+
+def make_parameters(count: int) -> list[Parameter]:
+    return [
+        {
+            "Name": f"/app/env{i % 3}/service{i // 30}/setting{i % 10}",
+            "Value": f"value{i}",
+            "Type": "SecureString" if i % 2 else "String",
+        }
+        for i in range(count)
+    ]
+
+
+class TestPathIndex:
+    def test_success(self):
+        names = ["/a/b/c", "/a/b/d", "/a/e", "plain", "/a/b/c"]
+
+        index = PathIndex(names)
+
+        assert list(index) == ["/a/b/c", "/a/b/d", "/a/e", "plain"]
+        assert len(index) == 4
+        assert "/a/b/d" in index
+        assert "/a/b" not in index
+        assert "/x/c" not in index
+        assert 1 not in index
+
+    def test_success_rows(self):
+        index = PathIndex(["/a/b", "/a/c"])
+
+        assert index.add("/a/c") == 1
+        assert index.add("/d") == 2
+        assert index.row("/a/b") == 0
+        assert index.row("/a/x") is None
+
+    def test_success_set_operations(self):
+        index = PathIndex(["/a/b", "/a/c", "/d"])
+
+        assert index - {"/a/c"} == {"/a/b", "/d"}
+        assert isinstance(index - {"/a/c"}, PathIndex)
+        assert index == {"/a/b", "/a/c", "/d"}
+        assert index > PathIndex(["/d"])
+
+    def test_success_interns_leaves(self):
+        index = PathIndex([f"/env{i}/password" for i in range(3)])
+
+        leaves = {id(leaf) for leaf in index._leaves}
+
+        assert len(leaves) == 1
+
+
+class TestParameterStore:
+    def test_success(self):
+        parameters = make_parameters(100)
+
+        store = ParameterStore(parameters)
+
+        assert len(store) == 100
+        assert list(store.parameters()) == parameters
+        assert list(store) == [parameter["Name"] for parameter in parameters]
+        assert store[parameters[5]["Name"]] == parameters[5]
+        assert store.get("/missing") is None
+        assert parameters[7]["Name"] in store
+
+    def test_success_replaces_existing(self):
+        store = ParameterStore([{"Name": "/a", "Value": "1", "Type": "String"}])
+
+        store.add({"Name": "/a", "Value": "2", "Type": "StringList"})
+
+        assert len(store) == 1
+        assert store["/a"] == {"Name": "/a", "Value": "2", "Type": "StringList"}
+
+    def test_success_key_ids(self):
+        store = ParameterStore(
+            [
+                {"Name": "/a", "Value": "1", "Type": "SecureString", "KeyId": "k"},
+                {"Name": "/b", "Value": "2", "Type": "String"},
+            ]
+        )
+
+        assert store["/a"]["KeyId"] == "k"
+        assert "KeyId" not in store["/b"]
+
+        store.add({"Name": "/a", "Value": "3", "Type": "String"})
+
+        assert "KeyId" not in store["/a"]
+
+    def test_fail_missing(self):
+        with pytest.raises(KeyError):
+            ParameterStore()["/missing"]
+
+    def test_success_smaller_than_dicts(self):
+        parameters = make_parameters(10_000)
+        names = [parameter["Name"] for parameter in parameters]
+
+        tracemalloc.start()
+        dicts = [dict(parameter) for parameter in parameters]
+        dicts_size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del dicts
+
+        tracemalloc.start()
+        store = ParameterStore(parameters)
+        store_size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        assert store_size < dicts_size
+        assert list(store) == names
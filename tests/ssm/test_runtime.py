@@ -0,0 +1,173 @@
+import threading
+
+import pytest
+
+from acat.ssm import ParameterCache
+from acat.ssm import SSMStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CountingStore(SSMStore):
+    """Store that counts the names fetched by name."""
+
+    def __init__(self):
+        super().__init__()
+        self.fetched: list[str] = []
+
+    def get_many(self, names):
+        names = list(names)
+        self.fetched.extend(names)
+        return super().get_many(names)
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def store():
+    with CountingStore() as store:
+        yield store
+
+
+@pytest.fixture
+def cache(store, clock):
+    with ParameterCache(store, ttl=10, stale_ttl=20, clock=clock) as cache:
+        yield cache
+
+
+class TestParameterCache:
+    def test_success_preload(self, cache: ParameterCache, store: CountingStore):
+        assert cache.preload("/test3") == 7
+
+        parameter = cache.get("/test3/source/param1")
+
+        assert parameter == {
+            "Name": "/test3/source/param1",
+            "Value": "value1",
+            "Type": "String",
+        }
+        assert store.fetched == []
+        assert cache.stats()["Hits"] == 1
+
+    def test_success_read_through(self, cache: ParameterCache, store: CountingStore):
+        names = ["/test1/source/param1", "/test2/source/param2", "/missing"]
+
+        first = cache.get_many(names)
+        second = cache.get_many(names)
+
+        assert first == second
+        assert sorted(first) == names[:2]
+        assert store.fetched == names
+        assert cache.get("/missing") is None
+        assert cache.stats() == {
+            "Hits": 4,
+            "StaleHits": 0,
+            "Misses": 3,
+            "Refreshes": 0,
+            "Evictions": 0,
+        }
+
+    def test_success_stale_while_revalidate(
+        self, cache: ParameterCache, mock_ssm, clock
+    ):
+        cache.preload("/test1")
+        mock_ssm.put_parameter(
+            Name="/test1/source/param1", Value="new", Type="String", Overwrite=True
+        )
+        clock.now = 15
+
+        stale = cache.get("/test1/source/param1")
+        cache.close()  # Waits for the background refresh
+
+        assert stale["Value"] == "value1"
+        assert cache.get("/test1/source/param1")["Value"] == "new"
+        assert cache.stats()["StaleHits"] == 1
+        assert cache.stats()["Refreshes"] == 1
+
+    def test_success_expired(self, cache: ParameterCache, store: CountingStore, clock):
+        cache.preload("/test1")
+        clock.now = 30
+
+        assert cache.get("/test1/source/param1")["Value"] == "value1"
+        assert store.fetched == ["/test1/source/param1"]
+        assert cache.stats()["Misses"] == 1
+
+    def test_success_preload_ttl(self, cache: ParameterCache, clock):
+        cache.preload("/test1", ttl=100)
+        clock.now = 50
+
+        cache.get("/test1/source/param1")
+
+        assert cache.stats()["Hits"] == 1
+
+    def test_success_lru_eviction(self, store: CountingStore, clock):
+        with ParameterCache(store, max_entries=3, clock=clock) as cache:
+            cache.preload("/test1")
+            cache.get("/test1/source/param1")
+            cache.preload("/test2")
+
+            assert len(cache) == 3
+            assert cache.stats()["Evictions"] == 1
+            cache.get("/test1/source/param1")
+            assert store.fetched == []
+
+    def test_success_invalidate(self, cache: ParameterCache):
+        cache.preload("/")
+        cache.invalidate("/test3")
+
+        assert len(cache) == 4
+
+    def test_success_refreshes_once_while_in_flight(self, store: CountingStore, clock):
+        started, release = threading.Event(), threading.Event()
+        get_many = store.get_many
+
+        def blocking_get_many(names):
+            started.set()
+            release.wait()
+            return get_many(names)
+
+        store.get_many = blocking_get_many  # type: ignore[method-assign]
+
+        with ParameterCache(store, ttl=10, stale_ttl=20, clock=clock) as cache:
+            cache.preload("/test1")
+            clock.now = 15
+            cache.get("/test1/source/param1")
+            started.wait()
+            cache.get("/test1/source/param1")
+            release.set()
+
+        assert store.fetched == ["/test1/source/param1"]
+        assert cache.stats()["Refreshes"] == 1
+
+    def test_success_stale_after_close(self, cache: ParameterCache, clock):
+        cache.preload("/test1")
+        cache.close()
+        clock.now = 15
+
+        assert cache.get("/test1/source/param1")["Value"] == "value1"
+        assert cache.stats()["Refreshes"] == 0
+
+    def test_success_closes_own_store(self, store: CountingStore):
+        with ParameterCache() as cache:
+            own_store = cache.store
+
+        with ParameterCache(store):
+            pass
+
+        with pytest.raises(RuntimeError):
+            own_store.get_many(["/test1/source/param1"])
+
+        assert len(store.get_many(["/test1/source/param1"])) == 1
+
+    def test_fail_invalid_settings(self, store: CountingStore):
+        with pytest.raises(ValueError, match="TTLs must be positive"):
+            ParameterCache(store, ttl=0)
@@ -0,0 +1,105 @@
+import pytest
+
+from acat.ssm import SSMStore
+from acat.ssm.transform import Rule
+from acat.ssm.transform import Transform
+
+
+@pytest.fixture
+def store():
+    with SSMStore(write_rate=1000) as store:
+        yield store
+
+
+class TestSSMStore:
+    def test_success_list(self, store: SSMStore):
+        assert store.list("/test1") == {"/test1/source/param1", "/test1/source/param2"}
+
+    def test_success_get(self, store: SSMStore):
+        parameters = store.get("/test3")
+
+        assert len(parameters) == 7
+        assert parameters["/test3/source/param2"]["Value"] == "value2"
+
+    def test_success_get_many(self, store: SSMStore, caplog):
+        names = [f"/test3/source/param{i}" for i in range(7)]
+        names += ["/test1/source/param1", "/test2/source/param2", "/missing"]
+
+        parameters = store.get_many(names)
+
+        assert sorted(parameters) == sorted(names[:-1])
+        # Missing names are expected here, e.g. for a read-through cache
+        assert not [r for r in caplog.records if r.levelname == "WARNING"]
+
+    def test_success_put(self, store: SSMStore, mock_ssm):
+        parameters = [
+            {"Name": "/new/param", "Value": "new", "Type": "String"},
+            {"Name": "/test1/source/param1", "Value": "new", "Type": "String"},
+        ]
+
+        result = store.put(parameters)
+
+        assert result["Written"] == 1
+        assert [failure["Name"] for failure in result["Failed"]] == [
+            "/test1/source/param1"
+        ]
+        assert mock_ssm.get_parameter(Name="/new/param")["Parameter"]["Value"] == "new"
+
+    def test_success_delete(self, store: SSMStore):
+        result = store.delete(["/test1/source/param1", "/missing"])
+
+        assert result == {
+            "Deleted": ["/test1/source/param1"],
+            "Invalid": ["/missing"],
+            "Failed": [],
+        }
+        assert store.list("/test1") == {"/test1/source/param2"}
+
+    def test_success_copy(self, store: SSMStore, mock_ssm):
+        transform = Transform("/test1", "/copy", value_rules=[Rule("s/value/v/")])
+
+        first = store.copy("/test1", "/copy", transform=transform)
+        second = store.copy("/test1", "/copy", transform=transform)
+
+        assert first == {
+            "Summary": {
+                "Created": 2,
+                "Updated": 0,
+                "Unchanged": 0,
+                "Skipped": 0,
+                "Failed": 0,
+            },
+            "Failures": [],
+        }
+        assert second["Summary"]["Unchanged"] == 2
+        parameter = mock_ssm.get_parameter(Name="/copy/source/param1")["Parameter"]
+        assert parameter["Value"] == "v1"
+
+    def test_success_plan_copy(self, store: SSMStore, mock_ssm):
+        mock_ssm.put_parameter(Name="/copy/source/param1", Value="x", Type="String")
+
+        plan = store.plan_copy("/test1", "/copy", overwrite=True)
+        result = store.apply_copy(plan, overwrite=True)
+
+        assert [param["Name"] for param in plan["Created"]] == ["/copy/source/param2"]
+        assert [param["Name"] for param in plan["Updated"]] == ["/copy/source/param1"]
+        assert result["Summary"]["Updated"] == 1
+
+    def test_success_cache_invalidated_after_writes(self):
+        with SSMStore(cache_ttl=60) as store:
+            assert len(store.list("/test1")) == 2
+
+            store.put([{"Name": "/test1/source/new", "Value": "v", "Type": "String"}])
+
+            assert "/test1/source/new" in store.list("/test1")
+
+    def test_success_explicit_client(self, mock_ssm):
+        with SSMStore(client=mock_ssm) as store:
+            assert store.client is mock_ssm
+            assert len(store.get("/test2")) == 2
+
+    def test_fail_closed(self, store: SSMStore):
+        store.close()
+
+        with pytest.raises(RuntimeError):
+            store.get_many(["/test1/source/param1"])
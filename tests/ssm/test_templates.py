@@ -0,0 +1,153 @@
+import os
+from pathlib import Path
+from textwrap import dedent
+
+import pytest
+
+from acat.ssm import templates
+from acat.ssm.templates import TemplateScanCache
+from acat.ssm.templates import find_templates
+from acat.ssm.templates import scan_template
+from acat.ssm.templates import scan_templates
+
+YAML_TEMPLATE = dedent("""\
+    Resources:
+      Bucket:
+        Properties:
+          BucketName: !Sub '{{resolve:ssm:/${AWS::StackName}/bucket/name}}'
+          Tag: '{{resolve:ssm:/${AWS::StackName}/bucket/tag}}'
+    """)
+JSON_TEMPLATE = (
+    '{"Resources": {"Queue": {"Properties": {'
+    '"QueueName": "{{resolve:ssm:/${AWS::StackName}/queue/name}}", '
+    '"Delay": "{{resolve:ssm:/${AWS::StackName}/queue/delay}}"}}}}'
+)
+
+
+@pytest.fixture
+def templates_dir(tmp_path: Path) -> Path:
+    path = tmp_path / "templates"
+    (path / "stacks").mkdir(parents=True)
+    (path / "template.yaml").write_text(YAML_TEMPLATE)
+    (path / "stacks" / "queue.json").write_text(JSON_TEMPLATE)
+    (path / "stacks" / "README.md").write_text(YAML_TEMPLATE)
+    return path
+
+
+class TestFindTemplates:
+    def test_success_directory(self, templates_dir: Path):
+        assert find_templates([str(templates_dir)]) == [
+            templates_dir / "stacks" / "queue.json",
+            templates_dir / "template.yaml",
+        ]
+
+    def test_success_glob(self, templates_dir: Path):
+        assert find_templates([f"{templates_dir}/**/*.json"]) == [
+            templates_dir / "stacks" / "queue.json"
+        ]
+
+    def test_success_duplicates(self, templates_dir: Path):
+        path = str(templates_dir / "template.yaml")
+
+        assert find_templates([path, path, str(templates_dir)]) == [
+            templates_dir / "template.yaml",
+            templates_dir / "stacks" / "queue.json",
+        ]
+
+    def test_fail_glob_without_matches(self, templates_dir: Path):
+        with pytest.raises(FileNotFoundError, match="No template files match"):
+            find_templates([f"{templates_dir}/*.yml"])
+
+    def test_fail_invalid_extension(self):
+        with pytest.raises(ValueError, match="must have .yaml, .yml or .json"):
+            find_templates(["template.txt"])
+
+
+class TestScanTemplate:
+    def test_success_yaml(self, templates_dir: Path):
+        assert scan_template(templates_dir / "template.yaml") == [
+            "/bucket/name",
+            "/bucket/tag",
+        ]
+
+    def test_success_minified_json(self, templates_dir: Path):
+        assert scan_template(templates_dir / "stacks" / "queue.json") == [
+            "/queue/delay",
+            "/queue/name",
+        ]
+
+    def test_success_empty_file(self, tmp_path: Path):
+        (tmp_path / "empty.yaml").touch()
+
+        assert scan_template(tmp_path / "empty.yaml") == []
+
+
+class TestScanTemplates:
+    def test_success(self, templates_dir: Path):
+        assert scan_templates([str(templates_dir)]) == {
+            "/bucket/name",
+            "/bucket/tag",
+            "/queue/delay",
+            "/queue/name",
+        }
+
+    def test_success_unchanged_templates_are_not_rescanned(
+        self, templates_dir: Path, monkeypatch
+    ):
+        scanned: list[Path] = []
+
+        def spy(path: Path) -> list[str]:
+            scanned.append(path)
+            return scan_template(path)
+
+        monkeypatch.setattr(templates, "scan_template", spy)
+        scan_templates([str(templates_dir)])
+        (templates_dir / "template.yaml").write_text("Resources: {}")
+        params = scan_templates([str(templates_dir)])
+
+        assert sorted(scanned) == [
+            templates_dir / "stacks" / "queue.json",
+            templates_dir / "template.yaml",
+            templates_dir / "template.yaml",
+        ]
+        assert params == {"/queue/delay", "/queue/name"}
+
+
+class TestTemplateScanCache:
+    def test_success_touched_file_is_not_rescanned(
+        self, templates_dir: Path, monkeypatch
+    ):
+        path = templates_dir / "template.yaml"
+        cache = TemplateScanCache()
+        cache.scan(path)
+        cache.save()
+        os.utime(path, ns=(0, 0))
+        monkeypatch.setattr(templates, "scan_template", pytest.fail)
+
+        assert TemplateScanCache().scan(path) == ["/bucket/name", "/bucket/tag"]
+
+    def test_success_saved_between_runs(self, templates_dir: Path, cache_dir: str):
+        cache = TemplateScanCache()
+        cache.scan(templates_dir / "template.yaml")
+        cache.save()
+
+        assert (Path(cache_dir) / "templates.json").exists()
+
+    def test_success_corrupted_cache(self, templates_dir: Path, cache_dir: str):
+        Path(cache_dir).mkdir()
+        (Path(cache_dir) / "templates.json").write_text("not json")
+
+        assert TemplateScanCache().scan(templates_dir / "template.yaml") == [
+            "/bucket/name",
+            "/bucket/tag",
+        ]
+
+    def test_success_pattern_changed(self, templates_dir: Path, monkeypatch):
+        path = templates_dir / "template.yaml"
+        cache = TemplateScanCache()
+        cache.scan(path)
+        cache.save()
+        monkeypatch.setattr(templates, "MATCH_STR", r"\{\{resolve:ssm:(/\S+)\}\}")
+        monkeypatch.setattr(templates, "scan_template", lambda _path: ["/changed"])
+
+        assert TemplateScanCache().scan(path) == ["/changed"]
@@ -0,0 +1,226 @@
+import threading
+import time
+
+import pytest
+from botocore.exceptions import ClientError
+from botocore.exceptions import EndpointConnectionError
+
+from acat.ssm.throttling import AdaptiveConcurrency
+from acat.ssm.throttling import TokenBucket
+from acat.ssm.throttling import WriteScheduler
+from acat.ssm.throttling import is_retryable_error
+from acat.ssm.throttling import is_throttling_error
+
+
+def throttling_error() -> ClientError:
+    return ClientError(
+        {"Error": {"Code": "ThrottlingException", "Message": "Rate exceeded"}},
+        "PutParameter",
+    )
+
+
+def server_error() -> ClientError:
+    return ClientError(
+        {
+            "Error": {"Code": "InternalServerError", "Message": "Internal error"},
+            "ResponseMetadata": {"HTTPStatusCode": 500},
+        },
+        "PutParameter",
+    )
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(time, "sleep", lambda _: None)
+
+
+class TestIsThrottlingError:
+    def test_success_throttling_error(self):
+        assert is_throttling_error(throttling_error())
+
+    def test_success_other_client_error(self):
+        error = ClientError({"Error": {"Code": "ParameterNotFound"}}, "GetParameter")
+
+        assert not is_throttling_error(error)
+
+    def test_success_plain_exception(self):
+        assert not is_throttling_error(Exception("test error"))
+
+
+class TestIsRetryableError:
+    @pytest.mark.parametrize(
+        "error",
+        [
+            throttling_error(),
+            server_error(),
+            ClientError({"Error": {"Code": "ServiceUnavailable"}}, "PutParameter"),
+            EndpointConnectionError(endpoint_url="https://ssm.amazonaws.com"),
+        ],
+    )
+    def test_success_retryable(self, error):
+        assert is_retryable_error(error)
+
+    def test_success_other_client_error(self):
+        error = ClientError(
+            {
+                "Error": {"Code": "ParameterAlreadyExists"},
+                "ResponseMetadata": {"HTTPStatusCode": 400},
+            },
+            "PutParameter",
+        )
+
+        assert not is_retryable_error(error)
+
+    def test_success_plain_exception(self):
+        assert not is_retryable_error(Exception("test error"))
+
+
+class TestTokenBucket:
+    def test_success_burst(self):
+        bucket = TokenBucket(rate=5)
+        start = time.monotonic()
+
+        for _ in range(5):
+            bucket.acquire()
+
+        assert time.monotonic() - start < 0.1
+
+    def test_success_waits_for_refill(self):
+        bucket = TokenBucket(rate=20, capacity=1)
+        start = time.monotonic()
+
+        for _ in range(3):
+            bucket.acquire()
+
+        assert time.monotonic() - start >= 0.09
+
+    def test_success_fractional_rate(self):
+        bucket = TokenBucket(rate=0.5)
+        start = time.monotonic()
+
+        bucket.acquire()
+
+        assert bucket.capacity == 1
+        assert time.monotonic() - start < 0.1
+        assert 1.9 < bucket._take() <= 2
+
+    def test_fail_invalid_rate(self):
+        with pytest.raises(ValueError, match="Rate must be greater than 0"):
+            TokenBucket(rate=0)
+
+
+class TestAdaptiveConcurrency:
+    def test_success_multiplicative_decrease(self):
+        concurrency = AdaptiveConcurrency(maximum=8, cooldown=0)
+
+        concurrency.on_throttle()
+        concurrency.on_throttle()
+
+        assert concurrency.limit == 2
+
+    def test_success_decrease_once_per_cooldown(self):
+        concurrency = AdaptiveConcurrency(maximum=8, cooldown=60)
+
+        concurrency.on_throttle()
+        concurrency.on_throttle()
+
+        assert concurrency.limit == 4
+
+    def test_success_additive_increase(self):
+        concurrency = AdaptiveConcurrency(maximum=8, cooldown=0)
+        concurrency.on_throttle()
+        concurrency.on_throttle()
+
+        for _ in range(2):
+            concurrency.on_success()
+
+        assert 2 < concurrency.limit < 4
+
+    def test_success_never_below_minimum(self):
+        concurrency = AdaptiveConcurrency(maximum=2, minimum=1, cooldown=0)
+
+        for _ in range(5):
+            concurrency.on_throttle()
+
+        assert concurrency.limit == 1
+
+    def test_fail_invalid_limits(self):
+        with pytest.raises(ValueError):
+            AdaptiveConcurrency(maximum=1, minimum=2)
+
+
+class TestWriteScheduler:
+    def test_success(self):
+        written = []
+        lock = threading.Lock()
+
+        def write(item: int):
+            with lock:
+                written.append(item)
+
+        scheduler: WriteScheduler[int] = WriteScheduler(rate=1000)
+        failures = scheduler.run(range(50), write, key=str)
+
+        assert failures == []
+        assert sorted(written) == list(range(50))
+
+    @pytest.mark.usefixtures("no_sleep")
+    def test_success_retries_throttled_writes(self):
+        attempts: dict[int, int] = {}
+        lock = threading.Lock()
+
+        def write(item: int):
+            with lock:
+                attempts[item] = attempts.get(item, 0) + 1
+
+                if attempts[item] < 3:
+                    raise throttling_error()
+
+        scheduler: WriteScheduler[int] = WriteScheduler(rate=1000)
+        failures = scheduler.run(range(5), write, key=str)
+
+        assert failures == []
+        assert attempts == {i: 3 for i in range(5)}
+        assert scheduler.concurrency.limit < scheduler.concurrency.maximum
+
+    @pytest.mark.usefixtures("no_sleep")
+    def test_fail_throttled_until_max_attempts(self):
+        def write(item: int):
+            raise throttling_error()
+
+        scheduler: WriteScheduler[int] = WriteScheduler(rate=1000, max_attempts=2)
+        failures = scheduler.run([1], write, key=str)
+
+        assert len(failures) == 1
+        assert failures[0]["Name"] == "1"
+        assert "ThrottlingException" in failures[0]["Error"]
+
+    @pytest.mark.usefixtures("no_sleep")
+    def test_success_retries_server_errors(self):
+        attempts: list[int] = []
+
+        def write(item: int):
+            attempts.append(item)
+
+            if len(attempts) < 3:
+                raise server_error()
+
+        scheduler: WriteScheduler[int] = WriteScheduler(rate=1000)
+        failures = scheduler.run([1], write, key=str)
+
+        assert failures == []
+        assert attempts == [1, 1, 1]
+        assert scheduler.concurrency.limit == scheduler.concurrency.maximum
+
+    def test_fail_other_errors_are_not_retried(self):
+        calls = []
+
+        def write(item: int):
+            calls.append(item)
+            raise Exception("test error")
+
+        scheduler: WriteScheduler[int] = WriteScheduler(rate=1000)
+        failures = scheduler.run([1], write, key=str)
+
+        assert calls == [1]
+        assert failures == [{"Name": "1", "Error": "test error"}]
@@ -0,0 +1,162 @@
+import pytest
+
+from acat.ssm.transform import Rule
+from acat.ssm.transform import Transform
+from acat.ssm.transform import build_transform
+from acat.ssm.transform import parse_key_map
+from acat.ssm.transform import parse_rules_file
+
+
+class TestRule:
+    def test_success(self):
+        assert Rule("s/old/new/").apply("old-old") == "new-new"
+
+    def test_success_groups(self):
+        assert Rule(r"s/(\w+)@(\w+)/\2@\1/").apply("user@host") == "host@user"
+
+    def test_success_custom_delimiter(self):
+        assert Rule("s|/dev/|/prod/|").apply("/app/dev/db") == "/app/prod/db"
+
+    def test_success_escaped_delimiter(self):
+        assert Rule(r"s/a\/b/c\/d/").apply("x/a/b") == "x/c/d"
+
+    @pytest.mark.parametrize(
+        "expression, text, expected",
+        [
+            (r"s|a\|b|X|", "ab a|b", "ab X"),
+            (r"s.a\.b.X.", "azb a.b", "azb X"),
+            (r"s|x|a\|b|", "x", "a|b"),
+        ],
+    )
+    def test_success_escaped_delimiter_is_literal(self, expression, text, expected):
+        assert Rule(expression).apply(text) == expected
+
+    @pytest.mark.parametrize(
+        "expression, text, expected",
+        [
+            (r"s/a\\/b/", "xa\\y", "xby"),
+            (r"s/x/a\\/", "x", "a\\"),
+            (r"s/a\\\/b/c/", "a\\/b", "c"),
+        ],
+    )
+    def test_success_escaped_backslash_before_delimiter(
+        self, expression, text, expected
+    ):
+        assert Rule(expression).apply(text) == expected
+
+    @pytest.mark.parametrize(
+        "expression, text, expected",
+        [
+            ("s/old/new/i", "OLD", "new"),
+            ("s/^x/y/m", "x\nx", "y\ny"),
+            ("s/a.b/c/s", "a\nb", "c"),
+        ],
+    )
+    def test_success_flags(self, expression, text, expected):
+        assert Rule(expression).apply(text) == expected
+
+    @pytest.mark.parametrize(
+        "expression",
+        ["invalidformat", "s/old/new", "s/a/b/c/", "s/old/new/x", "sxoldxnewx", "s"],
+    )
+    def test_fail_invalid_format(self, expression):
+        with pytest.raises(ValueError, match="Invalid replace format"):
+            Rule(expression)
+
+    def test_fail_global_flag(self):
+        with pytest.raises(ValueError, match="always replace every match, drop `g`"):
+            Rule("s/a/b/g")
+
+    def test_fail_invalid_regex(self):
+        with pytest.raises(ValueError, match="Invalid replace format.*unterminated"):
+            Rule("s/(old/new/")
+
+
+class TestParseRulesFile:
+    def test_success(self, tmp_path):
+        path = tmp_path / "rules"
+        path.write_text("# Comment\n\nname s/dev/prod/\nvalue s/a/b/\ns/c/d/i\n")
+
+        name_rules, value_rules = parse_rules_file(path)
+
+        assert [rule.expression for rule in name_rules] == ["s/dev/prod/"]
+        assert [rule.expression for rule in value_rules] == ["s/a/b/", "s/c/d/i"]
+
+    def test_fail_invalid_rule(self, tmp_path):
+        path = tmp_path / "rules"
+        path.write_text("s/a/b/\nname invalid\n")
+
+        with pytest.raises(ValueError, match=r"rules:2: Invalid replace format"):
+            parse_rules_file(path)
+
+
+class TestParseKeyMap:
+    def test_success(self):
+        assert parse_key_map(["alias/aws/ssm=alias/dest", "a=b=c"]) == {
+            "alias/aws/ssm": "alias/dest",
+            "a": "b=c",
+        }
+
+    @pytest.mark.parametrize("mapping", ["alias/aws/ssm", "=alias/dest", "a="])
+    def test_fail_invalid(self, mapping):
+        with pytest.raises(ValueError, match="Invalid KMS key mapping"):
+            parse_key_map([mapping])
+
+
+class TestTransform:
+    def test_success_anchored_rename(self):
+        transform = Transform("/test1", "/dest")
+
+        assert transform.rename("/test1/x/test1") == "/dest/x/test1"
+        assert transform.rename("/other/test1") == "/other/test1"
+
+    def test_success_rules_in_order(self):
+        transform = Transform(
+            "/src",
+            "/dst",
+            name_rules=[Rule("s/dev/stg/"), Rule("s/stg/prod/")],
+            value_rules=[Rule("s/a/b/"), Rule("s/b/c/")],
+        )
+
+        parameter = transform({"Name": "/src/dev", "Value": "ab", "Type": "String"})
+
+        assert parameter == {"Name": "/dst/prod", "Value": "cc", "Type": "String"}
+
+    def test_success_key_map(self):
+        transform = Transform("/src", "/dst", key_map={"alias/src": "alias/dst"})
+
+        mapped = transform(
+            {
+                "Name": "/src/a",
+                "Value": "x",
+                "Type": "SecureString",
+                "KeyId": "alias/src",
+            }
+        )
+        kept = transform(
+            {"Name": "/src/b", "Value": "x", "Type": "SecureString", "KeyId": "alias/o"}
+        )
+
+        assert mapped["KeyId"] == "alias/dst"
+        assert kept["KeyId"] == "alias/o"
+
+
+class TestBuildTransform:
+    def test_success(self, tmp_path):
+        path = tmp_path / "rules"
+        path.write_text("name s/x/y/\ns/2/3/\n")
+
+        transform = build_transform(
+            "/a", "/b", ["s/1/2/"], ["s/db/cache/"], rules_file=path
+        )
+
+        parameter = transform({"Name": "/a/db/x", "Value": "1", "Type": "String"})
+        assert parameter == {"Name": "/b/cache/y", "Value": "3", "Type": "String"}
+
+    def test_fail_invalid_rule(self):
+        with pytest.raises(ValueError, match="Invalid replace format"):
+            build_transform("/a", "/b", replace_name=["invalid"])
+
+    def test_fail_invalid_key_map(self):
+        with pytest.raises(ValueError, match="Invalid KMS key mapping"):
+            build_transform("/a", "/b", key_map=["invalid"])
@@ -1,15 +1,25 @@
 import re
 import threading
+import time
 
-import boto3
 import click
 import pytest
+from botocore.exceptions import ClientError
 
+from acat.ssm import utils
+from acat.ssm.records import ParameterStore
 from acat.ssm.types import Parameter
 from acat.ssm.utils import create_ssm_parameters
+from acat.ssm.utils import delete_ssm_parameters
 from acat.ssm.utils import get_current_params
+from acat.ssm.utils import get_key_ids
 from acat.ssm.utils import get_ssm_parameter_names
+from acat.ssm.utils import get_ssm_parameter_store
 from acat.ssm.utils import get_ssm_parameters
+from acat.ssm.utils import iter_ssm_parameters_by_name
+from acat.ssm.utils import iter_with_key_ids
+from acat.ssm.utils import list_ssm_parameter_names
+from acat.ssm.utils import plan_copy
 
 
 class TestGetCurrentParams:
@@ -24,7 +34,7 @@ class TestGetCurrentParams:
     def test_fail_template_file_invalid_type(self, path_preffix="/test1"):
         with pytest.raises(
             ValueError,
-            match=re.escape("Template file must have .yaml or .yml extension"),
+            match=re.escape("Template file must have .yaml, .yml or .json extension"),
         ):
             get_current_params("wrong_extension.txt", path_preffix)
 
@@ -61,6 +71,13 @@ class TestGetSsmParameterNames:
 
         assert len(names) == 0
 
+    def test_success_secure_strings_without_key_ids(self, mock_ssm):
+        mock_ssm.put_parameter(Name="/secure/param", Value="s", Type="SecureString")
+
+        assert get_ssm_parameters("/secure/") == [
+            {"Name": "/secure/param", "Value": "s", "Type": "SecureString"}
+        ]
+
     def test_fail_without_path_preffix(self):
         with pytest.raises(
             TypeError,
@@ -71,6 +88,98 @@ class TestGetSsmParameterNames:
             get_ssm_parameter_names()  # type:ignore
 
 
+class TestListSsmParameterNames:
+    @pytest.fixture
+    def sharded_names(self, mock_ssm) -> set[str]:
+        names = [f"/shard/env{i % 3}/param{i}" for i in range(120)]
+        # Names outside the segments seen in the first page
+        names += ["/shard/env1", "/shard/env10/param", "/shard/leaf", "/shard-x/p"]
+
+        for name in names:
+            mock_ssm.put_parameter(Name=name, Value="value", Type="String")
+
+        return set(names)
+
+    @pytest.fixture
+    def calls(self, mock_ssm, monkeypatch) -> list[dict]:
+        calls: list[dict] = []
+        describe_parameters = mock_ssm.describe_parameters
+        lock = threading.Lock()
+        in_flight = 0
+
+        def counted(**kwargs):
+            nonlocal in_flight
+
+            with lock:
+                in_flight += 1
+                calls.append({**kwargs, "InFlight": in_flight})
+
+            time.sleep(0.01)
+
+            try:
+                return describe_parameters(**kwargs)
+            finally:
+                with lock:
+                    in_flight -= 1
+
+        monkeypatch.setattr(mock_ssm, "describe_parameters", counted)
+        return calls
+
+    @pytest.mark.parametrize("max_depth", [0, 1, 4])
+    def test_success_sharded(self, mock_ssm, sharded_names, max_depth):
+        names = list_ssm_parameter_names(
+            "/shard", mock_ssm, max_concurrency=4, max_depth=max_depth
+        )
+
+        assert names == sharded_names
+
+    @pytest.mark.usefixtures("sharded_names")
+    def test_success_shards_on_path_segments(self, mock_ssm, calls):
+        list_ssm_parameter_names("/shard", mock_ssm, max_concurrency=4)
+
+        shards = {
+            call["ParameterFilters"][0]["Values"][0]
+            for call in calls
+            if "NextToken" not in call
+            and call["ParameterFilters"][0]["Values"][0].endswith("/")
+        }
+        assert shards == {"/shard/env0/", "/shard/env1/", "/shard/env2/"}
+        # The first page, 5 pages per shard, and the branches off the segments
+        assert len(calls) < 40
+        assert max(call["InFlight"] for call in calls) > 1
+
+    def test_success_shards_sorted_names(self, mock_ssm, calls):
+        names = {f"/sorted/env{i}/svc/param{j:02}" for i in range(4) for j in range(30)}
+
+        for name in sorted(names):
+            mock_ssm.put_parameter(Name=name, Value="value", Type="String")
+
+        assert list_ssm_parameter_names("/sorted", mock_ssm) == names
+
+        # The first page only holds `/sorted/env0/`, and the filter for the
+        # other environments is split again instead of paged through, so no
+        # filter takes more pages than a single environment
+        pages: dict[str, int] = {}
+
+        for call in calls:
+            values = str(call["ParameterFilters"][0]["Values"])
+            pages[values] = pages.get(values, 0) + 1
+
+        assert max(pages.values()) == pages[str(["/sorted/env0/"])]
+
+    def test_success_serial_without_split(self, mock_ssm, sharded_names, calls):
+        list_ssm_parameter_names("/shard", mock_ssm, max_depth=0)
+
+        assert len(calls) == -(-len(sharded_names) // 10)  # moto pages by 10
+        assert max(call["InFlight"] for call in calls) == 1
+
+    def test_success_single_page(self, mock_ssm, calls):
+        names = list_ssm_parameter_names("/test1", mock_ssm)
+
+        assert names == {"/test1/source/param1", "/test1/source/param2"}
+        assert len(calls) == 1
+
+
 class TestGetSsmParameters:
     def test_success(self, path_preffix="/test3"):
         params = get_ssm_parameters(path_preffix)
@@ -85,6 +194,98 @@ class TestGetSsmParameters:
 
         assert len(params) == 0
 
+    def test_success_multiple_pages(self, path_preffix="/"):
+        params = get_ssm_parameters(path_preffix)
+
+        assert len(params) == 11
+        assert len({param["Name"] for param in params}) == 11
+
+    def test_success_values(self, path_preffix="/test1/"):
+        params = get_ssm_parameters(path_preffix)
+
+        assert sorted(params, key=lambda x: x["Name"]) == [
+            {"Name": "/test1/source/param1", "Value": "value1", "Type": "String"},
+            {"Name": "/test1/source/param2", "Value": "value2", "Type": "String"},
+        ]
+
+    @pytest.mark.parametrize(
+        "path_preffix, expected",
+        [
+            ("/app/prod", ["/app/prod", "/app/prod-eu/db", "/app/prod/db"]),
+            ("/app/pro", ["/app/prod", "/app/prod-eu/db", "/app/prod/db"]),
+            ("/app/prod/", ["/app/prod/db"]),
+        ],
+    )
+    def test_success_begins_with(self, mock_ssm, path_preffix, expected):
+        for name in ["/app/prod", "/app/prod-eu/db", "/app/prod/db"]:
+            mock_ssm.put_parameter(Name=name, Value="value", Type="String")
+
+        params = get_ssm_parameters(path_preffix)
+
+        assert sorted(param["Name"] for param in params) == expected
+        assert get_ssm_parameter_names(path_preffix) == set(expected)
+
+    def test_success_without_leading_slash(self, mock_ssm):
+        mock_ssm.put_parameter(Name="plain-param", Value="plain", Type="String")
+
+        params = get_ssm_parameters("plain")
+
+        assert params == [{"Name": "plain-param", "Value": "plain", "Type": "String"}]
+
+    def test_success_batches_of_ten(self, mock_ssm, path_preffix="batch"):
+        for i in range(25):
+            mock_ssm.put_parameter(Name=f"batch-{i:02d}", Value=str(i), Type="String")
+
+        pages = list(iter_ssm_parameters_by_name(get_ssm_parameter_names(path_preffix)))
+
+        assert [len(page) for page in pages] == [10, 10, 5]
+
+    @pytest.mark.parametrize("missing_ok, levels", [(False, ["WARNING"]), (True, [])])
+    def test_success_missing_names(self, caplog, missing_ok, levels):
+        names = ["/test1/source/param1", "/missing"]
+
+        pages = list(iter_ssm_parameters_by_name(names, missing_ok=missing_ok))
+
+        assert [param["Name"] for page in pages for param in page] == names[:1]
+        assert [
+            record.levelname
+            for record in caplog.records
+            if record.getMessage() == "Parameter /missing could not be fetched"
+        ] == levels
+
+    @pytest.mark.parametrize("path_preffix", ["/secure/", "secure-"])
+    def test_success_secure_strings(self, mock_ssm, path_preffix):
+        mock_ssm.put_parameter(
+            Name=f"{path_preffix}param1", Value="s1", Type="SecureString"
+        )
+        mock_ssm.put_parameter(
+            Name=f"{path_preffix}param2",
+            Value="s2",
+            Type="SecureString",
+            KeyId="alias/k",
+        )
+        mock_ssm.put_parameter(
+            Name=f"{path_preffix}param3", Value="plain", Type="String"
+        )
+
+        params = get_ssm_parameters(path_preffix, with_key_ids=True)
+
+        assert sorted(params, key=lambda x: x["Name"]) == [
+            {
+                "Name": f"{path_preffix}param1",
+                "Value": "s1",
+                "Type": "SecureString",
+                "KeyId": "alias/aws/ssm",
+            },
+            {
+                "Name": f"{path_preffix}param2",
+                "Value": "s2",
+                "Type": "SecureString",
+                "KeyId": "alias/k",
+            },
+            {"Name": f"{path_preffix}param3", "Value": "plain", "Type": "String"},
+        ]
+
     def test_fail_without_path_preffix(self):
         with pytest.raises(
             TypeError,
@@ -95,31 +296,183 @@ class TestGetSsmParameters:
             get_ssm_parameters()  # type:ignore
 
 
+class TestGetKeyIds:
+    def test_success(self, mock_ssm):
+        names = [f"/keys/param{i:02d}" for i in range(60)]
+
+        for name in names:
+            mock_ssm.put_parameter(
+                Name=name, Value="secret", Type="SecureString", KeyId="alias/keys"
+            )
+
+        key_ids = get_key_ids([*names, "/test1/source/param1", "/missing"])
+
+        assert key_ids == dict.fromkeys(names, "alias/keys")
+
+
+class TestIterWithKeyIds:
+    def test_success(self, mock_ssm, monkeypatch):
+        names = [f"/keys/param{i:02d}" for i in range(60)]
+
+        for name in names:
+            mock_ssm.put_parameter(
+                Name=name, Value="secret", Type="SecureString", KeyId="alias/keys"
+            )
+
+        calls: list[list[str]] = []
+        describe_parameters = mock_ssm.describe_parameters
+
+        def counted(**kwargs):
+            # moto returns pages of 10, only count the first page of a lookup
+            if "NextToken" not in kwargs:
+                calls.append(kwargs["ParameterFilters"][0]["Values"])
+
+            return describe_parameters(**kwargs)
+
+        monkeypatch.setattr(mock_ssm, "describe_parameters", counted)
+        plain: Parameter = {"Name": "/plain", "Value": "v", "Type": "String"}
+        pages = [[plain]] + [
+            [{"Name": name, "Value": "secret", "Type": "SecureString"}]
+            for name in names
+        ]
+
+        result = list(iter_with_key_ids(pages, mock_ssm))
+
+        assert result[0] == [plain]
+        assert [page[0]["Name"] for page in result[1:]] == names
+        assert {page[0].get("KeyId") for page in result[1:]} == {"alias/keys"}
+        assert [len(values) for values in calls] == [50, 10]
+
+
+class TestGetSsmParameterStore:
+    def test_success(self, path_preffix="/test1/"):
+        store = get_ssm_parameter_store(path_preffix)
+
+        assert isinstance(store, ParameterStore)
+        assert dict(store) == {
+            "/test1/source/param1": {
+                "Name": "/test1/source/param1",
+                "Value": "value1",
+                "Type": "String",
+            },
+            "/test1/source/param2": {
+                "Name": "/test1/source/param2",
+                "Value": "value2",
+                "Type": "String",
+            },
+        }
+
+    def test_success_cache_ttl(self, path_preffix="/test3"):
+        store = get_ssm_parameter_store(path_preffix, cache_ttl=60)
+
+        assert len(store) == 7
+        assert store["/test3/source/param0"]["Value"] == "value0"
+
+
+class TestPlanCopy:
+    existing = {
+        "/dest/same": Parameter(Name="/dest/same", Value="a", Type="String"),
+        "/dest/changed": Parameter(Name="/dest/changed", Value="a", Type="String"),
+        "/dest/retyped": Parameter(Name="/dest/retyped", Value="a", Type="String"),
+    }
+    parameters = [
+        Parameter(Name="/dest/same", Value="a", Type="String"),
+        Parameter(Name="/dest/changed", Value="b", Type="String"),
+        Parameter(Name="/dest/retyped", Value="a", Type="StringList"),
+        Parameter(Name="/dest/new", Value="a", Type="String"),
+    ]
+
+    def test_success_overwrite(self):
+        plan = plan_copy(self.parameters, self.existing, overwrite=True)
+
+        assert plan["Created"] == [self.parameters[3]]
+        assert plan["Updated"] == self.parameters[1:3]
+        assert plan["Unchanged"] == [self.parameters[0]]
+        assert plan["Skipped"] == []
+
+    def test_success_no_overwrite(self):
+        plan = plan_copy(self.parameters, self.existing, overwrite=False)
+
+        assert plan["Created"] == [self.parameters[3]]
+        assert plan["Updated"] == []
+        assert plan["Unchanged"] == [self.parameters[0]]
+        assert plan["Skipped"] == self.parameters[1:3]
+
+
+class TestDeleteSsmParameters:
+    def test_success(self, path_preffix="/test3"):
+        names = get_ssm_parameter_names(path_preffix)
+
+        result = delete_ssm_parameters(names)
+
+        assert result["Deleted"] == sorted(names)
+        assert result["Invalid"] == []
+        assert result["Failed"] == []
+        assert get_ssm_parameter_names(path_preffix) == set()
+
+    def test_success_more_than_one_batch(self, mock_ssm):
+        names = {f"/batch/param{i:02d}" for i in range(23)}
+
+        for name in names:
+            mock_ssm.put_parameter(Name=name, Value="value", Type="String")
+
+        result = delete_ssm_parameters(names)
+
+        assert result["Deleted"] == sorted(names)
+        assert get_ssm_parameter_names("/batch") == set()
+
+    def test_success_invalid_parameters(self):
+        result = delete_ssm_parameters({"/test1/source/param1", "/no_path/param"})
+
+        assert result["Deleted"] == ["/test1/source/param1"]
+        assert result["Invalid"] == ["/no_path/param"]
+
+    def test_fail_batch_error(self, fake_ssm_client):
+        fake_ssm_client.raise_error = True
+
+        result = delete_ssm_parameters({"/test/param1", "/test/param2"})
+
+        assert result["Deleted"] == []
+        assert result["Failed"] == [
+            {"Name": "/test/param1", "Error": "test error"},
+            {"Name": "/test/param2", "Error": "test error"},
+        ]
+
+
 # Fake SSM client for testing
 class FakeSSMClient:
-    def __init__(self, raise_error=False):
+    def __init__(self, raise_error=False, throttle_times=0):
         self.put_param_calls = []
         self.raise_error = raise_error
+        self.throttle_times = throttle_times
         self.lock = threading.Lock()
 
     def put_parameter(self, Overwrite, **parameter):  # noqa N803
         with self.lock:
             if self.raise_error:
                 raise Exception("test error")
+            if self.throttle_times > 0:
+                self.throttle_times -= 1
+                raise ClientError(
+                    {"Error": {"Code": "ThrottlingException"}}, "PutParameter"
+                )
             self.put_param_calls.append((Overwrite, parameter))
 
+    def delete_parameters(self, Names):  # noqa N803
+        if self.raise_error:
+            raise Exception("test error")
+        return {"DeletedParameters": Names, "InvalidParameters": []}
+
 
 @pytest.fixture()
 def fake_ssm_client(monkeypatch):
     # This fixture allows tests to override the fake client behavior.
     client_instance = FakeSSMClient()
 
-    def fake_client(service_name, *args, **kwargs):
-        if service_name == "ssm":
-            return client_instance
-        return boto3.client(service_name, *args, **kwargs)
+    def fake_client(*args, **kwargs):
+        return client_instance
 
-    monkeypatch.setattr(boto3, "client", fake_client)
+    monkeypatch.setattr(utils, "get_ssm_client", fake_client)
     return client_instance
 
 
@@ -166,12 +519,10 @@ def test_create_ssm_parameters_failure(monkeypatch, captured_click_echo):
     # Set up a fake client which raises an error
     fake_client = FakeSSMClient(raise_error=True)
 
-    def fake_ssm_client(service_name, *args, **kwargs):
-        if service_name == "ssm":
-            return fake_client
-        return boto3.client(service_name, *args, **kwargs)
+    def fake_ssm_client(*args, **kwargs):
+        return fake_client
 
-    monkeypatch.setattr(boto3, "client", fake_ssm_client)
+    monkeypatch.setattr(utils, "get_ssm_client", fake_ssm_client)
 
     parameters = [Parameter(Name="/test/param_error", Value="fail", Type="String")]
     overwrite = False
@@ -186,3 +537,21 @@ def test_create_ssm_parameters_failure(monkeypatch, captured_click_echo):
     assert (
         "Error creating parameter /test/param_error: test error" in captured_click_echo
     )
+    assert "Failed to create 1 parameters" in captured_click_echo
+
+
+def test_create_ssm_parameters_retries_throttling(monkeypatch, captured_click_echo):
+    fake_client = FakeSSMClient(throttle_times=2)
+
+    def fake_ssm_client(*args, **kwargs):
+        return fake_client
+
+    monkeypatch.setattr(utils, "get_ssm_client", fake_ssm_client)
+    monkeypatch.setattr(time, "sleep", lambda _: None)
+
+    parameters = [Parameter(Name="/test/param_throttled", Value="foo", Type="String")]
+
+    failures = create_ssm_parameters(parameters, overwrite=True)
+
+    assert failures == []
+    assert len(fake_client.put_param_calls) == 1
@@ -0,0 +1,209 @@
+import json
+import threading
+
+import pytest
+
+from acat.ssm.core import watch
+from acat.ssm.watch import AdaptiveInterval
+from acat.ssm.watch import diff_versions
+from acat.ssm.watch import get_versions
+from acat.ssm.watch import watch_ssm_parameters
+from tests.conftest import BaseTest
+
+
+class ChangingStop(threading.Event):
+    """Stop event that runs a change instead of waiting between polls."""
+
+    def __init__(self, *changes):
+        super().__init__()
+        self.changes = list(changes)
+        self.waits: list[float] = []
+
+    def wait(self, timeout=None):
+        self.waits.append(timeout)
+
+        if self.changes:
+            self.changes.pop(0)()
+
+        return False
+
+
+class TestAdaptiveInterval:
+    def test_success(self):
+        interval = AdaptiveInterval(1, 5)
+
+        assert [interval.next(False) for _ in range(4)] == [2, 4, 5, 5]
+        assert interval.next(True) == 1
+
+    def test_fail_invalid(self):
+        with pytest.raises(ValueError, match="min <= max"):
+            AdaptiveInterval(10, 1)
+
+
+class TestDiffVersions:
+    def test_success(self):
+        previous = {
+            "/a": {"Version": 1, "LastModifiedDate": None, "Type": "String"},
+            "/b": {"Version": 1, "LastModifiedDate": None, "Type": "String"},
+            "/c": {"Version": 1, "LastModifiedDate": None, "Type": "String"},
+        }
+        current = {
+            "/a": {"Version": 1, "LastModifiedDate": None, "Type": "String"},
+            "/b": {
+                "Version": 2,
+                "LastModifiedDate": "2026-01-01T00:00:00",
+                "Type": "String",
+            },
+            "/d": {"Version": 1, "LastModifiedDate": None, "Type": "String"},
+        }
+
+        events = diff_versions(previous, current)
+
+        assert [(e["Event"], e["Name"], e["Version"]) for e in events] == [
+            ("changed", "/b", 2),
+            ("deleted", "/c", None),
+            ("added", "/d", 1),
+        ]
+
+    def test_success_recreated(self):
+        previous = {
+            "/a": {
+                "Version": 1,
+                "LastModifiedDate": "2026-01-01T00:00:00",
+                "Type": "String",
+            }
+        }
+        current = {
+            "/a": {
+                "Version": 1,
+                "LastModifiedDate": "2026-01-02T00:00:00",
+                "Type": "String",
+            }
+        }
+
+        events = diff_versions(previous, current)
+
+        assert [(e["Event"], e["Name"]) for e in events] == [("changed", "/a")]
+
+
+class TestWatchSsmParameters:
+    def test_success(self, mock_ssm):
+        stop = ChangingStop(
+            lambda: mock_ssm.put_parameter(
+                Name="/test1/source/param1", Value="new", Type="String", Overwrite=True
+            ),
+            lambda: mock_ssm.delete_parameter(Name="/test1/source/param2"),
+            lambda: mock_ssm.put_parameter(
+                Name="/test1/source/param3", Value="v3", Type="String"
+            ),
+        )
+        events = []
+
+        watch_ssm_parameters(
+            "/test1", events.append, AdaptiveInterval(1, 8), polls=5, stop=stop
+        )
+
+        assert [(e["Event"], e["Name"], e["Value"]) for e in events] == [
+            ("changed", "/test1/source/param1", "new"),
+            ("deleted", "/test1/source/param2", None),
+            ("added", "/test1/source/param3", "v3"),
+        ]
+        assert stop.waits == [2, 1, 1, 1]
+
+    def test_success_backs_off_without_changes(self):
+        stop = ChangingStop()
+
+        watch_ssm_parameters(
+            "/test1", [].append, AdaptiveInterval(1, 4), polls=4, stop=stop
+        )
+
+        assert stop.waits == [2, 4, 4]
+
+    def test_success_initial(self):
+        events = []
+
+        watch_ssm_parameters("/test1", events.append, initial=True, polls=1)
+
+        assert [(e["Event"], e["Value"]) for e in events] == [
+            ("added", "value1"),
+            ("added", "value2"),
+        ]
+
+    def test_success_stop(self):
+        stop = threading.Event()
+        stop.set()
+
+        watch_ssm_parameters("/test1", [].append, stop=stop)
+
+    def test_success_only_fetches_changed_values(self, mock_ssm, monkeypatch):
+        requested = []
+        stop = ChangingStop(
+            lambda: mock_ssm.put_parameter(
+                Name="/test3/source/param4", Value="x", Type="String", Overwrite=True
+            )
+        )
+        get_parameters = mock_ssm.get_parameters
+
+        def spy(**kwargs):
+            requested.append(kwargs["Names"])
+            return get_parameters(**kwargs)
+
+        monkeypatch.setattr(mock_ssm, "get_parameters", spy)
+
+        watch_ssm_parameters("/test3", [].append, polls=2, stop=stop, client=mock_ssm)
+
+        assert requested == [["/test3/source/param4"]]
+
+    @pytest.mark.parametrize("show_secure, value", [(False, None), (True, "s")])
+    def test_success_secure_values(self, mock_ssm, show_secure, value):
+        mock_ssm.put_parameter(Name="/secure/param", Value="s", Type="SecureString")
+        events = []
+
+        watch_ssm_parameters(
+            "/secure", events.append, initial=True, polls=1, show_secure=show_secure
+        )
+
+        assert events[0]["Type"] == "SecureString"
+        assert events[0]["Value"] == value
+
+    def test_success_secure_values_not_fetched(self, mock_ssm, monkeypatch):
+        mock_ssm.put_parameter(Name="/secure/param", Value="s", Type="SecureString")
+        monkeypatch.setattr(mock_ssm, "get_parameters", None)
+        events = []
+
+        watch_ssm_parameters(
+            "/secure", events.append, initial=True, polls=1, client=mock_ssm
+        )
+
+        assert [(e["Name"], e["Type"], e["Value"]) for e in events] == [
+            ("/secure/param", "SecureString", None)
+        ]
+
+    def test_success_get_versions(self):
+        versions = get_versions("/test1")
+
+        assert set(versions) == {"/test1/source/param1", "/test1/source/param2"}
+        assert versions["/test1/source/param1"]["Version"] == 1
+        assert versions["/test1/source/param1"]["LastModifiedDate"]
+        assert versions["/test1/source/param1"]["Type"] == "String"
+
+
+class TestWatch(BaseTest):
+    def test_success(self):
+        result = self.runner.invoke(watch, ["/test1", "--initial", "--polls", "1"])
+
+        assert result.exit_code == 0
+        events = [json.loads(line) for line in result.output.splitlines()]
+        assert [event["Name"] for event in events] == [
+            "/test1/source/param1",
+            "/test1/source/param2",
+        ]
+        assert events[0]["Event"] == "added"
+
+    def test_fail_invalid_intervals(self):
+        args = ["/test1", "--interval", "10", "--max-interval", "1"]
+
+        result = self.runner.invoke(watch, args)
+
+        assert result.exit_code == 2
+        assert "--interval cannot be greater" in result.output
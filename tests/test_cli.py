@@ -0,0 +1,81 @@
+import os
+import subprocess
+import sys
+
+import click
+import pytest
+
+from acat.cli import LAZY_SUBCOMMANDS
+from acat.cli import cli
+
+HEAVY_MODULES = ("boto3", "botocore", "mypy_boto3_ssm", "loguru", "acat.ssm.core")
+
+
+def run_cli(*args: str, env: dict[str, str] | None = None) -> str:
+    """Run the CLI in a fresh interpreter and list the heavy modules it imported."""
+    code = (
+        "import sys\n"
+        "from acat.cli import cli\n"
+        "try:\n"
+        "    cli(prog_name='acat')\n"
+        "finally:\n"
+        f"    print([m for m in {HEAVY_MODULES!r} if m in sys.modules])\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code, *args],
+        capture_output=True,
+        text=True,
+        env={**os.environ, **(env or {})},
+    )
+    return result.stdout
+
+
+class TestLazyImports:
+    def test_success_help_skips_heavy_imports(self):
+        output = run_cli("--help")
+
+        assert "ssm  Manage SSM parameters." in output
+        assert output.splitlines()[-1] == "[]"
+
+    def test_success_completion_skips_heavy_imports(self):
+        env = {"_ACAT_COMPLETE": "bash_complete", "COMP_WORDS": "acat s"}
+        output = run_cli(env={**env, "COMP_CWORD": "1"})
+
+        assert output.splitlines() == ["plain,ssm", "[]"]
+
+    def test_success_subcommand_completion(self):
+        env = {"_ACAT_COMPLETE": "bash_complete", "COMP_WORDS": "acat ssm co"}
+        output = run_cli(env={**env, "COMP_CWORD": "2"})
+
+        assert "plain,copy" in output.splitlines()
+
+    @pytest.mark.parametrize("name", LAZY_SUBCOMMANDS)
+    def test_success_short_help_matches_command(self, name):
+        ctx = click.Context(cli)
+        command = cli.get_command(ctx, name)
+
+        assert command is not None
+        assert command.get_short_help_str() == LAZY_SUBCOMMANDS[name][1]
+
+    def test_fail_unknown_command(self):
+        ctx = click.Context(cli)
+
+        assert cli.get_command(ctx, "unknown") is None
+
+    def test_success_parameter_path_completion(self, tmp_path):
+        index = tmp_path / "completion" / "test" / "eu-west-1.json"
+        index.parent.mkdir(parents=True)
+        index.write_text('{"":{"app":{"db":{"$":1}}}}')
+        env = {
+            "ACAT_CACHE_DIR": str(tmp_path),
+            "AWS_PROFILE": "test",
+            "AWS_REGION": "eu-west-1",
+            "_ACAT_COMPLETE": "bash_complete",
+            "COMP_WORDS": "acat ssm copy /a",
+            "COMP_CWORD": "3",
+        }
+
+        output = run_cli(env=env)
+
+        assert output.splitlines()[0] == "plain,/app/"
+        assert "boto3" not in output.splitlines()[-1]
@@ -0,0 +1,57 @@
+import json
+import logging
+
+import pytest
+
+from acat.logger import configure
+from acat.logger import is_enabled
+from acat.logger import logger
+
+
+@pytest.fixture(autouse=True)
+def restore_logger():
+    yield
+    configure()
+
+
+class TestConfigure:
+    def test_success_level(self, capsys):
+        configure("WARNING")
+
+        logger.info("hidden {}", 1)
+        logger.warning("shown {:02d}", 2)
+
+        assert not is_enabled("INFO")
+        assert is_enabled("ERROR")
+        err = capsys.readouterr().err
+        assert "hidden" not in err
+        assert "shown 02" in err
+
+    def test_success_json(self, capsys):
+        configure("DEBUG", log_format="json")
+
+        logger.debug("Found {} parameters", 3)
+
+        record = json.loads(capsys.readouterr().err)["record"]
+        assert record["message"] == "Found 3 parameters"
+        assert record["level"]["name"] == "DEBUG"
+
+    def test_success_enqueue(self, capsys):
+        configure(enqueue=True)
+
+        logger.info("queued")
+        logger.complete()
+
+        assert "queued" in capsys.readouterr().err
+
+    def test_success_propagates_enabled_levels(self, caplog):
+        caplog.set_level(logging.DEBUG)
+
+        logger.debug("debug")
+        logger.info("info")
+
+        assert [record.getMessage() for record in caplog.records] == ["info"]
+
+    def test_fail_invalid_format(self):
+        with pytest.raises(ValueError, match="Log format must be one of"):
+            configure(log_format="xml")
@@ -0,0 +1,175 @@
+import json
+import time
+from types import SimpleNamespace
+from typing import Generator
+
+import boto3
+import pytest
+from botocore.exceptions import ClientError
+from botocore.hooks import HierarchicalEmitter
+from moto import mock_aws
+from mypy_boto3_ssm import SSMClient
+
+from acat.cli import cli
+from acat.ssm.client import clear_ssm_clients
+from acat.ssm.client import get_ssm_client
+from acat.ssm.throttling import WriteScheduler
+from acat.stats import LATENCY_BUCKETS_MS
+from acat.stats import Stats
+from acat.stats import disable_stats
+from acat.stats import enable_stats
+from acat.stats import percentile
+from tests.conftest import BaseTest
+
+
+@pytest.fixture(autouse=True)
+def mock_ssm() -> Generator[SSMClient, None, None]:
+    clear_ssm_clients()
+
+    with mock_aws():
+        client: SSMClient = boto3.client("ssm")
+        client.put_parameter(Name="/stats/param1", Value="value1", Type="String")
+        yield client
+
+    disable_stats()
+    clear_ssm_clients()
+
+
+@pytest.fixture
+def stats() -> Stats:
+    return enable_stats()
+
+
+def emit_call(stats: Stats, operation_name: str, parsed: dict) -> None:
+    """Emit the events of a retried API call on an emitter without handlers."""
+    events = HierarchicalEmitter()
+    stats.instrument(SimpleNamespace(meta=SimpleNamespace(events=events)))
+    model = get_ssm_client().meta.service_model.operation_model(operation_name)
+    context: dict = {}
+    events.emit("before-call.ssm", model=model, context=context)
+    events.emit("needs-retry.ssm", response=(None, parsed), operation=model)
+    events.emit("after-call.ssm", parsed=parsed, model=model, context=context)
+
+
+class TestStats:
+    def test_success_counts_calls(self, stats):
+        client = get_ssm_client()
+        client.get_parameter(Name="/stats/param1")
+        client.get_parameter(Name="/stats/param1")
+
+        report = stats.report()
+
+        assert list(report) == ["GetParameter"]
+        assert report["GetParameter"]["Calls"] == 2
+        assert report["GetParameter"]["Errors"] == 0
+        assert sum(report["GetParameter"]["Histogram"]) == 2
+        assert report["GetParameter"]["LatencyMs"] > 0
+
+    def test_success_counts_errors(self, stats):
+        client = get_ssm_client()
+
+        with pytest.raises(client.exceptions.ParameterNotFound):
+            client.get_parameter(Name="/stats/missing")
+
+        assert stats.report()["GetParameter"]["Errors"] == 1
+
+    def test_success_counts_retries_and_throttles(self, stats):
+        parsed = {
+            "Error": {"Code": "ThrottlingException"},
+            "ResponseMetadata": {"RetryAttempts": 2},
+        }
+
+        emit_call(stats, "PutParameter", parsed)
+
+        operation = stats.report()["PutParameter"]
+        assert operation["Retries"] == 2
+        assert operation["Throttles"] == 1
+        assert operation["Errors"] == 1
+
+    def test_success_counts_write_scheduler_retries(self, stats, monkeypatch):
+        monkeypatch.setattr(time, "sleep", lambda _: None)
+        attempts = []
+
+        def write(item: int):
+            attempts.append(item)
+
+            if len(attempts) < 3:
+                raise ClientError(
+                    {"Error": {"Code": "ThrottlingException"}}, "PutParameter"
+                )
+
+        scheduler: WriteScheduler[int] = WriteScheduler(
+            rate=1000, operation="PutParameter"
+        )
+        failures = scheduler.run([1], write, key=str)
+
+        assert failures == []
+        assert stats.report()["PutParameter"]["Retries"] == 2
+
+    def test_success_disabled_by_default(self):
+        client = get_ssm_client()
+        stats = enable_stats()
+        client.get_parameter(Name="/stats/param1")
+
+        assert stats.report() == {}
+
+    def test_success_format_table(self, stats):
+        get_ssm_client().get_parameter(Name="/stats/param1")
+
+        header, row = stats.format_table().splitlines()
+
+        assert header.split()[:5] == [
+            "Operation",
+            "Calls",
+            "Retries",
+            "Throttles",
+            "Errors",
+        ]
+        assert row.split()[:5] == ["GetParameter", "1", "0", "0", "0"]
+
+    def test_success_to_json(self, stats):
+        get_ssm_client().get_parameter(Name="/stats/param1")
+
+        data = json.loads(stats.to_json())
+
+        assert data["LatencyBucketsMs"] == list(LATENCY_BUCKETS_MS)
+        assert data["Operations"]["GetParameter"]["Calls"] == 1
+
+
+class TestPercentile:
+    def test_success(self):
+        histogram = [5, 4, 1] + [0] * (len(LATENCY_BUCKETS_MS) - 2)
+
+        assert percentile(histogram, 0.5) == 10
+        assert percentile(histogram, 0.9) == 25
+        assert percentile(histogram, 0.99) == 50
+
+    def test_success_unbounded_bucket(self):
+        histogram = [0] * len(LATENCY_BUCKETS_MS) + [1]
+
+        assert percentile(histogram, 0.5) is None
+
+    def test_success_no_calls(self):
+        assert percentile([0] * (len(LATENCY_BUCKETS_MS) + 1), 0.5) is None
+
+
+class TestCli(BaseTest):
+    def test_success_stats_json(self, tmp_path):
+        path = tmp_path / "stats.json"
+        args = ["--stats-json", str(path), "ssm", "copy", "/stats", "/copy"]
+
+        result = self.runner.invoke(cli, args, input="y\n")
+
+        assert result.exit_code == 0
+        operations = json.loads(path.read_text())["Operations"]
+        assert operations["PutParameter"]["Calls"] == 1
+        assert operations["GetParametersByPath"]["Calls"] == 2
+
+    def test_success_stats_table(self):
+        args = ["--stats", "ssm", "copy", "/stats", "/copy"]
+
+        result = self.runner.invoke(cli, args, input="y\n")
+
+        assert result.exit_code == 0
+        assert "Operation" in result.stderr
+        assert "PutParameter" in result.stderr